@@ -0,0 +1,184 @@
+"""
+Feed ranking benchmark.
+
+Seeds a throwaway SQLite database with N recipes and their RecipeStats rows
+and reports p50/p99 latency of GET /api/v1/feed/?ordering=-activity_count for
+page 1 and page 500, with page number and cursor pagination, next to the
+former six-aggregate ranking query.
+
+Usage:
+    python benchmarks/feed_ranking.py --recipes 1000000 --runs 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["DJANGO_SETTINGS_MODULE"] = "config.settings"
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+DB_PATH = Path(tempfile.mkdtemp()) / "feed_ranking.sqlite3"
+settings.DATABASES["default"]["NAME"] = DB_PATH
+# measure the feed queries, not the anonymous response cache
+settings.FEED_CACHE_TIMEOUT = 0
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, reset_queries, transaction  # noqa: E402
+from django.db.models import Count, F, Q  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from src.apps.recipes.models import Recipe  # noqa: E402
+from src.apps.users.models import CustomUser  # noqa: E402
+
+BATCH_SIZE = 50_000
+
+
+def seed(recipes_num: int) -> None:
+    """Insert recipes and stats with raw SQL, the ORM is too slow for 1M rows"""
+
+    call_command("migrate", verbosity=0)
+    author = CustomUser.objects.create_user(email="bench@ya.ru", password="bench")
+    now = datetime.now(timezone.utc)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, recipes_num, BATCH_SIZE):
+            ids = range(start + 1, min(start + BATCH_SIZE, recipes_num) + 1)
+            cursor.executemany(
+                "INSERT INTO recipes_recipe (id, author_id, title, slug, full_text,"
+                " short_text, cooking_time, pub_date, updated_at, is_repost)"
+                " VALUES (%s, %s, %s, %s, '', '', 10, %s, %s, 0)",
+                [
+                    (
+                        i,
+                        author.id,
+                        f"recipe {i}",
+                        f"recipe-{i}",
+                        now - timedelta(minutes=i),
+                        now,
+                    )
+                    for i in ids
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO recipes_recipestats (recipe_id, comments_count,"
+                " views_count, reactions_count, latest_comments_count,"
+                " latest_views_count, latest_reactions_count, activity_count,"
+                " updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                [
+                    (i, 0, activity, 0, 0, activity, 0, activity, now)
+                    for i in ids
+                    for activity in [random.randint(0, 10_000)]
+                ],
+            )
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50 {p50 * 1000:8.2f} ms   p99 {p99 * 1000:8.2f} ms"
+
+
+def measure(func, runs: int) -> str:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+        reset_queries()
+    return percentiles(samples)
+
+
+def feed_page(client: APIClient, page: int):
+    def request():
+        response = client.get(f"/api/v1/feed/?ordering=-activity_count&page={page}")
+        assert response.status_code == 200, response.status_code
+
+    return request
+
+
+def cursor_page(client: APIClient, page: int):
+    """Follow `next` links up to the page, then time requesting it"""
+
+    url = "/api/v1/feed/?ordering=-activity_count&pagination=cursor"
+    for _ in range(page - 1):
+        url = client.get(url).data["next"]
+
+    def request():
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+
+    return request
+
+
+def legacy_page(page: int):
+    """Ranking query the feed used before RecipeStats"""
+
+    def query():
+        last_month_start = datetime.now(timezone.utc) - timedelta(
+            days=settings.ACTIVITY_INTERVAL
+        )
+        page_size = settings.FEED_PAGE_SIZE
+        offset = (page - 1) * page_size
+        queryset = Recipe.objects.annotate(
+            latest_comments_count=Count(
+                "comments",
+                filter=Q(comments__pub_date__gte=last_month_start),
+                distinct=True,
+            ),
+            latest_views_count=Count(
+                "views", filter=Q(views__created_at__gte=last_month_start), distinct=True
+            ),
+            latest_reactions_count=Count(
+                "reactions",
+                filter=Q(reactions__pub_date__gte=last_month_start),
+                distinct=True,
+            ),
+            activity_count=F("latest_comments_count")
+            + F("latest_views_count")
+            + F("latest_reactions_count"),
+        ).order_by("-activity_count")
+        list(queryset[offset : offset + page_size])
+
+    return query
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument(
+        "--legacy-runs",
+        type=int,
+        default=3,
+        help="Runs of the former aggregate query, 0 to skip it.",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed(args.recipes)
+    print(f"Seeded {args.recipes} recipes in {time.perf_counter() - started:.1f} s")
+
+    client = APIClient()
+    for page in (1, 500):
+        print(f"feed page {page:>3}:   {measure(feed_page(client, page), args.runs)}")
+    for page in (1, 500):
+        print(f"cursor page {page:>3}: {measure(cursor_page(client, page), args.runs)}")
+    if args.legacy_runs:
+        for page in (1, 500):
+            result = measure(legacy_page(page), args.legacy_runs)
+            print(f"legacy page {page:>3}: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Pantry matching benchmark.
+
+Seeds a throwaway SQLite database with N recipes of 3 to 12 ingredients,
+picked from a catalogue where a few ingredients (salt, eggs...) are in most
+recipes, and reports the time of loading the ingredient match index and
+p50/p99 latency of matching pantries of 10 ingredients with it, of
+POST /api/v1/recipe/match/, and of the same ranking as one GROUP BY query.
+The index and the endpoint are measured again with a recipe written before
+every --write-every matches, applied through the change log of the
+configured cache.
+
+Usage:
+    python benchmarks/recipe_match.py --recipes 1000000 --runs 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from functools import partial
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["DJANGO_SETTINGS_MODULE"] = "config.settings"
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+DB_PATH = Path(tempfile.mkdtemp()) / "recipe_match.sqlite3"
+settings.DATABASES["default"]["NAME"] = DB_PATH
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.db.models import Count, F, FloatField, Q  # noqa: E402
+from django.db.models.functions import Cast  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from src.apps.ingredients.models import IngredientInRecipe  # noqa: E402
+from src.apps.search.changes import recipes_changed  # noqa: E402
+from src.apps.search.matching import recipe_matches  # noqa: E402
+from src.apps.users.models import CustomUser  # noqa: E402
+
+BATCH_SIZE = 50_000
+PANTRY_SIZE = 10
+
+
+def seed(recipes_num: int, ingredients_num: int) -> list:
+    """
+    Insert recipes and their ingredients with raw SQL, returns the cumulative
+    popularity weights of the ingredients
+    """
+
+    call_command("migrate", verbosity=0)
+    author = CustomUser.objects.create_user(email="bench@ya.ru", password="bench")
+    now = datetime.now(timezone.utc)
+    ingredients = range(1, ingredients_num + 1)
+    # popularity falls with the rank of an ingredient
+    weights = list(accumulate(1 / rank for rank in ingredients))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO ingredients_ingredient (id, name) VALUES (%s, %s)",
+            [(i, f"ingredient {i}") for i in ingredients],
+        )
+        cursor.execute("INSERT INTO ingredients_unit (id, name) VALUES (1, 'г')")
+        for start in range(0, recipes_num, BATCH_SIZE):
+            ids = range(start + 1, min(start + BATCH_SIZE, recipes_num) + 1)
+            cursor.executemany(
+                "INSERT INTO recipes_recipe (id, author_id, title, slug, full_text,"
+                " short_text, cooking_time, pub_date, updated_at, is_repost)"
+                " VALUES (%s, %s, %s, %s, '', '', 10, %s, %s, 0)",
+                [(i, author.id, f"recipe {i}", f"recipe-{i}", now, now) for i in ids],
+            )
+            cursor.executemany(
+                "INSERT INTO ingredients_ingredientinrecipe (recipe_id,"
+                " ingredient_id, unit_id, amount) VALUES (%s, %s, 1, 1)",
+                [
+                    (i, ingredient)
+                    for i in ids
+                    for ingredient in set(
+                        random.choices(
+                            ingredients, cum_weights=weights, k=random.randint(3, 12)
+                        )
+                    )
+                ],
+            )
+    return weights
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50 {p50 * 1000:8.2f} ms   p99 {p99 * 1000:8.2f} ms"
+
+
+def write_recipe(recipes_num: int, ingredients_num: int) -> None:
+    """Add an ingredient to a recipe and log the change like a recipe save"""
+
+    recipe_id = random.randint(1, recipes_num)
+    IngredientInRecipe.objects.bulk_create(
+        [
+            IngredientInRecipe(
+                recipe_id=recipe_id,
+                ingredient_id=random.randint(1, ingredients_num),
+                unit_id=1,
+                amount=1,
+            )
+        ],
+        ignore_conflicts=True,
+    )
+    recipes_changed([recipe_id])
+
+
+def measure(func, pantries: list, write=None, write_every: int = 0) -> str:
+    """Latency of func, write runs untimed before every write_every calls"""
+
+    samples = []
+    for number, pantry in enumerate(pantries, 1):
+        if write_every and number % write_every == 0:
+            write()
+        started = time.perf_counter()
+        func(pantry)
+        samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+
+def index_match(pantry: list) -> None:
+    recipe_matches.match(pantry, settings.RECIPE_MATCH_LIMIT)
+
+
+def endpoint_match(client: APIClient):
+    def request(pantry: list) -> None:
+        response = client.post(
+            "/api/v1/recipe/match/",
+            {"ingredients": [f"ingredient {i}" for i in pantry]},
+            format="json",
+        )
+        assert response.status_code == 200, response.status_code
+
+    return request
+
+
+def legacy_match(pantry: list) -> None:
+    """The same ranking grouped in SQL over every ingredient row"""
+
+    queryset = (
+        IngredientInRecipe.objects.values("recipe_id")
+        .annotate(
+            matched=Count("id", filter=Q(ingredient_id__in=pantry)),
+            total=Count("id"),
+        )
+        .filter(matched__gt=0)
+        .annotate(coverage=Cast("matched", FloatField()) / F("total"))
+        .order_by("-coverage", "-matched", "-recipe_id")
+    )
+    list(queryset[: settings.RECIPE_MATCH_LIMIT])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=1_000_000)
+    parser.add_argument("--ingredients", type=int, default=5_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument(
+        "--legacy-runs",
+        type=int,
+        default=3,
+        help="Runs of the GROUP BY query, 0 to skip it.",
+    )
+    parser.add_argument(
+        "--write-every",
+        type=int,
+        default=10,
+        help="Matches per recipe write in the interleaved runs, 0 to skip them.",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    weights = seed(args.recipes, args.ingredients)
+    rows = IngredientInRecipe.objects.count()
+    print(
+        f"Seeded {args.recipes} recipes with {rows} ingredient rows"
+        f" in {time.perf_counter() - started:.1f} s"
+    )
+
+    started = time.perf_counter()
+    recipe_matches.load()
+    print(f"Loaded match index in {time.perf_counter() - started:.1f} s")
+
+    ingredients = range(1, args.ingredients + 1)
+    pantries = [
+        list(set(random.choices(ingredients, cum_weights=weights, k=PANTRY_SIZE)))
+        for _ in range(args.runs)
+    ]
+    print(f"index:    {measure(index_match, pantries)}")
+    print(f"endpoint: {measure(endpoint_match(APIClient()), pantries)}")
+    if args.write_every:
+        write = partial(write_recipe, args.recipes, args.ingredients)
+        backend = settings.CACHES[settings.RECIPE_INDEXES_CACHE_ALIAS]["BACKEND"]
+        print(f"cache:    {backend}, a write every {args.write_every} matches")
+        print(f"index:    {measure(index_match, pantries, write, args.write_every)}")
+        print(
+            "endpoint: "
+            f"{measure(endpoint_match(APIClient()), pantries, write, args.write_every)}"
+        )
+    if args.legacy_runs:
+        print(f"legacy:   {measure(legacy_match, pantries[: args.legacy_runs])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Recipe slug allocation benchmark.
+
+Seeds a throwaway SQLite database with N recipes titled "Борщ" (slugs
+borshch, borshch_2, ...), deletes some of the oldest ones, and reports
+queries and p50/p99 latency of allocating the next slug from the counter
+table next to the former count-and-recurse allocation.
+
+Usage:
+    python benchmarks/recipe_slugs.py --recipes 10000 --runs 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["DJANGO_SETTINGS_MODULE"] = "config.settings"
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+DB_PATH = Path(tempfile.mkdtemp()) / "recipe_slugs.sqlite3"
+settings.DATABASES["default"]["NAME"] = DB_PATH
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.utils.text import slugify  # noqa: E402
+from unidecode import unidecode  # noqa: E402
+
+from src.apps.recipes.models import Recipe, RecipeSlugCounter  # noqa: E402
+from src.apps.recipes.slugs import allocate_recipe_slug  # noqa: E402
+from src.apps.users.models import CustomUser  # noqa: E402
+
+TITLE = "Борщ"
+BATCH_SIZE = 50_000
+
+
+def seed(recipes_num: int, deleted: int) -> None:
+    """Insert same-titled recipes with raw SQL, then delete the oldest ones"""
+
+    call_command("migrate", verbosity=0)
+    author = CustomUser.objects.create_user(email="bench@ya.ru", password="bench")
+    now = datetime.now(timezone.utc)
+    base = slugify(unidecode(TITLE))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, recipes_num, BATCH_SIZE):
+            ids = range(start + 1, min(start + BATCH_SIZE, recipes_num) + 1)
+            cursor.executemany(
+                "INSERT INTO recipes_recipe (id, author_id, title, slug, full_text,"
+                " short_text, cooking_time, pub_date, updated_at, is_repost)"
+                " VALUES (%s, %s, %s, %s, '', '', 10, %s, %s, 0)",
+                [
+                    (i, author.id, TITLE, base if i == 1 else f"{base}_{i}", now, now)
+                    for i in ids
+                ],
+            )
+        RecipeSlugCounter.objects.create(base=base, last=recipes_num)
+        Recipe.objects.filter(id__in=range(2, deleted + 2)).delete()
+
+
+def legacy_slug(data: dict, num: int = 1) -> dict:
+    """Slug allocation used before RecipeSlugCounter"""
+
+    with transaction.atomic():
+        same_recipes = Recipe.objects.filter(title__startswith=data["title"]).count()
+        slug_str = unidecode(
+            f"{data['title']}_{same_recipes + num}" if same_recipes else data["title"]
+        )
+        data["slug"] = slugify(slug_str)
+        if Recipe.objects.filter(slug=data["slug"]).exists():
+            legacy_slug(data, num + 1)
+    return data
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50 {p50 * 1000:8.2f} ms   p99 {p99 * 1000:8.2f} ms"
+
+
+def measure(func, runs: int) -> str:
+    """Time func inside a rolled back transaction, so every run sees the seed"""
+
+    samples, queries = [], set()
+    for _ in range(runs):
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                func()
+                samples.append(time.perf_counter() - started)
+            queries.add(
+                len(
+                    [
+                        query
+                        for query in context.captured_queries
+                        if "SAVEPOINT" not in query["sql"]
+                    ]
+                )
+            )
+            transaction.set_rollback(True)
+    return f"queries {sorted(queries)}   {percentiles(samples)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=10_000)
+    parser.add_argument(
+        "--deleted",
+        type=int,
+        default=100,
+        help="Recipes deleted after seeding, each one is a collision to the"
+        " former allocation.",
+    )
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--legacy-runs", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed(args.recipes, args.deleted)
+    print(f"Seeded {args.recipes} recipes in {time.perf_counter() - started:.1f} s")
+
+    print(f"counter: {measure(lambda: allocate_recipe_slug(TITLE), args.runs)}")
+    if args.legacy_runs:
+        result = measure(lambda: legacy_slug({"title": TITLE}), args.legacy_runs)
+        print(f"legacy:  {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+from src.apps.ingredients.dictionary import warm_dictionaries  # noqa: E402
+
+warm_dictionaries()
@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     "src.apps.view",
     "src.apps.follow",
     "src.apps.feed",
+    "src.apps.search",
 ]
 
 MIDDLEWARE = [
@@ -145,6 +146,48 @@ DATABASES = {
     }
 }
 
+# Cache
+# Every app has its own alias (namespace). With REDIS_URL all of them share
+# one Redis, otherwise a file based cache shared by the processes of one
+# host is used. Bump CACHE_VERSION to drop every cached value on deploy.
+# The file based cache is not shared across hosts, its add and incr are not
+# atomic, and past CACHE_MAX_ENTRIES files per alias it deletes a random
+# 1/CACHE_CULL_FREQUENCY of them. So the view buffer ("default"), the
+# incremental reaction histograms ("reactions") and the change log of the
+# recipe indexes (RECIPE_INDEXES_CACHE_ALIAS) only use a backend of
+# ATOMIC_CACHE_BACKENDS, otherwise they fall back to direct writes, recounts
+# and a table. Serving from more than one host needs REDIS_URL.
+
+REDIS_URL = config("REDIS_URL", default="")
+CACHE_LOCATION = config("CACHE_LOCATION", default="/var/tmp/sous_vide_cache")
+CACHE_KEY_PREFIX = config("CACHE_KEY_PREFIX", default="sous_vide")
+CACHE_VERSION = config("CACHE_VERSION", default=1, cast=int)
+CACHE_MAX_ENTRIES = config("CACHE_MAX_ENTRIES", default=100_000, cast=int)
+CACHE_CULL_FREQUENCY = config("CACHE_CULL_FREQUENCY", default=10, cast=int)
+CACHE_ALIASES = ("default", "feed", "reactions", "users")
+
+CACHES = {
+    alias: {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache"
+        if REDIS_URL
+        else "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": REDIS_URL or f"{CACHE_LOCATION}/{alias}",
+        "KEY_PREFIX": f"{CACHE_KEY_PREFIX}:{alias}",
+        "VERSION": CACHE_VERSION,
+        "OPTIONS": {}
+        if REDIS_URL
+        else {
+            "MAX_ENTRIES": CACHE_MAX_ENTRIES,
+            "CULL_FREQUENCY": CACHE_CULL_FREQUENCY,
+        },
+    }
+    for alias in CACHE_ALIASES
+}
+# Backends whose add and incr are atomic for every process and which never
+# cull keys stored without timeout. State kept in the cache on other
+# backends is written or recounted directly instead, see is_atomic_cache.
+ATOMIC_CACHE_BACKENDS = ("django.core.cache.backends.redis.RedisCache",)
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -247,6 +290,70 @@ COMMENT_PAGE_SIZE = 10
 FEED_PAGE_SIZE = 5
 FOLLOWER_PAGE_SIZE = 10
 USER_LIST_PAGE_SIZE = 10
+# Seconds a paginated total is served from the cache
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+# Seconds an anonymous feed page is served from the cache
+FEED_CACHE_TIMEOUT = 30
+# Timeline entries written per INSERT on fan-out and backfill
+TIMELINE_BATCH_SIZE = 1000
+# Authors with more followers are merged into timelines at read time
+TIMELINE_FANOUT_MAX_FOLLOWERS = 10_000
+# Seconds the set of such authors is served from the cache
+TIMELINE_POPULAR_AUTHORS_TIMEOUT = 5 * 60
+
+# Seconds a reaction histogram lives in the cache
+REACTION_HISTOGRAM_TIMEOUT = 60 * 60 * 24
+# Seconds the counters of reaction writes in flight live in the cache, a
+# write rolled back keeps its object histogram uncached until they expire
+REACTION_HISTOGRAM_WRITE_TIMEOUT = 60
+# Recipes or comments in one reactions summary request
+REACTIONS_SUMMARY_MAX_OBJECTS = 100
+# Users in one follow status request
+FOLLOW_STATUS_MAX_USERS = 100
+# Shared cache telling processes to reload ingredient and unit dictionaries,
+# None keeps every process on its own
+INGREDIENT_DICTIONARY_CACHE_ALIAS = "default"
+# Seconds a process trusts its dictionaries before reading the shared version
+# again, renames elsewhere may go unseen for as long
+INGREDIENT_DICTIONARY_VERSION_CHECK_INTERVAL = 5
+# Backend of the recipe search index, see src.apps.search.backends
+RECIPE_SEARCH_BACKEND = "src.apps.search.backends.SQLiteFTS5Backend"
+# Matches of a search query that can be paged through
+RECIPE_SEARCH_MAX_RESULTS = 1000
+# Upper bounds of the cooking time facet buckets in minutes, the last
+# bucket is open ended
+RECIPE_COOKING_TIME_BUCKETS = (30, 60, 120)
+# Values shown per facet, besides the selected ones
+RECIPE_FACETS_MAX_VALUES = 20
+# Values selected per facet in one request
+RECIPE_FACETS_MAX_SELECTED = 50
+# Shared cache logging written recipes for the facet and ingredient match
+# indexes of every process, the RecipeChange table logs them when it is not
+# atomic. None keeps every process on its own
+RECIPE_INDEXES_CACHE_ALIAS = "default"
+# Seconds a logged write is kept, processes that missed it reload
+RECIPE_INDEXES_CHANGE_TIMEOUT = 60 * 60
+# Seconds a RecipeChange row numbered below the rows read is waited for
+RECIPE_INDEXES_CHANGE_GRACE = 60
+# Logged writes a process applies one by one before reloading instead
+RECIPE_INDEXES_MAX_PENDING_CHANGES = 1000
+# Matches are sorted when fewer than 1/ratio of recipes, otherwise the
+# ids of all recipes are walked from the newest
+RECIPE_FACETS_SORT_RATIO = 8
+# Usernames tried for a new user before its signup fails
+USERNAME_ATTEMPTS = 3
+# Saves of a recipe retried with a new slug when its slug turns out taken
+RECIPE_SLUG_SAVE_ATTEMPTS = 5
+# Ingredient suggestions per request by default and at most
+INGREDIENT_SUGGEST_LIMIT = 10
+INGREDIENT_SUGGEST_MAX_LIMIT = 50
+# Seconds ingredient usage counts rank suggestions before being recounted
+INGREDIENT_SUGGEST_POPULARITY_TIMEOUT = 5 * 60
+# Recipes matched to a pantry per request by default and at most
+RECIPE_MATCH_LIMIT = 20
+RECIPE_MATCH_MAX_LIMIT = 100
+# Ingredient names in one pantry
+RECIPE_MATCH_MAX_INGREDIENTS = 100
 
 # Variables
 
@@ -260,6 +367,13 @@ SHORT_BIO_SYMBOLS = 50
 # TIME
 
 TIME_FROM_VIEW_RECIPE = 20
+# Buffered recipe views written per bulk insert
+VIEW_BUFFER_BATCH_SIZE = 1000
+# Seconds a flush waits for a view numbered but not queued yet before
+# skipping it, its writer is assumed dead by then
+VIEW_BUFFER_GAP_GRACE = 60
+# Days raw recipe views are kept before folding them into hourly rollups
+VIEW_RAW_RETENTION_DAYS = 2
 
 # Regex for custom user
 
@@ -13,12 +13,17 @@ DATABASES = {
     }
 }
 
+# the tests run in one process, where the locked LocMemCache is atomic
 CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
-        "LOCATION": "/var/tmp/django_cache",
+    alias: {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": alias,
+        "KEY_PREFIX": alias,
+        "OPTIONS": {"MAX_ENTRIES": 100_000},
     }
+    for alias in CACHE_ALIASES
 }
+ATOMIC_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
 
 
 if "create-db" not in sys.argv:
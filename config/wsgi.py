@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+from src.apps.ingredients.dictionary import warm_dictionaries  # noqa: E402
+
+warm_dictionaries()
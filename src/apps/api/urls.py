@@ -6,6 +6,9 @@ urlpatterns = [
     path("", include("src.apps.swagger.routes")),
     path("", include("src.apps.feed.urls")),
     path("", include("src.apps.follow.urls")),
+    path("", include("src.apps.ingredients.urls")),
+    # before recipes, whose detail route would take "search" for a slug
+    path("", include("src.apps.search.urls")),
     path("", include("src.apps.recipes.urls")),
     path("", include("src.apps.reactions.urls")),
     path("", include("src.apps.comments.urls")),
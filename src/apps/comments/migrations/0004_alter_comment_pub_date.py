@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0003_comment_updated_date"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="comment",
+            name="pub_date",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
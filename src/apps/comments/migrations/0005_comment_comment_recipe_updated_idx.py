@@ -0,0 +1,20 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0004_alter_comment_pub_date"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["recipe", "-updated_date", "-id"],
+                name="comment_recipe_updated_idx",
+            ),
+        ),
+    ]
@@ -30,10 +30,18 @@ class Comment(models.Model):
         "recipes.Recipe", on_delete=models.SET_NULL, related_name="comments", null=True
     )
     text = models.TextField(max_length=1000, validators=[MaxLengthValidator(1000)])
-    pub_date = models.DateTimeField(auto_now_add=True)
+    pub_date = models.DateTimeField(auto_now_add=True, db_index=True)
     parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True)
     reactions = GenericRelation(Reaction, related_query_name="comment_reactions")
     updated_date = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["recipe", "-updated_date", "-id"],
+                name="comment_recipe_updated_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.author.username} comment to recipe {self.recipe.slug}"
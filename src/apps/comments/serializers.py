@@ -1,12 +1,14 @@
 from rest_framework.serializers import ModelSerializer
 
 from src.apps.comments.models import Comment
+from src.apps.reactions.mixins import ReactionsSummarySerializerMixin
 from src.apps.users.serializers import AuthorInRecipeSerializer
 
 
-class CommentListSerializer(ModelSerializer):
+class CommentListSerializer(ReactionsSummarySerializerMixin, ModelSerializer):
     """
-    Serializer for viewing comments
+    Serializer for viewing comments, with reactions by emoji when the list is
+    requested with `?include=reactions`
     """
 
     author = AuthorInRecipeSerializer(read_only=True)
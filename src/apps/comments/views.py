@@ -1,41 +1,46 @@
 from datetime import timedelta
+
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.exceptions import (
-    PermissionDenied,
     NotAuthenticated,
-    ValidationError,
     NotFound,
+    PermissionDenied,
+    ValidationError,
 )
 from rest_framework.mixins import (
-    ListModelMixin,
     CreateModelMixin,
-    UpdateModelMixin,
     DestroyModelMixin,
+    ListModelMixin,
+    UpdateModelMixin,
 )
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from src.apps.comments.models import Comment
+from src.apps.follow.mixins import IncludeFollowStatusMixin
+from src.apps.reactions.mixins import IncludeReactionsMixin
+from src.apps.recipes.models import Recipe
 from src.base.code_text import (
-    INVALID_ID_FORMAT,
+    CANT_EDIT_COMMENT,
     COMMENT_NOT_FOUND,
     COMMENT_SUCCESSFULLY_DELETE,
-    CANT_EDIT_COMMENT,
+    INVALID_ID_FORMAT,
 )
-from src.apps.comments.models import Comment
 from src.base.paginators import CommentPagination
 from src.base.permissions import (
     IsObjectOwnerOrAdminOrReadOnly,
     IsOwnerOrStaffOrReadOnly,
 )
 from src.base.services import get_or_none
-from src.apps.recipes.models import Recipe
-from .serializers import CommentListSerializer, CommentCreateSerializer
+from .serializers import CommentCreateSerializer, CommentListSerializer
 
 
 class CommentViewSet(
+    IncludeReactionsMixin,
+    IncludeFollowStatusMixin,
     GenericViewSet,
     ListModelMixin,
     CreateModelMixin,
@@ -52,7 +57,7 @@ class CommentViewSet(
     def get_queryset(self):
         recipe = get_object_or_404(Recipe, slug=self.kwargs.get("slug"))
         queryset = (
-            Comment.objects.filter(recipe__slug=recipe.slug)
+            Comment.objects.filter(recipe=recipe)
             .select_related("author")
             .order_by("-updated_date")
         )
@@ -1,4 +1,11 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
+
+from .timeline import (
+    filter_subscriptions,
+    followed_merged_authors,
+    reads_timeline,
+)
 
 
 class FeedFilter(filters.FilterSet):
@@ -6,10 +13,32 @@ class FeedFilter(filters.FilterSet):
     filter = filters.CharFilter(method="filter_by_subscription", label="filter")
 
     def filter_by_subscription(self, queryset, name, value):
+        """
+        Subscriptions are read from the timeline of the user, filled on
+        fan-out and merged with popular authors, see feed.timeline. The
+        merged authors are kept on the request to measure the merge cost.
+        """
+
         if value == "subscriptions":
-            user = self.request.user
-            users_subscribed_to = user.follower.all().values_list(
-                "author_id", flat=True
-            )
-            return queryset.filter(author__in=users_subscribed_to)
+            merged = followed_merged_authors(self.request.user)
+            self.request.timeline_merged_authors = merged
+            return filter_subscriptions(queryset, self.request.user, merged)
         return queryset
+
+
+class FeedOrderingFilter(OrderingFilter):
+    """
+    Ordering by activity_count is resolved by the (activity_count, recipe)
+    index of RecipeStats, the recipe id also makes pages stable on ties.
+    The default ordering of a subscriptions feed joined to the timeline
+    walks its (user, pub_date, recipe) index instead.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        if ordering == ["-pub_date"] and reads_timeline(queryset):
+            return ["-timeline_entries__pub_date", "-timeline_entries__recipe"]
+        if ordering and ordering[-1].lstrip("-") == "activity_count":
+            direction = "-" if ordering[-1].startswith("-") else ""
+            ordering.append(f"{direction}stats__recipe")
+        return ordering
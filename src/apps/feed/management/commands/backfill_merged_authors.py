@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.feed.timeline import release_merged_authors
+
+
+class Command(BaseCommand):
+    help = (
+        "Write recipes of authors who dropped below the fan-out threshold to "
+        "the timelines of their followers and stop merging them at read time. "
+        "Meant to be run from cron, e.g. every hour."
+    )
+
+    def handle(self, *args, **options):
+        released = release_merged_authors()
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled timelines of {released} authors.")
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from src.apps.feed.timeline import rebuild_timelines
+
+
+class Command(BaseCommand):
+    help = (
+        "Refill subscription timelines from follows, e.g. after follows or "
+        "recipes were loaded with loaddata."
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuilt = rebuild_timelines()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt timelines with {rebuilt} entries.")
+        )
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.apps.feed.timeline import (
+    merged_authors,
+    popular_authors,
+    timeline_metrics,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the fan-out threshold of subscription timelines, the authors "
+        "merged at read time and the fan-out and merge counters."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"fanout_max_followers: {settings.TIMELINE_FANOUT_MAX_FOLLOWERS}"
+        )
+        self.stdout.write(f"popular_authors: {len(popular_authors())}")
+        self.stdout.write(f"authors_merged_at_read: {len(merged_authors())}")
+        for name, value in timeline_metrics().items():
+            self.stdout.write(f"{name}: {value}")
+        self.stdout.write(self.style.SUCCESS("Timeline metrics collected."))
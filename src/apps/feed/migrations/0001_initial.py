@@ -0,0 +1,106 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_timelines(apps, schema_editor):
+    Follow = apps.get_model("follow", "Follow")
+    Recipe = apps.get_model("recipes", "Recipe")
+    TimelineEntry = apps.get_model("feed", "TimelineEntry")
+
+    entries = []
+    for user_id, author_id in Follow.objects.values_list("user_id", "author_id"):
+        entries.extend(
+            TimelineEntry(
+                user_id=user_id,
+                recipe_id=recipe_id,
+                author_id=author_id,
+                pub_date=pub_date,
+            )
+            for recipe_id, pub_date in Recipe.objects.filter(
+                author_id=author_id
+            ).values_list("id", "pub_date")
+        )
+    TimelineEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("recipes", "0014_recipe_recipe_pub_date_id_idx"),
+        ("follow", "0003_follow_follow_user_created_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimelineEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "pub_date",
+                    models.DateTimeField(verbose_name="Дата публикации"),
+                ),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Автор",
+                    ),
+                ),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline_entries",
+                        to="recipes.recipe",
+                        verbose_name="Рецепт",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline_entries",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Подписчик",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Запись ленты подписок",
+                "verbose_name_plural": "Записи ленты подписок",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-pub_date", "-recipe"],
+                        name="timeline_user_date_idx",
+                    ),
+                    models.Index(
+                        fields=["user", "author"],
+                        name="timeline_user_author_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="timelineentry",
+            constraint=models.UniqueConstraint(
+                fields=("user", "recipe"), name="unique_timeline_entry"
+            ),
+        ),
+        migrations.RunPython(fill_timelines, migrations.RunPython.noop),
+    ]
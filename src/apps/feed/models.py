@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db import models
+
+from src.apps.recipes.models import Recipe
+
+
+class TimelineEntry(models.Model):
+    """
+    Recipe of a followed author in the subscriptions feed of a user,
+    written when the recipe is published or the author is followed
+
+    Attrs:
+    • user (ForeignKey): owner of the timeline.
+    • recipe (ForeignKey): recipe shown in the timeline.
+    • author (ForeignKey): author of the recipe, to drop entries on unfollow.
+    • pub_date (DateTimeField): publication date of the recipe.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+        verbose_name="Подписчик",
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+        verbose_name="Рецепт",
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Автор",
+    )
+    pub_date = models.DateTimeField(verbose_name="Дата публикации")
+
+    class Meta:
+        verbose_name = "Запись ленты подписок"
+        verbose_name_plural = "Записи ленты подписок"
+        indexes = [
+            models.Index(
+                fields=["user", "-pub_date", "-recipe"],
+                name="timeline_user_date_idx",
+            ),
+            models.Index(
+                fields=["user", "author"], name="timeline_user_author_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "recipe"], name="unique_timeline_entry"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.recipe} в ленте {self.user}"
+
+
+class MergedAuthor(models.Model):
+    """
+    Author whose recipes are left out of timelines and merged at read time.
+    Stays after the author drops below the fan-out threshold, until the
+    recipes are written to the timelines of the followers.
+
+    Attrs:
+    • author (OneToOneField): the author.
+    """
+
+    author = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Автор",
+    )
+
+    class Meta:
+        verbose_name = "Автор ленты при чтении"
+        verbose_name_plural = "Авторы ленты при чтении"
+
+    def __str__(self):
+        return str(self.author)
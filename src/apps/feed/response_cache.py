@@ -0,0 +1,95 @@
+"""
+Response cache of the anonymous feed.
+
+Every anonymous visitor gets the same pages, so whole responses are cached
+for FEED_CACHE_TIMEOUT seconds, which also bounds how stale activity
+counters get. Keys carry a generation: the global one for the whole feed or
+the one of the author for `?username=` pages. Saving or deleting a recipe
+bumps the generation of the feed and of its author only, pages of other
+authors stay cached. A cold key is computed by one request at a time.
+"""
+
+import time
+from hashlib import md5
+from typing import Callable, Optional
+
+from django.conf import settings
+from rest_framework.response import Response
+
+from src.base.cache import feed_cache
+
+GLOBAL_GENERATION_KEY = "feed:generation"
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+# the only parameters changing an anonymous page, others share its entry
+KEY_QUERY_PARAMS = ("page", "ordering", "username", "include", "pagination", "cursor")
+
+
+def _username_generation_key(username: str) -> str:
+    return f"feed:generation:{md5(username.encode()).hexdigest()}"
+
+
+def _generation(key: str) -> int:
+    # starts from the clock, so an evicted generation never brings back
+    # responses cached under its previous values
+    feed_cache.add(key, time.time_ns(), None)
+    return feed_cache.get(key)
+
+
+def bump_feed_generation(username: Optional[str] = None) -> None:
+    """Invalidate the whole feed and the pages of the author"""
+
+    keys = [GLOBAL_GENERATION_KEY]
+    if username:
+        keys.append(_username_generation_key(username))
+    for key in keys:
+        try:
+            feed_cache.incr(key)
+        except ValueError:
+            _generation(key)
+
+
+def feed_response_key(request) -> str:
+    username = request.query_params.get("username")
+    generation = _generation(
+        _username_generation_key(username) if username else GLOBAL_GENERATION_KEY
+    )
+    params = [
+        (name, request.query_params.getlist(name))
+        for name in KEY_QUERY_PARAMS
+        if name in request.query_params
+    ]
+    digest = md5(f"{request.get_host()}|{params}".encode()).hexdigest()
+    return f"feed:response:{generation}:{digest}"
+
+
+def cached_feed_response(request, compute: Callable[[], Response]) -> Response:
+    """
+    Response of the anonymous feed from the cache, computed on a miss by the
+    request holding the lock while the others wait for it
+    """
+
+    key = feed_response_key(request)
+    data = feed_cache.get(key)
+    if data is not None:
+        return Response(data)
+
+    lock_key = f"{key}:lock"
+    deadline = time.monotonic() + LOCK_WAIT
+    while not feed_cache.add(lock_key, True, LOCK_TIMEOUT):
+        if time.monotonic() > deadline:
+            # the holder is too slow, answer without the cache
+            return compute()
+        time.sleep(LOCK_POLL_INTERVAL)
+        data = feed_cache.get(key)
+        if data is not None:
+            return Response(data)
+
+    try:
+        response = compute()
+        if response.status_code == 200:
+            feed_cache.set(key, response.data, settings.FEED_CACHE_TIMEOUT)
+        return response
+    finally:
+        feed_cache.delete(lock_key)
@@ -1,11 +1,16 @@
 from rest_framework.serializers import IntegerField, SerializerMethodField
 
-from src.apps.recipes.serializers import BaseRecipeListSerializer, CategorySerializer
+from src.apps.reactions.mixins import ReactionsSummarySerializerMixin
+from src.apps.recipes.serializers import (
+    BaseRecipeListSerializer,
+    CategorySerializer,
+)
 
 
-class FeedSerializer(BaseRecipeListSerializer):
+class FeedSerializer(ReactionsSummarySerializerMixin, BaseRecipeListSerializer):
     """
     Reflection of Feed page with count of emojies by type in reactions field
+    (with `?include=reactions`)
     """
 
     activity_count = IntegerField()
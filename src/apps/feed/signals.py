@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from .response_cache import bump_feed_generation
+from .timeline import backfill_timeline, drop_from_timeline, fan_out_recipe
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def invalidate_feed_responses(sender, instance, **kwargs):
+    """
+    Cached anonymous feed pages are dropped after commit, when tags and
+    categories of the recipe are saved too
+    """
+
+    username = instance.author.username if instance.author_id else None
+    transaction.on_commit(lambda: bump_feed_generation(username))
+
+
+@receiver(post_save, sender=Recipe)
+def fan_out_published_recipe(sender, instance, created, **kwargs):
+    """
+    Runs inside the transaction of RecipeCreateSerializer.create, a recipe
+    that fails to save never reaches a timeline
+    """
+
+    if created and not kwargs.get("raw"):
+        fan_out_recipe(instance)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_followed_author(sender, instance, created, **kwargs):
+    if created and not kwargs.get("raw"):
+        backfill_timeline(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def drop_unfollowed_author(sender, instance, **kwargs):
+    drop_from_timeline(instance.user_id, instance.author_id)
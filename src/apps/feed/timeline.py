@@ -0,0 +1,298 @@
+"""
+Subscriptions timeline, hybrid fan-out.
+
+Every follower of an author gets a TimelineEntry when the author publishes a
+recipe, and following an author copies the recipes the author already has.
+`?filter=subscriptions` then reads one (user, pub_date) index range instead
+of matching recipes against the list of followed authors.
+
+Authors with more than TIMELINE_FANOUT_MAX_FOLLOWERS followers are popular:
+their recipes are not written to timelines but merged in at read time, so
+one recipe never turns into millions of rows. A popular author is recorded
+as a MergedAuthor and stays merged after dropping below the threshold,
+until the backfill_merged_authors command writes their recipes to the
+timelines of their followers. Fan-out counters and the merge cost are kept
+in the feed cache, see timeline_metrics and the timeline_metrics command.
+"""
+
+import logging
+from typing import Dict, List
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from src.apps.users.models import CustomUser
+from src.base.cache import feed_cache
+from .models import MergedAuthor, TimelineEntry
+
+logger = logging.getLogger(__name__)
+
+POPULAR_AUTHORS_KEY = "timeline:popular_authors"
+MERGED_AUTHORS_KEY = "timeline:merged_authors"
+METRICS = (
+    "fanout_recipes",
+    "fanout_entries",
+    "fanout_skipped",
+    "timeline_reads",
+    "merged_reads",
+    "merged_authors",
+    "merged_rows",
+    "merge_ms",
+)
+
+
+def _metric_key(name: str) -> str:
+    return f"timeline:metrics:{name}"
+
+
+def _count(name: str, amount: int = 1) -> None:
+    key = _metric_key(name)
+    feed_cache.add(key, 0, None)
+    try:
+        feed_cache.incr(key, amount)
+    except ValueError:
+        # evicted between add and incr, the counter starts over
+        feed_cache.set(key, amount, None)
+
+
+def timeline_metrics() -> Dict[str, int]:
+    """Fan-out and merge counters since the cache was last cleared"""
+
+    values = feed_cache.get_many([_metric_key(name) for name in METRICS])
+    return {name: values.get(_metric_key(name), 0) for name in METRICS}
+
+
+def record_merge_cost(seconds: float, rows: int) -> None:
+    """Count the time of a merged feed query and the merged recipes it read"""
+
+    _count("merge_ms", round(seconds * 1000))
+    _count("merged_rows", rows)
+
+
+def popular_authors() -> frozenset:
+    """
+    Ids of authors above the fan-out threshold, recomputed every
+    TIMELINE_POPULAR_AUTHORS_TIMEOUT seconds. Recomputing records them as
+    merged authors before their recipes are left out of timelines.
+    """
+
+    authors = feed_cache.get(POPULAR_AUTHORS_KEY)
+    if authors is None:
+        authors = frozenset(
+            CustomUser.objects.filter(
+                followers_count__gt=settings.TIMELINE_FANOUT_MAX_FOLLOWERS
+            ).values_list("id", flat=True)
+        )
+        MergedAuthor.objects.bulk_create(
+            [MergedAuthor(author_id=author_id) for author_id in authors],
+            ignore_conflicts=True,
+        )
+        feed_cache.delete(MERGED_AUTHORS_KEY)
+        feed_cache.set(
+            POPULAR_AUTHORS_KEY, authors, settings.TIMELINE_POPULAR_AUTHORS_TIMEOUT
+        )
+    return authors
+
+
+def merged_authors() -> frozenset:
+    """
+    Ids of authors merged at read time: the popular ones and those whose
+    recipes are not backfilled yet
+    """
+
+    authors = feed_cache.get(MERGED_AUTHORS_KEY)
+    if authors is None:
+        authors = frozenset(MergedAuthor.objects.values_list("author_id", flat=True))
+        feed_cache.set(
+            MERGED_AUTHORS_KEY, authors, settings.TIMELINE_POPULAR_AUTHORS_TIMEOUT
+        )
+    return popular_authors() | authors
+
+
+def _insert(entries) -> int:
+    batch, inserted = [], 0
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) == settings.TIMELINE_BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        inserted += len(batch)
+    return inserted
+
+
+def fan_out_recipe(recipe: Recipe) -> int:
+    """Add the recipe to the timelines of the author's followers"""
+
+    if recipe.author_id in popular_authors():
+        _count("fanout_skipped")
+        logger.info(
+            "Recipe %s of popular author %s merged at read time",
+            recipe.id,
+            recipe.author_id,
+        )
+        return 0
+
+    followers = (
+        Follow.objects.filter(author_id=recipe.author_id)
+        .values_list("user_id", flat=True)
+        .order_by()
+    )
+    inserted = _insert(
+        TimelineEntry(
+            user_id=user_id,
+            recipe_id=recipe.id,
+            author_id=recipe.author_id,
+            pub_date=recipe.pub_date,
+        )
+        for user_id in followers.iterator(chunk_size=settings.TIMELINE_BATCH_SIZE)
+    )
+    _count("fanout_recipes")
+    _count("fanout_entries", inserted)
+    return inserted
+
+
+def backfill_timeline(user_id: int, author_id: int) -> int:
+    """
+    Add recipes the author has already published to the user's timeline,
+    recipes of popular authors are merged at read time instead
+    """
+
+    if author_id in popular_authors():
+        return 0
+
+    recipes = (
+        Recipe.objects.filter(author_id=author_id)
+        .values_list("id", "pub_date")
+        .order_by()
+    )
+    return _insert(
+        TimelineEntry(
+            user_id=user_id,
+            recipe_id=recipe_id,
+            author_id=author_id,
+            pub_date=pub_date,
+        )
+        for recipe_id, pub_date in recipes.iterator(
+            chunk_size=settings.TIMELINE_BATCH_SIZE
+        )
+    )
+
+
+def drop_from_timeline(user_id: int, author_id: int) -> None:
+    """Remove the author's recipes from the user's timeline"""
+
+    TimelineEntry.objects.filter(user_id=user_id, author_id=author_id).delete()
+
+
+def _backfill_followers(author_id: int) -> int:
+    recipes = list(
+        Recipe.objects.filter(author_id=author_id).values_list("id", "pub_date")
+    )
+    followers = (
+        Follow.objects.filter(author_id=author_id)
+        .values_list("user_id", flat=True)
+        .order_by()
+    )
+    return _insert(
+        TimelineEntry(
+            user_id=user_id,
+            recipe_id=recipe_id,
+            author_id=author_id,
+            pub_date=pub_date,
+        )
+        for user_id in followers.iterator(chunk_size=settings.TIMELINE_BATCH_SIZE)
+        for recipe_id, pub_date in recipes
+    )
+
+
+def release_merged_authors() -> int:
+    """
+    Write the recipes of merged authors who dropped below the threshold to
+    the timelines of their followers, then stop merging them. Returns number
+    of released authors
+    """
+
+    threshold = settings.TIMELINE_FANOUT_MAX_FOLLOWERS
+    # recipes published from now on are fanned out to their followers
+    feed_cache.delete(POPULAR_AUTHORS_KEY)
+    released = 0
+    for author_id in MergedAuthor.objects.filter(
+        author__followers_count__lte=threshold
+    ).values_list("author_id", flat=True):
+        entries = _backfill_followers(author_id)
+        # kept merged if the author became popular again meanwhile
+        deleted, _ = MergedAuthor.objects.filter(
+            author_id=author_id, author__followers_count__lte=threshold
+        ).delete()
+        if deleted:
+            released += 1
+            logger.info(
+                "Merged author %s released with %s timeline entries",
+                author_id,
+                entries,
+            )
+    feed_cache.delete(MERGED_AUTHORS_KEY)
+    return released
+
+
+def rebuild_timelines() -> int:
+    """
+    Refill every timeline from follows, authors below the threshold are no
+    longer merged. Returns number of entries
+    """
+
+    feed_cache.delete(POPULAR_AUTHORS_KEY)
+    TimelineEntry.objects.all().delete()
+    MergedAuthor.objects.filter(
+        author__followers_count__lte=settings.TIMELINE_FANOUT_MAX_FOLLOWERS
+    ).delete()
+    feed_cache.delete(MERGED_AUTHORS_KEY)
+    follows = Follow.objects.values_list("user_id", "author_id").order_by()
+    return sum(
+        backfill_timeline(user_id, author_id)
+        for user_id, author_id in follows.iterator(
+            chunk_size=settings.TIMELINE_BATCH_SIZE
+        )
+    )
+
+
+def followed_merged_authors(user) -> List[int]:
+    authors = merged_authors()
+    if not authors:
+        return []
+    return list(
+        Follow.objects.filter(user=user, author_id__in=authors).values_list(
+            "author_id", flat=True
+        )
+    )
+
+
+def filter_subscriptions(queryset: QuerySet, user, merged: List[int]) -> QuerySet:
+    """
+    Recipes of the authors the user follows. Without merged authors this is
+    a join on the user's timeline; otherwise the timeline is merged with the
+    recipes of the followed merged authors, see followed_merged_authors.
+    """
+
+    if not merged:
+        _count("timeline_reads")
+        return queryset.filter(timeline_entries__user=user)
+
+    _count("merged_reads")
+    _count("merged_authors", len(merged))
+    logger.info("Timeline of user %s merged with %s authors", user.pk, len(merged))
+    return queryset.filter(
+        Q(id__in=TimelineEntry.objects.filter(user=user).values("recipe_id"))
+        | Q(author_id__in=merged)
+    )
+
+
+def reads_timeline(queryset: QuerySet) -> bool:
+    """Whether the queryset is joined to the timeline and can walk its index"""
+
+    return TimelineEntry._meta.db_table in queryset.query.alias_map
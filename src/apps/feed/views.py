@@ -1,28 +1,36 @@
-from datetime import datetime, timedelta
+import time
 
-from django.db.models import Count, F, Q, Prefetch
-from django.utils.timezone import make_aware
+from django.db.models import F, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, viewsets, mixins
+from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny, IsAuthenticated
 
-from django.conf import settings
 from src.apps.favorite.models import Favorite
+from src.apps.follow.mixins import IncludeFollowStatusMixin
+from src.apps.reactions.mixins import IncludeReactionsMixin
 from src.apps.recipes.models import Recipe
 from src.base.paginators import FeedPagination
-from .filters import FeedFilter
+from .filters import FeedFilter, FeedOrderingFilter
+from .response_cache import cached_feed_response
 from .serializers import FeedSerializer
+from .timeline import record_merge_cost
 
 
-class FeedUserList(mixins.ListModelMixin, viewsets.GenericViewSet):
+class FeedUserList(
+    IncludeReactionsMixin,
+    IncludeFollowStatusMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
     """
     Listing all posts with sorting by activity_count, filtering by subs and
-    username
+    username. `?include=reactions` adds reactions by emoji to every post,
+    `?include=follow_status` adds follow flags of the viewer to its author.
     """
 
     pagination_class = FeedPagination
     serializer_class = FeedSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FeedOrderingFilter]
     ordering_fields = ["activity_count"]
     ordering = ["-pub_date"]
     filterset_class = FeedFilter
@@ -30,15 +38,13 @@ class FeedUserList(mixins.ListModelMixin, viewsets.GenericViewSet):
     def get_queryset(self):
         """
         Get all posts with sorting by activity_count, filtering by subs and
-        username
+        username. Counters are read from the denormalized RecipeStats row,
+        which every recipe gets on creation; the inner join lets ordering by
+        activity_count walk the RecipeStats index instead of sorting.
         """
 
-        last_month_start = make_aware(
-            datetime.now() - timedelta(days=settings.ACTIVITY_INTERVAL)
-        )
-
         queryset = (
-            Recipe.objects.all()
+            Recipe.objects.filter(stats__isnull=False)
             .only(
                 "id",
                 "title",
@@ -69,31 +75,43 @@ class FeedUserList(mixins.ListModelMixin, viewsets.GenericViewSet):
                 ),
             )
             .annotate(
-                latest_comments_count=Count(
-                    "comments",
-                    filter=Q(comments__pub_date__gte=last_month_start),
-                    distinct=True,
-                ),
-                latest_views_count=Count(
-                    "views",
-                    filter=Q(views__created_at__gte=last_month_start),
-                    distinct=True,
-                ),
-                latest_reactions_count=Count(
-                    "reactions",
-                    filter=Q(reactions__pub_date__gte=last_month_start),
-                    distinct=True,
-                ),
-                comments_count=Count("comments", distinct=True),
-                views_count=Count("views", distinct=True),
-                reactions_count=Count("reactions", distinct=True),
-                activity_count=F("latest_comments_count")
-                + F("latest_views_count")
-                + F("latest_reactions_count"),
+                comments_count=F("stats__comments_count"),
+                views_count=F("stats__views_count"),
+                reactions_count=F("stats__reactions_count"),
+                activity_count=F("stats__activity_count"),
             )
         )
         return queryset
 
+    def paginate_queryset(self, queryset):
+        """
+        Record the time of reading a page merged with popular authors and
+        the number of their recipes on it, see feed.timeline
+        """
+
+        merged = getattr(self.request, "timeline_merged_authors", None)
+        if not merged:
+            return super().paginate_queryset(queryset)
+        started = time.perf_counter()
+        page = super().paginate_queryset(queryset)
+        merged = set(merged)
+        record_merge_cost(
+            time.perf_counter() - started,
+            sum(recipe.author_id in merged for recipe in page or ()),
+        )
+        return page
+
+    def list(self, request, *args, **kwargs):
+        """
+        Anonymous visitors share cached pages, see response_cache
+        """
+
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+        return cached_feed_response(
+            request, lambda: super(FeedUserList, self).list(request, *args, **kwargs)
+        )
+
     def get_permissions(self):
         """
         Get permissions for feed list
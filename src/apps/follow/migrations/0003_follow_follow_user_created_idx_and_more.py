@@ -0,0 +1,27 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("follow", "0002_follow_same_follower_constraint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="follow",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="follow_user_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="follow",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="follow_author_created_idx",
+            ),
+        ),
+    ]
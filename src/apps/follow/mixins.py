@@ -0,0 +1,49 @@
+from typing import Dict, Optional
+
+from src.base.mixins import IncludeMixin
+from .services import follow_status_of_users
+
+
+class IncludeFollowStatusMixin(IncludeMixin):
+    """
+    View mixin for `?include=follow_status` on paginated lists: follow flags
+    of the viewer towards the users of the page are read with one query and
+    handed to the serializers in the `follow_status` context.
+    follow_status_user_field names the user id attribute of a listed object.
+    """
+
+    follow_status_user_field = "author_id"
+
+    def include_follow_status(self) -> bool:
+        return self.includes("follow_status")
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.follow_status: Optional[Dict[int, dict]] = None
+        if page is not None and self.include_follow_status():
+            self.follow_status = follow_status_of_users(
+                self.request.user,
+                [getattr(obj, self.follow_status_user_field) for obj in page],
+            )
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["follow_status"] = getattr(self, "follow_status", None)
+        return context
+
+
+class FollowStatusSerializerMixin:
+    """
+    User serializer mixin adding `is_follow` and `is_follower` of the user
+    when the view resolved them, see IncludeFollowStatusMixin. Nested user
+    serializers get the context of their parent, so recipe authors and
+    followers in lists are covered too.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        status = self.context.get("follow_status")
+        if status is not None and instance.id in status:
+            data.update(status[instance.id])
+        return data
@@ -30,6 +30,15 @@ class Follow(models.Model):
         verbose_name = "Подписка"
         verbose_name_plural = "Подписки"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"], name="follow_user_created_idx"
+            ),
+            models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="follow_author_created_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(fields=["user", "author"], name="unique_following"),
             models.CheckConstraint(
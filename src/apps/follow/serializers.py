@@ -1,12 +1,17 @@
 from django.conf import settings
 from rest_framework import serializers
 
-from src.base.code_text import ALREADY_SUBSCRIBED_TO_THIS_AUTHOR
+from src.apps.follow.mixins import FollowStatusSerializerMixin
 from src.apps.follow.models import Follow
 from src.apps.users.models import CustomUser
+from src.base.code_text import (
+    ALREADY_SUBSCRIBED_TO_THIS_AUTHOR,
+    NO_USERS_FOR_FOLLOW_STATUS,
+)
+from src.base.fields import CommaSeparatedListField
 
 
-class UserFollowerSerializer(serializers.ModelSerializer):
+class UserFollowerSerializer(FollowStatusSerializerMixin, serializers.ModelSerializer):
     bio = serializers.SerializerMethodField()
 
     def get_bio(self, obj):
@@ -77,3 +82,27 @@ class FollowCreateSerializer(serializers.ModelSerializer):
             )
 
         return data
+
+
+class FollowStatusQuerySerializer(serializers.Serializer):
+    """
+    Users to look up follow flags of, by username or id
+    """
+
+    usernames = CommaSeparatedListField(
+        child=serializers.CharField(),
+        required=False,
+        default=list,
+        max_length=settings.FOLLOW_STATUS_MAX_USERS,
+    )
+    ids = CommaSeparatedListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=settings.FOLLOW_STATUS_MAX_USERS,
+    )
+
+    def validate(self, attrs):
+        if not attrs["usernames"] and not attrs["ids"]:
+            raise serializers.ValidationError(NO_USERS_FOR_FOLLOW_STATUS)
+        return attrs
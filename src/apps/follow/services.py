@@ -0,0 +1,30 @@
+from typing import Dict, Iterable
+
+from django.db.models import Q
+
+from .models import Follow
+
+
+def follow_status_of_users(user, user_ids: Iterable[int]) -> Dict[int, dict]:
+    """
+    `is_follow` (the user follows them) and `is_follower` (they follow the
+    user) flags of the given users, read with one query on the (user,
+    author) and (author, ...) indexes of Follow
+    """
+
+    user_ids = list(dict.fromkeys(user_ids))
+    status = {
+        user_id: {"is_follow": False, "is_follower": False} for user_id in user_ids
+    }
+    if not user.is_authenticated or not user_ids:
+        return status
+
+    rows = Follow.objects.filter(
+        Q(user=user, author_id__in=user_ids) | Q(author=user, user_id__in=user_ids)
+    ).values_list("user_id", "author_id")
+    for follower_id, author_id in rows:
+        if follower_id == user.id:
+            status[author_id]["is_follow"] = True
+        if author_id == user.id:
+            status[follower_id]["is_follower"] = True
+    return status
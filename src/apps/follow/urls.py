@@ -1,7 +1,12 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from src.apps.follow.views import FollowViewSet, FollowerViewSet, SubscribeViewSet
+from src.apps.follow.views import (
+    FollowerViewSet,
+    FollowStatusViewSet,
+    FollowViewSet,
+    SubscribeViewSet,
+)
 
 router = DefaultRouter()
 router.register(
@@ -14,6 +19,7 @@ router.register(
     FollowerViewSet,
     basename="subscribers",
 )
+router.register(r"follow-status", FollowStatusViewSet, basename="follow-status")
 
 urlpatterns = [
     path("subscribe/", SubscribeViewSet.as_view({"post": "create"}), name="subscribe"),
@@ -1,4 +1,4 @@
-from django.db.models import Count
+from django.db.models import F, Q
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import ListModelMixin
 from rest_framework.permissions import IsAuthenticated
@@ -11,25 +11,33 @@ from rest_framework.status import (
 )
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
+from src.apps.follow.mixins import IncludeFollowStatusMixin
+from src.apps.follow.models import Follow
+from src.apps.follow.serializers import (
+    FollowCreateSerializer,
+    FollowerListSerializer,
+    FollowListSerializer,
+    FollowStatusQuerySerializer,
+)
+from src.apps.follow.services import follow_status_of_users
+from src.apps.users.models import CustomUser
 from src.base.code_text import (
-    USER_DOES_NOT_EXIST,
     AUTHOR_IS_MISSING,
     AUTHOR_NOT_FOUND,
-    SUCCESSFUL_ATTEMPT_ON_AUTHOR,
     NOT_FOLLOWING_THIS_USER,
+    SUCCESSFUL_ATTEMPT_ON_AUTHOR,
     SUCCESSFUL_UNSUBSCRIBE_FROM_THE_AUTHOR,
+    USER_DOES_NOT_EXIST,
 )
-from src.apps.follow.models import Follow
-from src.apps.follow.serializers import (
-    FollowListSerializer,
-    FollowerListSerializer,
-    FollowCreateSerializer,
-)
-from src.apps.users.models import CustomUser
 from src.base.paginators import FollowerPagination
 
 
-class FollowViewSet(GenericViewSet, ListModelMixin):
+class FollowViewSet(IncludeFollowStatusMixin, GenericViewSet, ListModelMixin):
+    """
+    Authors the user follows, `?include=follow_status` adds follow flags of
+    the viewer to every author
+    """
+
     serializer_class = FollowListSerializer
     permission_classes = (IsAuthenticated,)
     pagination_class = FollowerPagination
@@ -40,7 +48,7 @@ class FollowViewSet(GenericViewSet, ListModelMixin):
         return (
             Follow.objects.filter(user__username=username)
             .select_related("author")
-            .annotate(subscribers_count=Count("author__following"))
+            .annotate(subscribers_count=F("author__followers_count"))
             .order_by("-created_at")
         )
 
@@ -53,22 +61,28 @@ class FollowViewSet(GenericViewSet, ListModelMixin):
             )
         queryset = self.get_queryset()
         page = self.paginate_queryset(queryset)
-        serializer = FollowListSerializer(page, many=True)
+        serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
 
-class FollowerViewSet(GenericViewSet, ListModelMixin):
+class FollowerViewSet(IncludeFollowStatusMixin, GenericViewSet, ListModelMixin):
+    """
+    Followers of the user, `?include=follow_status` adds follow flags of
+    the viewer to every follower
+    """
+
     serializer_class = FollowerListSerializer
     pagination_class = FollowerPagination
     permission_classes = (IsAuthenticated,)
     swagger_tags = ["subscriptions"]
+    follow_status_user_field = "user_id"
 
     def get_queryset(self):
         username = self.kwargs.get("username")
         return (
             Follow.objects.filter(author__username=username)
             .select_related("user")
-            .annotate(subscribers_count=Count("user__following"))
+            .annotate(subscribers_count=F("user__followers_count"))
             .order_by("-created_at")
         )
 
@@ -81,10 +95,37 @@ class FollowerViewSet(GenericViewSet, ListModelMixin):
             )
         queryset = self.get_queryset()
         page = self.paginate_queryset(queryset)
-        serializer = FollowerListSerializer(page, many=True)
+        serializer = self.get_serializer(page, many=True)
         return self.get_paginated_response(serializer.data)
 
 
+class FollowStatusViewSet(GenericViewSet):
+    """
+    Follow flags of the viewer towards many users at once, for author chips
+    rendered outside of paginated lists. Unknown users are left out.
+    """
+
+    serializer_class = FollowStatusQuerySerializer
+    permission_classes = (IsAuthenticated,)
+    swagger_tags = ["subscriptions"]
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        usernames = serializer.validated_data["usernames"]
+        ids = serializer.validated_data["ids"]
+
+        users = list(
+            CustomUser.objects.filter(Q(username__in=usernames) | Q(id__in=ids))
+            .order_by("id")
+            .values("id", "username")
+        )
+        status = follow_status_of_users(request.user, [user["id"] for user in users])
+        return Response(
+            {"results": [{**user, **status[user["id"]]} for user in users]}
+        )
+
+
 class SubscribeViewSet(ModelViewSet):
     serializer_class = FollowCreateSerializer
     permission_classes = [IsAuthenticated]
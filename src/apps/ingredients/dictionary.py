@@ -0,0 +1,185 @@
+"""
+Process-level name → id dictionaries of ingredients and units.
+
+Both tables are small and only grow, so every process keeps all of their
+names in memory: server processes load the tables on startup, see
+warm_dictionaries, other processes on the first lookup. Unknown names are
+inserted with one INSERT ... ON CONFLICT DO NOTHING and read back with one
+SELECT. Recipe writes with known names skip the tables entirely.
+
+Names inserted in a transaction enter the dictionary when it commits, so a
+rollback never leaves ids of missing rows behind. Renaming or deleting a
+row clears the dictionary; with INGREDIENT_DICTIONARY_CACHE_ALIAS set the
+clear also bumps a version in that shared cache, which makes every other
+process reload its dictionary on its next lookup. A process reads the
+version at most every INGREDIENT_DICTIONARY_VERSION_CHECK_INTERVAL seconds.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Type
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Model
+
+from .models import Ingredient, Unit
+
+logger = logging.getLogger(__name__)
+
+
+class NameDictionary:
+    """Name → id dictionary of a model with a unique `name` field"""
+
+    def __init__(self, model: Type[Model]):
+        self.model = model
+        self.version_key = f"ingredients:dictionary:{model._meta.model_name}:version"
+        self._ids: Dict[str, int] = {}
+        self._loaded = False
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Optional[Dict[str, int]]], None]] = []
+
+    def subscribe(self, listener: Callable[[Optional[Dict[str, int]]], None]):
+        """
+        Call listener with the names added to the dictionary, or with None
+        when it was reloaded or cleared
+        """
+
+        self._listeners.append(listener)
+
+    def _notify(self, added: Optional[Dict[str, int]]) -> None:
+        for listener in self._listeners:
+            listener(added)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Every known name with its id, loading the table if needed"""
+
+        self.ensure_fresh()
+        with self._lock:
+            return dict(self._ids)
+
+    @property
+    def _shared_cache(self):
+        alias = settings.INGREDIENT_DICTIONARY_CACHE_ALIAS
+        return caches[alias] if alias else None
+
+    def _shared_version(self) -> Optional[int]:
+        cache = self._shared_cache
+        if cache is None:
+            return None
+        cache.add(self.version_key, time.time_ns(), None)
+        return cache.get(self.version_key)
+
+    def warm(self) -> None:
+        """Load every name of the table"""
+
+        checked_at = time.monotonic()
+        version = self._shared_version()
+        ids = dict(self.model.objects.values_list("name", "id"))
+        with self._lock:
+            self._ids = ids
+            self._loaded = True
+            self._version = version
+            self._checked_at = checked_at
+        self._notify(None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids = {}
+            self._loaded = False
+            self._version = None
+        self._notify(None)
+
+    def invalidate(self) -> None:
+        """Clear the dictionary here and, through the shared cache, elsewhere"""
+
+        self.clear()
+        cache = self._shared_cache
+        if cache is not None:
+            try:
+                cache.incr(self.version_key)
+            except ValueError:
+                self._shared_version()
+
+    def ensure_fresh(self) -> None:
+        if not self._loaded:
+            self.warm()
+            return
+        now = time.monotonic()
+        interval = settings.INGREDIENT_DICTIONARY_VERSION_CHECK_INTERVAL
+        if now - self._checked_at < interval:
+            return
+        self._checked_at = now
+        if self._shared_version() != self._version:
+            self.warm()
+
+    def _remember(self, ids: Dict[str, int]) -> None:
+        with self._lock:
+            self._ids.update(ids)
+        self._notify(ids)
+
+    def get_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Ids of the names, rows of unknown names are created. Known names cost
+        no query, unknown ones one INSERT and one SELECT together.
+        """
+
+        names = list(dict.fromkeys(names))
+        self.ensure_fresh()
+        ids = {name: self._ids[name] for name in names if name in self._ids}
+        missing = [name for name in names if name not in ids]
+        if not missing:
+            return ids
+
+        self.model.objects.bulk_create(
+            [self.model(name=name) for name in missing], ignore_conflicts=True
+        )
+        created = dict(
+            self.model.objects.filter(name__in=missing).values_list("name", "id")
+        )
+        transaction.on_commit(lambda: self._remember(created))
+        ids.update(created)
+        return ids
+
+    def find_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Ids of the existing names, nothing is created. Names unknown here
+        cost one SELECT, rows created by other processes are remembered.
+        """
+
+        names = list(dict.fromkeys(names))
+        self.ensure_fresh()
+        ids = {name: self._ids[name] for name in names if name in self._ids}
+        missing = [name for name in names if name not in ids]
+        if not missing:
+            return ids
+
+        found = dict(
+            self.model.objects.filter(name__in=missing).values_list("name", "id")
+        )
+        if found:
+            transaction.on_commit(lambda: self._remember(found))
+        ids.update(found)
+        return ids
+
+
+ingredient_dictionary = NameDictionary(Ingredient)
+unit_dictionary = NameDictionary(Unit)
+
+
+def warm_dictionaries() -> None:
+    """
+    Load the ingredient and unit dictionaries of a starting server process.
+    When the database or the shared cache is not reachable yet, they are
+    left to load on the first lookup.
+    """
+
+    try:
+        ingredient_dictionary.warm()
+        unit_dictionary.warm()
+    except Exception:
+        logger.exception("Ingredient dictionaries not warmed up")
@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer, CharField
 
@@ -38,3 +39,16 @@ class IngredientInRecipeSerializer(ModelSerializer):
                 MAX_COUNT_OF_INGREDIENT, code="no_more_than_1000"
             )
         return value
+
+
+class IngredientSuggestQuerySerializer(serializers.Serializer):
+    """
+    Prefix of the ingredient name and number of suggestions
+    """
+
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.INGREDIENT_SUGGEST_MAX_LIMIT,
+        default=settings.INGREDIENT_SUGGEST_LIMIT,
+    )
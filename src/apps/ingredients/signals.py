@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .dictionary import ingredient_dictionary, unit_dictionary
+from .models import Ingredient, Unit
+
+DICTIONARIES = {Ingredient: ingredient_dictionary, Unit: unit_dictionary}
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_save, sender=Unit)
+def invalidate_renamed_name(sender, instance, created, **kwargs):
+    """New rows are picked up on lookup, renamed ones change the mapping"""
+
+    if not created:
+        transaction.on_commit(DICTIONARIES[sender].invalidate)
+
+
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_delete, sender=Unit)
+def invalidate_deleted_name(sender, instance, **kwargs):
+    transaction.on_commit(DICTIONARIES[sender].invalidate)
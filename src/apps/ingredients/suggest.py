@@ -0,0 +1,105 @@
+"""
+Ingredient autocomplete served from memory.
+
+Every process keeps the ingredient names sorted by their casefolded form,
+so the names starting with a prefix are one bisect range. Matches are
+ranked by how many recipes use the ingredient, counted with one grouped
+query every INGREDIENT_SUGGEST_POPULARITY_TIMEOUT seconds.
+
+The names come from the ingredient dictionary: ingredients it learns are
+inserted into the sorted list one by one, a reload or clear of the
+dictionary (renames, deletes, other processes) rebuilds the list from it
+without touching the database.
+"""
+
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count
+
+from .dictionary import NameDictionary, ingredient_dictionary
+from .models import IngredientInRecipe
+
+# sorts after every character a name can contain
+PREFIX_END = chr(0x10FFFF)
+
+
+class PrefixIndex:
+    """Sorted (casefolded name, name, id) entries of a name dictionary"""
+
+    def __init__(self, dictionary: NameDictionary):
+        self.dictionary = dictionary
+        self._entries: List[Tuple[str, str, int]] = []
+        self._built = False
+        self._uses: Dict[int, int] = {}
+        self._uses_at: Optional[float] = None
+        self._lock = threading.Lock()
+        dictionary.subscribe(self._on_dictionary_change)
+
+    def _on_dictionary_change(self, added: Optional[Dict[str, int]]) -> None:
+        with self._lock:
+            if added is None:
+                self._entries = []
+                self._built = False
+            elif self._built:
+                for name, id in added.items():
+                    insort(self._entries, (name.casefold(), name, id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = []
+            self._built = False
+            self._uses = {}
+            self._uses_at = None
+
+    def _ensure_entries(self) -> None:
+        self.dictionary.ensure_fresh()
+        if self._built:
+            return
+        names = self.dictionary.snapshot()
+        entries = sorted((name.casefold(), name, id) for name, id in names.items())
+        with self._lock:
+            self._entries = entries
+            self._built = True
+
+    def _ensure_uses(self) -> None:
+        timeout = settings.INGREDIENT_SUGGEST_POPULARITY_TIMEOUT
+        if self._uses_at is not None and time.monotonic() - self._uses_at < timeout:
+            return
+        uses = dict(
+            IngredientInRecipe.objects.filter(ingredient__isnull=False)
+            .values_list("ingredient_id")
+            .annotate(uses=Count("id"))
+            .order_by()
+        )
+        with self._lock:
+            self._uses = uses
+            self._uses_at = time.monotonic()
+
+    def suggest(self, prefix: str, limit: int) -> List[dict]:
+        """
+        Up to limit ingredients whose name starts with prefix, case
+        insensitive, most used first and alphabetically among equals
+        """
+
+        self._ensure_entries()
+        self._ensure_uses()
+        prefix = prefix.casefold()
+        with self._lock:
+            entries, uses = self._entries, self._uses
+            start = bisect_left(entries, (prefix,))
+            end = bisect_left(entries, (prefix + PREFIX_END,), start)
+            matches = entries[start:end]
+        # nlargest keeps the alphabetical order of entries with equal uses
+        top = heapq.nlargest(limit, matches, key=lambda entry: uses.get(entry[2], 0))
+        return [
+            {"id": id, "name": name, "uses": uses.get(id, 0)}
+            for _, name, id in top
+        ]
+
+
+ingredient_suggestions = PrefixIndex(ingredient_dictionary)
@@ -0,0 +1,10 @@
+from rest_framework.routers import DefaultRouter
+
+from src.apps.ingredients.views import IngredientSuggestViewSet
+
+router = DefaultRouter()
+router.register(
+    r"ingredients/suggest", IngredientSuggestViewSet, basename="ingredients-suggest"
+)
+
+urlpatterns = router.urls
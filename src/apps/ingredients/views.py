@@ -0,0 +1,25 @@
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from .serializers import IngredientSuggestQuerySerializer
+from .suggest import ingredient_suggestions
+
+
+class IngredientSuggestViewSet(GenericViewSet):
+    """
+    Ingredients starting with `q`, most used in recipes first. Served from
+    memory, see src.apps.ingredients.suggest
+    """
+
+    serializer_class = IngredientSuggestQuerySerializer
+    permission_classes = (AllowAny,)
+    swagger_tags = ["ingredients"]
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        results = ingredient_suggestions.suggest(
+            serializer.validated_data["q"], serializer.validated_data["limit"]
+        )
+        return Response({"results": results})
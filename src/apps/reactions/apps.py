@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ReactionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "src.apps.reactions"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .models import Reaction
+        from .registry import (
+            clear_reaction_content_types,
+            register_reaction_models,
+        )
+
+        register_reaction_models(Reaction.limit_models)
+        post_migrate.connect(clear_reaction_content_types)
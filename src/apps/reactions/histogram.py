@@ -0,0 +1,242 @@
+"""
+Cached reaction histograms.
+
+Every reacted object has one counter key per emoji and a `built` key saying
+the counters were filled from the Reaction table. Creating and cancelling a
+reaction shifts its counter with cache.incr/decr after commit, so reading a
+histogram never touches the table while the keys live. On a cache where
+incr is not atomic (see is_atomic_cache) the histogram is dropped instead
+and counted again on the next read.
+
+A write commits before its shift runs, so a rebuild counting the table in
+between would have the shift applied on top of its count. Every write bumps
+a `writes` counter before commit and an `applied` counter after its shift.
+A rebuild caches only objects with no write in flight when it starts and
+drops the histograms of objects written to while it ran.
+"""
+
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from src.base.cache import is_atomic_cache, reactions_cache as cache
+from .choices import EmojyChoice
+from .models import Reaction
+
+REBUILD_CHUNK_SIZE = 1000
+
+
+def _built_key(content_type_id: int, object_id: int) -> str:
+    return f"reactions:histogram:{content_type_id}:{object_id}:built"
+
+
+def _emoji_key(content_type_id: int, object_id: int, emoji: str) -> str:
+    return f"reactions:histogram:{content_type_id}:{object_id}:{emoji}"
+
+
+def _writes_key(content_type_id: int, object_id: int) -> str:
+    return f"reactions:histogram:{content_type_id}:{object_id}:writes"
+
+
+def _applied_key(content_type_id: int, object_id: int) -> str:
+    return f"reactions:histogram:{content_type_id}:{object_id}:applied"
+
+
+def _bump(key: str) -> None:
+    # counters of rolled back writes never settle, they expire instead
+    cache.add(key, 0, settings.REACTION_HISTOGRAM_WRITE_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def _write_counters(content_type_id: int, object_ids: List[int]) -> Dict:
+    return cache.get_many(
+        [_writes_key(content_type_id, object_id) for object_id in object_ids]
+        + [_applied_key(content_type_id, object_id) for object_id in object_ids]
+    )
+
+
+def _store_histograms(histograms: Dict[Tuple[int, int], Dict[str, int]]) -> None:
+    values = {}
+    for (content_type_id, object_id), counts in histograms.items():
+        for emoji in EmojyChoice.values:
+            values[_emoji_key(content_type_id, object_id, emoji)] = counts.get(
+                emoji, 0
+            )
+    cache.set_many(values, settings.REACTION_HISTOGRAM_TIMEOUT)
+    # `built` goes last, a reader never sees it without the counters
+    cache.set_many(
+        {_built_key(*key): True for key in histograms},
+        settings.REACTION_HISTOGRAM_TIMEOUT,
+    )
+
+
+def rebuild_reaction_histograms(
+    content_type_id: int, object_ids: Iterable[int]
+) -> Dict[int, Dict[str, int]]:
+    """
+    Count active reactions of the objects by emoji and cache the result of
+    objects nobody is reacting to meanwhile
+    """
+
+    object_ids = list(object_ids)
+    before = _write_counters(content_type_id, object_ids)
+    settled = [
+        object_id
+        for object_id in object_ids
+        if before.get(_writes_key(content_type_id, object_id), 0)
+        == before.get(_applied_key(content_type_id, object_id), 0)
+    ]
+    histograms = {object_id: {} for object_id in object_ids}
+    rows = (
+        Reaction.objects.filter(
+            content_type_id=content_type_id,
+            object_id__in=object_ids,
+            is_deleted=False,
+        )
+        .values("object_id", "emoji")
+        .order_by()
+        .annotate(count=Count("id"))
+    )
+    for row in rows:
+        histograms[row["object_id"]][row["emoji"]] = row["count"]
+
+    _store_histograms(
+        {
+            (content_type_id, object_id): histograms[object_id]
+            for object_id in settled
+        }
+    )
+    after = _write_counters(content_type_id, settled)
+    cache.delete_many(
+        [
+            _built_key(content_type_id, object_id)
+            for object_id in settled
+            if after.get(_writes_key(content_type_id, object_id), 0)
+            != before.get(_writes_key(content_type_id, object_id), 0)
+        ]
+    )
+    return histograms
+
+
+def rebuild_all_reaction_histograms() -> int:
+    """Rebuild histograms of every reacted object. Returns number of objects"""
+
+    pairs = (
+        Reaction.objects.values_list("content_type_id", "object_id")
+        .order_by("content_type_id", "object_id")
+        .distinct()
+    )
+    rebuilt = 0
+    for content_type_id, group in groupby(
+        pairs.iterator(chunk_size=REBUILD_CHUNK_SIZE), key=itemgetter(0)
+    ):
+        object_ids = [object_id for _, object_id in group]
+        for start in range(0, len(object_ids), REBUILD_CHUNK_SIZE):
+            rebuild_reaction_histograms(
+                content_type_id, object_ids[start : start + REBUILD_CHUNK_SIZE]
+            )
+        rebuilt += len(object_ids)
+    return rebuilt
+
+
+def get_reaction_histograms(
+    content_type_id: int, object_ids: Iterable[int]
+) -> Dict[int, Dict[str, int]]:
+    """
+    Number of active reactions on each object by emoji, emojis nobody used
+    are left out. Objects missing from the cache are counted with one grouped
+    query.
+    """
+
+    object_ids = list(dict.fromkeys(object_ids))
+    keys = {
+        object_id: {
+            emoji: _emoji_key(content_type_id, object_id, emoji)
+            for emoji in EmojyChoice.values
+        }
+        for object_id in object_ids
+    }
+    values = cache.get_many(
+        [_built_key(content_type_id, object_id) for object_id in object_ids]
+        + [key for emoji_keys in keys.values() for key in emoji_keys.values()]
+    )
+
+    histograms, missing = {}, []
+    for object_id, emoji_keys in keys.items():
+        if _built_key(content_type_id, object_id) in values and all(
+            key in values for key in emoji_keys.values()
+        ):
+            histograms[object_id] = {
+                emoji: values[key] for emoji, key in emoji_keys.items()
+            }
+        else:
+            missing.append(object_id)
+    if missing:
+        histograms.update(rebuild_reaction_histograms(content_type_id, missing))
+
+    return {
+        object_id: {
+            emoji: count for emoji, count in histograms[object_id].items() if count > 0
+        }
+        for object_id in object_ids
+    }
+
+
+def get_reaction_histogram(content_type_id: int, object_id: int) -> Dict[str, int]:
+    """Histogram of a single object, see get_reaction_histograms"""
+
+    return get_reaction_histograms(content_type_id, [object_id])[object_id]
+
+
+def _shift(content_type_id: int, object_id: int, emoji: str, delta: int) -> None:
+    try:
+        _apply_shift(content_type_id, object_id, emoji, delta)
+    finally:
+        _bump(_applied_key(content_type_id, object_id))
+
+
+def _apply_shift(
+    content_type_id: int, object_id: int, emoji: str, delta: int
+) -> None:
+    if not is_atomic_cache("reactions"):
+        # concurrent get+set increments would lose shifts
+        cache.delete(_built_key(content_type_id, object_id))
+        return
+    if not cache.get(_built_key(content_type_id, object_id)):
+        return
+    try:
+        cache.incr(_emoji_key(content_type_id, object_id, emoji), delta)
+    except ValueError:
+        # the counter expired on its own, rebuild on the next read
+        cache.delete(_built_key(content_type_id, object_id))
+
+
+def shift_reaction_histogram(
+    content_type_id: int, object_id: int, emoji: str, delta: int
+) -> None:
+    """
+    Shift the emoji counter of the object by delta once the current
+    transaction commits. Histograms that are not cached are left alone.
+    """
+
+    _bump(_writes_key(content_type_id, object_id))
+    transaction.on_commit(lambda: _shift(content_type_id, object_id, emoji, delta))
+
+
+def _invalidate(content_type_id: int, object_id: int) -> None:
+    try:
+        cache.delete(_built_key(content_type_id, object_id))
+    finally:
+        _bump(_applied_key(content_type_id, object_id))
+
+
+def invalidate_reaction_histogram(content_type_id: int, object_id: int) -> None:
+    _bump(_writes_key(content_type_id, object_id))
+    transaction.on_commit(lambda: _invalidate(content_type_id, object_id))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.reactions.histogram import rebuild_all_reaction_histograms
+
+
+class Command(BaseCommand):
+    help = "Refill cached reaction histograms of every object from the table."
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_all_reaction_histograms()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt reaction histograms of {rebuilt} objects.")
+        )
@@ -0,0 +1,40 @@
+from typing import Dict, Optional
+
+from src.base.mixins import IncludeMixin
+from src.base.services import summarize_reactions_on_objects
+
+
+class IncludeReactionsMixin(IncludeMixin):
+    """
+    View mixin for `?include=reactions` on paginated lists: reactions by
+    emoji and reactions of the viewer are summarized for the whole page at
+    once and handed to the serializer in the `reactions_summary` context
+    """
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.reactions_summary: Optional[Dict[int, dict]] = None
+        if page is not None and self.includes("reactions"):
+            self.reactions_summary = summarize_reactions_on_objects(
+                queryset.model, [obj.id for obj in page], self.request.user
+            )
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["reactions_summary"] = getattr(self, "reactions_summary", None)
+        return context
+
+
+class ReactionsSummarySerializerMixin:
+    """
+    Serializer mixin adding `reactions` and `user_reactions` of the object
+    when the view summarized them, see IncludeReactionsMixin
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        summary = self.context.get("reactions_summary")
+        if summary is not None:
+            data.update(summary[instance.id])
+        return data
@@ -28,7 +28,7 @@ class Reaction(models.Model):
         on_delete=models.CASCADE,
     )
     is_deleted = models.BooleanField(default=False)
-    pub_date = models.DateTimeField(auto_now_add=True)
+    pub_date = models.DateTimeField(auto_now_add=True, db_index=True)
     emoji = models.CharField(
         choices=EmojyChoice.choices, max_length=10, blank=True, default=EmojyChoice.LIKE
     )
@@ -0,0 +1,65 @@
+"""
+Content type ids of the models reactions can be made on.
+
+ReactionsConfig.ready() registers the models allowed by
+Reaction.limit_models, their ids are resolved with a single query on first
+use (the database can't be queried while apps are loading) and stay in the
+process. Hot paths filter on the raw content_type_id instead of asking
+ContentType on every request.
+"""
+
+from typing import Dict, List, Tuple, Type, Union
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Model
+
+ModelKey = Tuple[str, str]
+
+_models: List[ModelKey] = []
+_content_type_ids: Dict[ModelKey, int] = {}
+
+
+def register_reaction_models(limit_models) -> None:
+    """Register the (app_label, model) pairs of a limit_choices_to Q"""
+
+    _models.clear()
+    for child in limit_models.children:
+        lookups = dict(child.children)
+        _models.append((lookups["app_label"], lookups["model"]))
+    _content_type_ids.clear()
+
+
+def load_reaction_content_types() -> None:
+    """
+    Resolve content type ids of all registered models in one query. This
+    also fills ContentType's own cache used by the generic relations.
+    """
+
+    models = [apps.get_model(app_label, model) for app_label, model in _models]
+    _content_type_ids.clear()
+    _content_type_ids.update(
+        {
+            (model._meta.app_label, model._meta.model_name): content_type.id
+            for model, content_type in ContentType.objects.get_for_models(
+                *models
+            ).items()
+        }
+    )
+
+
+def clear_reaction_content_types(**kwargs) -> None:
+    """Content types may be recreated by migrations and flushes"""
+
+    _content_type_ids.clear()
+
+
+def reaction_content_type_id(model: Union[Type[Model], Model]) -> int:
+    """Content type id of a model or instance reactions can be made on"""
+
+    key = (model._meta.app_label, model._meta.model_name)
+    if key not in _content_type_ids:
+        if key not in _models:
+            raise LookupError(f"Reactions can't be made on {key[0]}.{key[1]}")
+        load_reaction_content_types()
+    return _content_type_ids[key]
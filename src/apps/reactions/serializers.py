@@ -1,7 +1,17 @@
-from rest_framework.serializers import ModelSerializer, ChoiceField
+from django.conf import settings
+from rest_framework.serializers import (
+    CharField,
+    ChoiceField,
+    IntegerField,
+    ModelSerializer,
+    Serializer,
+    ValidationError,
+)
 
 from src.apps.comments.models import Comment
 from src.apps.recipes.models import Recipe
+from src.base.code_text import NO_OBJECTS_FOR_REACTIONS_SUMMARY
+from src.base.fields import CommaSeparatedListField
 from src.base.services import count_reactions_on_objects, show_user_reactions
 from .choices import EmojyChoice
 from .models import Reaction
@@ -54,3 +64,27 @@ class CommentReactionsListSerializer(ModelSerializer):
             "reactions": count_reactions_on_objects(instance),
             "user_reactions": show_user_reactions(user, instance),
         }
+
+
+class ReactionsSummaryQuerySerializer(Serializer):
+    """
+    Recipes and comments to summarize reactions of
+    """
+
+    recipes = CommaSeparatedListField(
+        child=CharField(),
+        required=False,
+        default=list,
+        max_length=settings.REACTIONS_SUMMARY_MAX_OBJECTS,
+    )
+    comments = CommaSeparatedListField(
+        child=IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=settings.REACTIONS_SUMMARY_MAX_OBJECTS,
+    )
+
+    def validate(self, attrs):
+        if not attrs["recipes"] and not attrs["comments"]:
+            raise ValidationError(NO_OBJECTS_FOR_REACTIONS_SUMMARY)
+        return attrs
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .histogram import invalidate_reaction_histogram
+from .models import Reaction
+
+
+@receiver(post_delete, sender=Reaction)
+def drop_reaction_histogram(sender, instance, **kwargs):
+    """
+    Views only soft delete reactions, rows removed otherwise (admin, deleted
+    users) drop the cached histogram of their object
+    """
+
+    if not instance.is_deleted and instance.content_type_id:
+        invalidate_reaction_histogram(instance.content_type_id, instance.object_id)
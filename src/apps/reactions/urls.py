@@ -1,6 +1,10 @@
 from rest_framework.routers import DefaultRouter
 
-from src.apps.reactions.views import RecipeReactionViewSet, CommentReactionViewSet
+from src.apps.reactions.views import (
+    CommentReactionViewSet,
+    ReactionsSummaryViewSet,
+    RecipeReactionViewSet,
+)
 
 router = DefaultRouter()
 router.register(
@@ -13,5 +17,10 @@ router.register(
     CommentReactionViewSet,
     basename="comment-reactions",
 )
+router.register(
+    r"reactions/summary",
+    ReactionsSummaryViewSet,
+    basename="reactions-summary",
+)
 
 urlpatterns = router.urls
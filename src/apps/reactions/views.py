@@ -1,35 +1,36 @@
 from django.db import transaction
-from django.contrib.contenttypes.models import ContentType
 from django.shortcuts import get_object_or_404
-
 from rest_framework import status
 from rest_framework.mixins import (
-    ListModelMixin,
     CreateModelMixin,
     DestroyModelMixin,
+    ListModelMixin,
 )
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from src.apps.comments.models import Comment
+from src.apps.reactions.histogram import shift_reaction_histogram
+from src.apps.reactions.models import Reaction
+from src.apps.reactions.registry import reaction_content_type_id
+from src.apps.reactions.serializers import (
+    CommentReactionsListSerializer,
+    ReactionCreateSerializer,
+    ReactionsSummaryQuerySerializer,
+    RecipeReactionsListSerializer,
+)
+from src.apps.recipes.models import Recipe
 from src.base.code_text import (
+    ALREADY_RATED_THIS_COMMENT,
     REACTION_ALREADY_SET,
-    SUCCESSFUL_RATED_IT,
-    SUCCESSFUL_LIKED_THE_RECIPE,
     REACTION_CANCELLED,
-    ALREADY_RATED_THIS_COMMENT,
+    SUCCESSFUL_LIKED_THE_RECIPE,
     SUCCESSFUL_RATED_COMMENT,
+    SUCCESSFUL_RATED_IT,
 )
+from src.base.services import summarize_reactions_on_objects
 from src.base.throttling import ScopedOnePerThreeSecsThrottle
-from src.apps.reactions.models import Reaction
-from src.apps.reactions.serializers import (
-    RecipeReactionsListSerializer,
-    ReactionCreateSerializer,
-    CommentReactionsListSerializer,
-)
-
-from src.apps.comments.models import Comment
-from src.apps.recipes.models import Recipe
 
 
 class ReactionViewSet(
@@ -78,7 +79,7 @@ class ReactionViewSet(
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         instance = self.get_object()
-        content_type = ContentType.objects.get_for_model(instance)
+        content_type_id = reaction_content_type_id(instance)
         serializer = self.get_serializer_class()
         serializer = serializer(data=self.request.data)
         serializer.is_valid(raise_exception=True)
@@ -86,7 +87,7 @@ class ReactionViewSet(
             emoji=serializer.data["emoji"],
             author=self.request.user,
             object_id=instance.id,
-            content_type=content_type,
+            content_type_id=content_type_id,
         )
 
         if not created and not reaction.is_deleted:
@@ -97,10 +98,22 @@ class ReactionViewSet(
         if reaction.is_deleted:
             reaction.is_deleted = False
             reaction.save()
+        shift_reaction_histogram(content_type_id, instance.id, reaction.emoji, 1)
 
         return Response(SUCCESSFUL_RATED_IT, status=status.HTTP_201_CREATED)
 
 
+def cancel_reaction(reaction: Reaction) -> None:
+    """Soft delete the reaction, its histogram loses it once"""
+
+    if not reaction.is_deleted:
+        reaction.is_deleted = True
+        reaction.save()
+        shift_reaction_histogram(
+            reaction.content_type_id, reaction.object_id, reaction.emoji, -1
+        )
+
+
 class RecipeReactionViewSet(ReactionViewSet):
     """Subclass for creating and deleting reactions on recipes"""
 
@@ -119,11 +132,11 @@ class RecipeReactionViewSet(ReactionViewSet):
         reaction = get_object_or_404(
             Reaction,
             id=kwargs.get("pk"),
-            recipe_reactions__slug=kwargs.get("slug"),
+            content_type_id=reaction_content_type_id(Recipe),
+            object_id__in=Recipe.objects.filter(slug=kwargs.get("slug")).values("id"),
             author=request.user,
         )
-        reaction.is_deleted = True
-        reaction.save()
+        cancel_reaction(reaction)
         return Response(REACTION_CANCELLED, status=status.HTTP_204_NO_CONTENT)
 
 
@@ -144,9 +157,53 @@ class CommentReactionViewSet(ReactionViewSet):
         reaction = get_object_or_404(
             Reaction,
             id=kwargs.get("pk"),
-            comment_reactions__id=kwargs.get("id"),
+            content_type_id=reaction_content_type_id(Comment),
+            object_id=kwargs.get("id"),
             author=request.user,
         )
-        reaction.is_deleted = True
-        reaction.save()
+        cancel_reaction(reaction)
         return Response(REACTION_CANCELLED, status=status.HTTP_204_NO_CONTENT)
+
+
+class ReactionsSummaryViewSet(GenericViewSet):
+    """
+    Reactions on many recipes and comments at once, for a feed page or a
+    comment thread. Unknown slugs and ids are left out of the response.
+    """
+
+    serializer_class = ReactionsSummaryQuerySerializer
+    permission_classes = [AllowAny]
+    swagger_tags = ["Reactions"]
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        slugs = serializer.validated_data["recipes"]
+        comment_ids = serializer.validated_data["comments"]
+
+        recipe_slugs = (
+            dict(Recipe.objects.filter(slug__in=slugs).values_list("id", "slug"))
+            if slugs
+            else {}
+        )
+        comment_ids = (
+            list(
+                Comment.objects.filter(id__in=comment_ids).values_list("id", flat=True)
+            )
+            if comment_ids
+            else []
+        )
+
+        recipes = summarize_reactions_on_objects(
+            Recipe, list(recipe_slugs), request.user
+        )
+        comments = summarize_reactions_on_objects(Comment, comment_ids, request.user)
+        return Response(
+            {
+                "recipes": {
+                    recipe_slugs[recipe_id]: summary
+                    for recipe_id, summary in recipes.items()
+                },
+                "comments": comments,
+            }
+        )
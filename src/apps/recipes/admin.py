@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Recipe, Category
+from .models import Recipe, Category, RecipeStats
 
 
 @admin.register(Recipe)
@@ -17,3 +17,16 @@ class RecipeAdmin(admin.ModelAdmin):
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ["id", "name"]
     prepopulated_fields = {"slug": ["name"]}
+
+
+@admin.register(RecipeStats)
+class RecipeStatsAdmin(admin.ModelAdmin):
+    list_display = [
+        "recipe",
+        "comments_count",
+        "views_count",
+        "reactions_count",
+        "activity_count",
+        "updated_at",
+    ]
+    readonly_fields = ["updated_at"]
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from src.apps.recipes.stats import find_stats_drift, rebuild_recipe_stats
+
+
+class Command(BaseCommand):
+    help = "Compare denormalized recipe counters with the source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "recipe_ids",
+            nargs="*",
+            type=int,
+            help="Check only these recipes (default: all).",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rebuild the stats of recipes that have drifted.",
+        )
+
+    def handle(self, *args, **options):
+        drift = find_stats_drift(options["recipe_ids"] or None)
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Recipe stats are consistent."))
+            return
+
+        for recipe_id, field, stored, actual in drift:
+            self.stdout.write(
+                f"recipe {recipe_id}: {field} is {stored}, expected {actual}"
+            )
+
+        drifted_ids = {recipe_id for recipe_id, *_ in drift}
+        if options["fix"]:
+            rebuild_recipe_stats(drifted_ids)
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt stats of {len(drifted_ids)} recipes.")
+            )
+            return
+
+        raise CommandError(f"Stats of {len(drifted_ids)} recipes have drifted.")
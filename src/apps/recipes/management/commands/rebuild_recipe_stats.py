@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.recipes.stats import (
+    rebuild_recipe_stats,
+    refresh_activity_window,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild denormalized recipe counters from comments, views and "
+        "reactions. Use refresh_recipe_activity to age out the activity window."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "recipe_ids",
+            nargs="*",
+            type=int,
+            help="Rebuild only these recipes (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        if options["recipe_ids"]:
+            rebuilt = rebuild_recipe_stats(options["recipe_ids"])
+        else:
+            rebuilt = refresh_activity_window(full=True)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats of {rebuilt} recipes."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.recipes.stats import refresh_activity_window
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute activity counters of recipes whose comments, views or "
+        "reactions left the activity window since the previous run. "
+        "Meant to be run from cron, e.g. hourly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every recipe instead of the touched ones.",
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_activity_window(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed activity of {refreshed} recipes.")
+        )
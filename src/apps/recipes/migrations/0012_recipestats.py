@@ -0,0 +1,99 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:19
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def fill_recipe_stats(apps, schema_editor):
+    Recipe = apps.get_model("recipes", "Recipe")
+    RecipeStats = apps.get_model("recipes", "RecipeStats")
+    Comment = apps.get_model("comments", "Comment")
+    ViewRecipes = apps.get_model("view", "ViewRecipes")
+    Reaction = apps.get_model("reactions", "Reaction")
+
+    window_start = timezone.now() - timedelta(days=settings.ACTIVITY_INTERVAL)
+
+    def count_by_recipe(queryset, recipe_field, date_field):
+        rows = (
+            queryset.values(recipe_field)
+            .order_by()
+            .annotate(
+                total=Count("id"),
+                latest=Count("id", filter=Q(**{f"{date_field}__gte": window_start})),
+            )
+        )
+        return {row[recipe_field]: (row["total"], row["latest"]) for row in rows}
+
+    sources = {
+        "comments": count_by_recipe(
+            Comment.objects.filter(recipe__isnull=False), "recipe_id", "pub_date"
+        ),
+        "views": count_by_recipe(ViewRecipes.objects.all(), "recipe_id", "created_at"),
+        "reactions": count_by_recipe(
+            Reaction.objects.filter(
+                content_type__app_label="recipes", content_type__model="recipe"
+            ),
+            "object_id",
+            "pub_date",
+        ),
+    }
+
+    stats = []
+    for recipe_id in Recipe.objects.values_list("id", flat=True).iterator():
+        values = {"activity_count": 0}
+        for counter, counts in sources.items():
+            total, latest = counts.get(recipe_id, (0, 0))
+            values[f"{counter}_count"] = total
+            values[f"latest_{counter}_count"] = latest
+            values["activity_count"] += latest
+        stats.append(RecipeStats(recipe_id=recipe_id, **values))
+    RecipeStats.objects.bulk_create(stats, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0011_alter_recipe_cooking_time"),
+        ("comments", "0003_comment_updated_date"),
+        ("reactions", "0002_alter_reaction_content_type"),
+        ("view", "0004_remove_viewrecipes_unique_view"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeStats",
+            fields=[
+                (
+                    "recipe",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="recipes.recipe",
+                    ),
+                ),
+                ("comments_count", models.IntegerField(default=0)),
+                ("views_count", models.IntegerField(default=0)),
+                ("reactions_count", models.IntegerField(default=0)),
+                ("latest_comments_count", models.IntegerField(default=0)),
+                ("latest_views_count", models.IntegerField(default=0)),
+                ("latest_reactions_count", models.IntegerField(default=0)),
+                (
+                    "activity_count",
+                    models.IntegerField(db_index=True, default=0),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Recipe stats",
+                "verbose_name_plural": "Recipe stats",
+            },
+        ),
+        migrations.RunPython(fill_recipe_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0012_recipestats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeStatsRefresh",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("window_start", models.DateTimeField(db_index=True)),
+                ("recipes_count", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Recipe stats refresh",
+                "verbose_name_plural": "Recipe stats refreshes",
+                "ordering": ["-window_start"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="recipestats",
+            name="activity_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="recipestats",
+            index=models.Index(
+                fields=["-activity_count", "-recipe"],
+                name="recipe_stats_activity_idx",
+            ),
+        ),
+    ]
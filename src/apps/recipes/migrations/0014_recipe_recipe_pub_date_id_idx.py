@@ -0,0 +1,22 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "recipes",
+            "0013_recipestatsrefresh_alter_recipestats_activity_count_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(
+                fields=["-pub_date", "-id"], name="recipe_pub_date_id_idx"
+            ),
+        ),
+    ]
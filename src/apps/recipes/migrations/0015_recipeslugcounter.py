@@ -0,0 +1,58 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:58
+
+import re
+
+from django.db import migrations, models
+
+SUFFIXED_SLUG = re.compile(r"^(?P<base>.+)_(?P<suffix>\d+)$")
+
+
+def fill_slug_counters(apps, schema_editor):
+    """Start every counter at the highest suffix of its base in use"""
+
+    Recipe = apps.get_model("recipes", "Recipe")
+    RecipeSlugCounter = apps.get_model("recipes", "RecipeSlugCounter")
+
+    last = {}
+    for slug in Recipe.objects.values_list("slug", flat=True).iterator():
+        match = SUFFIXED_SLUG.match(slug)
+        base, suffix = (
+            (match["base"], int(match["suffix"])) if match else (slug, 1)
+        )
+        base = base[:255]
+        last[base] = max(last.get(base, 0), suffix)
+    RecipeSlugCounter.objects.bulk_create(
+        [RecipeSlugCounter(base=base, last=suffix) for base, suffix in last.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0014_recipe_recipe_pub_date_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeSlugCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("base", models.CharField(max_length=255, unique=True)),
+                ("last", models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                "verbose_name": "Recipe slug counter",
+                "verbose_name_plural": "Recipe slug counters",
+            },
+        ),
+        migrations.RunPython(fill_slug_counters, migrations.RunPython.noop),
+    ]
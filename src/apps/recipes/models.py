@@ -70,6 +70,9 @@ class Recipe(models.Model):
 
     class Meta:
         index_together = ["title", "slug"]
+        indexes = [
+            models.Index(fields=["-pub_date", "-id"], name="recipe_pub_date_id_idx"),
+        ]
         verbose_name = "Recipe"
         verbose_name_plural = "Recipes"
 
@@ -80,6 +83,91 @@ class Recipe(models.Model):
         return f"{self.slug}"
 
 
+class RecipeStats(models.Model):
+    """
+    Denormalized activity counters of a recipe
+
+    Attrs:
+    • recipe (OneToOneField): recipe the counters belong to.
+    • comments_count (IntegerField): total number of comments.
+    • views_count (IntegerField): total number of views.
+    • reactions_count (IntegerField): total number of reactions.
+    • latest_comments_count (IntegerField): comments within ACTIVITY_INTERVAL days.
+    • latest_views_count (IntegerField): views within ACTIVITY_INTERVAL days.
+    • latest_reactions_count (IntegerField): reactions within ACTIVITY_INTERVAL days.
+    • activity_count (IntegerField): sum of the latest counters.
+    • updated_at (DateTimeField): last time the counters were changed.
+    """
+
+    recipe = models.OneToOneField(
+        Recipe, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    comments_count = models.IntegerField(default=0)
+    views_count = models.IntegerField(default=0)
+    reactions_count = models.IntegerField(default=0)
+    latest_comments_count = models.IntegerField(default=0)
+    latest_views_count = models.IntegerField(default=0)
+    latest_reactions_count = models.IntegerField(default=0)
+    activity_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Recipe stats"
+        verbose_name_plural = "Recipe stats"
+        indexes = [
+            models.Index(
+                fields=["-activity_count", "-recipe"],
+                name="recipe_stats_activity_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Stats of {self.recipe_id}"
+
+
+class RecipeStatsRefresh(models.Model):
+    """
+    Log of activity window refreshes
+
+    Attrs:
+    • window_start (DateTimeField): start of the activity window at refresh time.
+    • recipes_count (IntegerField): number of recipes recomputed.
+    • created_at (DateTimeField): refresh date.
+    """
+
+    window_start = models.DateTimeField(db_index=True)
+    recipes_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Recipe stats refresh"
+        verbose_name_plural = "Recipe stats refreshes"
+        ordering = ["-window_start"]
+
+    def __str__(self):
+        return f"Activity window from {self.window_start}"
+
+
+class RecipeSlugCounter(models.Model):
+    """
+    Last suffix handed out for a base slug
+
+    Attrs:
+    • base (CharField(255)): slug of the title without suffix.
+    • last (PositiveIntegerField): last suffix taken, 1 stands for the bare base.
+    """
+
+    base = models.CharField(max_length=255, unique=True)
+    last = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        verbose_name = "Recipe slug counter"
+        verbose_name_plural = "Recipe slug counters"
+
+    def __str__(self):
+        return f"{self.base}_{self.last}"
+
+
 class Category(models.Model):
     """
     Category model
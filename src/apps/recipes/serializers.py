@@ -2,6 +2,7 @@ from datetime import timedelta
 
 from rest_framework.serializers import IntegerField
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
@@ -12,6 +13,7 @@ from taggit.serializers import TagListSerializerField, TagList
 from django.conf import settings
 from src.apps.ingredients.serializers import IngredientInRecipeSerializer
 from src.apps.recipes.models import Recipe, Category
+from src.apps.recipes.slugs import create_recipe_slug, save_with_unique_slug
 from src.apps.users.serializers import AuthorInRecipeSerializer
 from src.base.code_text import (
     RECIPE_CAN_BE_EDIT_WITHIN_FIRST_DAY,
@@ -19,7 +21,6 @@ from src.base.code_text import (
 from src.base.services import (
     shorten_text,
     create_ingredients_in_recipe,
-    create_recipe_slug,
 )
 
 
@@ -115,10 +116,21 @@ class BaseRecipeSerializer(ModelSerializer):
             data["short_text"] = shorten_text(data["full_text"], settings.SHORT_RECIPE_SYMBOLS)
 
         if "title" in data:
-            data = create_recipe_slug(Recipe, data)
+            data = create_recipe_slug(data)
 
         return data
 
+    def to_representation(self, instance):
+        """
+        Names of ingredients and units are fetched for all ingredients at
+        once, the views drop prefetched objects after writes
+        """
+
+        prefetch_related_objects(
+            [instance], "ingredients__ingredient", "ingredients__unit"
+        )
+        return super().to_representation(instance)
+
 
 class BaseRecipeListSerializer(ModelSerializer):
     """
@@ -183,17 +195,16 @@ class RecipeCreateSerializer(BaseRecipeSerializer):
         validated_data.pop("ingredients", [])
         category_data = validated_data.pop("category", [])
 
-        recipe = Recipe.objects.create(**validated_data)
+        recipe = save_with_unique_slug(
+            lambda: Recipe.objects.create(**validated_data), validated_data
+        )
 
         if tags_data:
             recipe.tag.set(tags_data)
         if category_data:
             recipe.category.set(category_data)
 
-        ingredients_instance = create_ingredients_in_recipe(recipe, ingredients_data)
-
-        if ingredients_instance:
-            recipe.ingredients.set(ingredients_instance)
+        create_ingredients_in_recipe(recipe, ingredients_data)
         return recipe
 
 
@@ -230,11 +241,11 @@ class RecipeUpdateSerializer(BaseRecipeSerializer):
         if category_data:
             instance.category.set(category_data)
         if ingredients_data:
-            instance.ingredients.clear()
-            ingredients_instance = create_ingredients_in_recipe(
-                instance, ingredients_data
-            )
-            if ingredients_instance:
-                instance.ingredients.set(ingredients_instance)
+            create_ingredients_in_recipe(instance, ingredients_data, replace=True)
 
-        return super().update(instance, validated_data)
+        return save_with_unique_slug(
+            lambda: super(RecipeUpdateSerializer, self).update(
+                instance, validated_data
+            ),
+            validated_data,
+        )
@@ -0,0 +1,98 @@
+"""
+Recipe slug allocation.
+
+Recipes with the same title get the slugs base, base_2, base_3 and so on.
+The last suffix of every base is kept in RecipeSlugCounter, so allocating
+a slug is one UPDATE and one SELECT of the counter row however many
+recipes share the title. The row stays locked by the UPDATE until the
+transaction ends, so concurrent requests get different suffixes.
+
+Bases routed ahead of recipe/<slug>/ (search, facets, match) start at
+base_2, so every recipe stays reachable by its slug.
+
+Slugs set without the counter (fixtures, admin, titles ending in `_<n>`)
+can still collide; save_with_unique_slug then allocates the next suffix
+and saves again.
+"""
+
+from typing import Callable, TypeVar
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.text import slugify
+from unidecode import unidecode
+
+from .models import Recipe, RecipeSlugCounter
+
+T = TypeVar("T")
+
+SLUG_MAX_LENGTH: int = Recipe._meta.get_field("slug").max_length
+# room for the `_<n>` suffix of up to a million recipes with the same base
+SUFFIX_MAX_LENGTH = len("_1000000")
+BASE_MAX_LENGTH = SLUG_MAX_LENGTH - SUFFIX_MAX_LENGTH
+EMPTY_TITLE_BASE = "recipe"
+# endpoints under recipe/, see src.apps.search.urls
+RESERVED_BASES = frozenset(("search", "facets", "match"))
+
+
+def slug_base(title: str) -> str:
+    """Slug of the title cut to leave room for a suffix within Recipe.slug"""
+
+    base = slugify(unidecode(title))[:BASE_MAX_LENGTH].rstrip("-_")
+    return base or EMPTY_TITLE_BASE
+
+
+def _take_next(base: str) -> bool:
+    return bool(
+        RecipeSlugCounter.objects.filter(base=base).update(last=F("last") + 1)
+    )
+
+
+def allocate_recipe_slug(title: str) -> str:
+    """Next free slug of the title"""
+
+    base = slug_base(title)
+    with transaction.atomic():
+        if not _take_next(base):
+            try:
+                with transaction.atomic():
+                    RecipeSlugCounter.objects.create(base=base, last=1)
+                if base not in RESERVED_BASES:
+                    return base
+            except IntegrityError:
+                # the counter was created by a concurrent request
+                pass
+            _take_next(base)
+        last = RecipeSlugCounter.objects.values_list("last", flat=True).get(
+            base=base
+        )
+    return f"{base}_{last}"
+
+
+def create_recipe_slug(data: dict) -> dict:
+    """Put the next free slug of data["title"] into data"""
+
+    data["slug"] = allocate_recipe_slug(data["title"])
+    return data
+
+
+def save_with_unique_slug(save: Callable[[], T], data: dict) -> T:
+    """
+    Call save, allocating a new slug into data each time it fails on a
+    slug taken behind the counter's back
+    """
+
+    for attempt in range(settings.RECIPE_SLUG_SAVE_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            last_attempt = attempt + 1 == settings.RECIPE_SLUG_SAVE_ATTEMPTS
+            if (
+                last_attempt
+                or "slug" not in data
+                or not Recipe.objects.filter(slug=data["slug"]).exists()
+            ):
+                raise
+            create_recipe_slug(data)
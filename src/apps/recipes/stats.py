@@ -0,0 +1,233 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from src.apps.comments.models import Comment
+from src.apps.reactions.models import Reaction
+from src.apps.reactions.registry import reaction_content_type_id
+from src.apps.view.models import RecipeViewRollup, ViewRecipes
+from .models import Recipe, RecipeStats, RecipeStatsRefresh
+
+COUNTERS: Tuple[str, ...] = ("comments", "views", "reactions")
+STATS_FIELDS: Tuple[str, ...] = (
+    "comments_count",
+    "views_count",
+    "reactions_count",
+    "latest_comments_count",
+    "latest_views_count",
+    "latest_reactions_count",
+    "activity_count",
+)
+REBUILD_CHUNK_SIZE: int = 1000
+
+
+def activity_window_start() -> datetime:
+    """Start of the rolling window used for the latest_* counters"""
+
+    return timezone.now() - timedelta(days=settings.ACTIVITY_INTERVAL)
+
+
+def _sources() -> List[Tuple[str, QuerySet, str, str, str]]:
+    """
+    Source tables of the counters:
+    (counter, queryset, recipe field, date field, amount field).
+    Views are the raw tail plus hourly rollups of compacted views.
+    """
+
+    return [
+        ("comments", Comment.objects.all(), "recipe_id", "pub_date", "id"),
+        ("views", ViewRecipes.objects.all(), "recipe_id", "created_at", "id"),
+        (
+            "views",
+            RecipeViewRollup.objects.all(),
+            "recipe_id",
+            "period_start",
+            "views_count",
+        ),
+        (
+            "reactions",
+            Reaction.objects.filter(content_type_id=reaction_content_type_id(Recipe)),
+            "object_id",
+            "pub_date",
+            "id",
+        ),
+    ]
+
+
+def _amount(field: str, **filters):
+    """Rows are counted, rollups add up their views_count"""
+
+    if field == "id":
+        return Count("id", filter=Q(**filters) if filters else None)
+    return Coalesce(Sum(field, filter=Q(**filters) if filters else None), 0)
+
+
+def compute_recipe_stats(recipe_ids: Iterable[int]) -> Dict[int, dict]:
+    """
+    Count comments, views and reactions of the given recipes from the source
+    tables. Every table is grouped on its own, so there is no join fan-out.
+    """
+
+    recipe_ids = list(recipe_ids)
+    window_start = activity_window_start()
+    counts = {counter: {} for counter in COUNTERS}
+    for counter, queryset, recipe_field, date_field, amount in _sources():
+        rows = (
+            queryset.filter(**{f"{recipe_field}__in": recipe_ids})
+            .values(recipe_field)
+            .order_by()
+            .annotate(
+                total=_amount(amount),
+                latest=_amount(amount, **{f"{date_field}__gte": window_start}),
+            )
+        )
+        for row in rows:
+            total, latest = counts[counter].get(row[recipe_field], (0, 0))
+            counts[counter][row[recipe_field]] = (
+                total + row["total"],
+                latest + row["latest"],
+            )
+
+    stats = {}
+    for recipe_id in recipe_ids:
+        values = {"activity_count": 0}
+        for counter in COUNTERS:
+            total, latest = counts[counter].get(recipe_id, (0, 0))
+            values[f"{counter}_count"] = total
+            values[f"latest_{counter}_count"] = latest
+            values["activity_count"] += latest
+        stats[recipe_id] = values
+    return stats
+
+
+def _recipe_id_chunks(recipe_ids: Optional[Iterable[int]]) -> Iterable[List[int]]:
+    if recipe_ids is not None:
+        recipe_ids = sorted(set(recipe_ids))
+        for start in range(0, len(recipe_ids), REBUILD_CHUNK_SIZE):
+            yield recipe_ids[start : start + REBUILD_CHUNK_SIZE]
+        return
+
+    last_id = 0
+    while True:
+        chunk = list(
+            Recipe.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:REBUILD_CHUNK_SIZE]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def rebuild_recipe_stats(recipe_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute counters from the source tables and upsert them.
+    Rebuilds every recipe when recipe_ids is None. Returns number of rows.
+    """
+
+    rebuilt = 0
+    for chunk in _recipe_id_chunks(recipe_ids):
+        stats = compute_recipe_stats(chunk)
+        existing = set(
+            Recipe.objects.filter(id__in=chunk).values_list("id", flat=True)
+        )
+        RecipeStats.objects.bulk_create(
+            [
+                RecipeStats(recipe_id=recipe_id, **values)
+                for recipe_id, values in stats.items()
+                if recipe_id in existing
+            ],
+            update_conflicts=True,
+            unique_fields=["recipe"],
+            update_fields=list(STATS_FIELDS) + ["updated_at"],
+        )
+        rebuilt += len(existing)
+    return rebuilt
+
+
+def refresh_activity_window(full: bool = False) -> int:
+    """
+    Age out rows that left the activity window since the previous refresh.
+    Only recipes having comments, views or reactions dated between the
+    previous and the current window start are recomputed; a full rebuild runs
+    when there is no previous refresh. Returns number of recomputed recipes.
+    """
+
+    window_start = activity_window_start()
+    previous = RecipeStatsRefresh.objects.first()
+
+    with transaction.atomic():
+        if full or previous is None:
+            refreshed = rebuild_recipe_stats()
+        else:
+            touched = set()
+            for _, queryset, recipe_field, date_field, _ in _sources():
+                touched.update(
+                    queryset.filter(
+                        **{
+                            f"{date_field}__gte": previous.window_start,
+                            f"{date_field}__lt": window_start,
+                        }
+                    )
+                    .values_list(recipe_field, flat=True)
+                    .distinct()
+                )
+            touched.discard(None)
+            refreshed = rebuild_recipe_stats(touched)
+
+        RecipeStatsRefresh.objects.create(
+            window_start=window_start, recipes_count=refreshed
+        )
+    return refreshed
+
+
+def find_stats_drift(
+    recipe_ids: Optional[Iterable[int]] = None,
+) -> List[Tuple[int, str, Optional[int], int]]:
+    """
+    Compare stored counters with the source tables.
+    Returns a list of (recipe_id, field, stored, actual), stored is None when
+    the recipe has no stats row.
+    """
+
+    drift = []
+    for chunk in _recipe_id_chunks(recipe_ids):
+        actual = compute_recipe_stats(chunk)
+        stored = {
+            row["recipe_id"]: row
+            for row in RecipeStats.objects.filter(recipe_id__in=chunk).values(
+                "recipe_id", *STATS_FIELDS
+            )
+        }
+        for recipe_id, values in actual.items():
+            row = stored.get(recipe_id)
+            for field in STATS_FIELDS:
+                stored_value = row[field] if row else None
+                if stored_value != values[field]:
+                    drift.append((recipe_id, field, stored_value, values[field]))
+    return drift
+
+
+def bump_recipe_stats(
+    recipe_id: int, counter: str, delta: int, is_latest: bool
+) -> None:
+    """
+    Atomically shift a counter of a recipe by delta. Recipes that have no
+    stats row yet get it rebuilt from the source tables instead.
+    """
+
+    total_field = f"{counter}_count"
+    fields = {total_field: F(total_field) + delta, "updated_at": timezone.now()}
+    if is_latest:
+        latest_field = f"latest_{counter}_count"
+        fields[latest_field] = F(latest_field) + delta
+        fields["activity_count"] = F("activity_count") + delta
+
+    if not RecipeStats.objects.filter(recipe_id=recipe_id).update(**fields):
+        rebuild_recipe_stats([recipe_id])
@@ -1,8 +1,7 @@
-from django.db.models import Count
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (
     RetrieveModelMixin,
     CreateModelMixin,
@@ -23,10 +22,9 @@ from src.base.code_text import (
     LIST_OF_FAVORITES_IS_EMPTY,
 )
 from src.apps.favorite.models import Favorite
-from src.apps.view.models import ViewRecipes
-from src.base.paginators import FeedPagination
+from src.apps.view.buffer import record_recipe_view
+from src.base.paginators import FavoritePagination
 from src.base.permissions import IsOwnerOrStaffOrReadOnly
-from src.base.services import increment_view_count
 from .models import Recipe
 from .serializers import (
     RecipeRetrieveSerializer,
@@ -43,8 +41,6 @@ class RecipeViewSet(
     UpdateModelMixin,
     DestroyModelMixin,
 ):
-    filter_backends = (SearchFilter,)
-    search_fields = ("title",)
     lookup_field = "slug"
     http_method_names = ["get", "post", "patch", "delete"]
 
@@ -53,11 +49,12 @@ class RecipeViewSet(
             queryset = (
                 Recipe.objects.filter(favorite__author=self.request.user)
                 .order_by("-pub_date")
-                .prefetch_related("tag", "reactions", "comments", "views")
+                .select_related("author")
+                .prefetch_related("tag")
                 .annotate(
-                    reactions_count=Count("reactions", distinct=True),
-                    views_count=Count("views", distinct=True),
-                    comments_count=Count("comments", distinct=True),
+                    reactions_count=Coalesce("stats__reactions_count", 0),
+                    views_count=Coalesce("stats__views_count", 0),
+                    comments_count=Coalesce("stats__comments_count", 0),
                 )
             )
             return queryset
@@ -65,10 +62,10 @@ class RecipeViewSet(
         queryset = (
             Recipe.objects.filter(slug=slug)
             .select_related("author")
-            .prefetch_related("ingredients", "category", "tag", "reactions", "views")
+            .prefetch_related("ingredients", "category", "tag")
             .annotate(
-                reactions_count=Count("reactions", distinct=True),
-                views_count=Count("views", distinct=True),
+                reactions_count=Coalesce("stats__reactions_count", 0),
+                views_count=Coalesce("stats__views_count", 0),
             )
         )
         return queryset
@@ -92,7 +89,7 @@ class RecipeViewSet(
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        increment_view_count(ViewRecipes, instance, request)
+        record_recipe_view(instance, request)
 
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -107,13 +104,13 @@ class RecipeViewSet(
         methods=[
             "get",
         ],
-        pagination_class=FeedPagination,
+        pagination_class=FavoritePagination,
     )
     def favorites(self, request):
         """Getting a list of favorite user's recipes with pagination."""
 
         queryset = self.get_queryset()
-        if not queryset:
+        if not queryset.exists():
             return Response(LIST_OF_FAVORITES_IS_EMPTY)
 
         serializer = BaseRecipeListSerializer
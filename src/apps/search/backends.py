@@ -0,0 +1,116 @@
+"""
+Recipe search backends.
+
+A backend stores one document per recipe, a dict of FIELDS to normalized
+text (see text.normalize), and returns recipe ids matching every query
+term, best ranked first. RECIPE_SEARCH_BACKEND selects the backend.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.utils.module_loading import import_string
+
+FIELDS = ("title", "short_text", "tags", "categories", "ingredients")
+BATCH_SIZE = 500
+
+
+class SearchBackend:
+    """Interface of recipe search backends"""
+
+    def setup(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        """Create the storage of the index, called after migrate"""
+
+    def index(self, documents: Dict[int, Dict[str, str]]) -> None:
+        """Add or replace the documents of recipes"""
+
+        raise NotImplementedError
+
+    def remove(self, recipe_ids: Iterable[int]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def search(self, terms: List[str], limit: int) -> List[int]:
+        """Ids of recipes having words beginning with every term"""
+
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """
+    FTS5 virtual table keyed by recipe id and ranked with bm25, title
+    matches weigh the most, then ingredients, tags and categories
+    """
+
+    table = "search_recipe_fts"
+    weights = {
+        "title": 10.0,
+        "short_text": 1.0,
+        "tags": 3.0,
+        "categories": 3.0,
+        "ingredients": 4.0,
+    }
+
+    def setup(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        database = connections[using]
+        if database.vendor != "sqlite":
+            raise ImproperlyConfigured(
+                "SQLiteFTS5Backend needs SQLite, set RECIPE_SEARCH_BACKEND to a "
+                f"backend for {database.vendor}."
+            )
+        with database.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                f"{', '.join(FIELDS)}, tokenize='unicode61')"
+            )
+
+    def _delete(self, cursor, recipe_ids: List[int]) -> None:
+        for start in range(0, len(recipe_ids), BATCH_SIZE):
+            batch = recipe_ids[start : start + BATCH_SIZE]
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN"
+                f" ({', '.join(['%s'] * len(batch))})",
+                batch,
+            )
+
+    def index(self, documents: Dict[int, Dict[str, str]]) -> None:
+        with connection.cursor() as cursor:
+            self._delete(cursor, list(documents))
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, {', '.join(FIELDS)})"
+                f" VALUES (%s, {', '.join(['%s'] * len(FIELDS))})",
+                [
+                    (recipe_id, *(document[field] for field in FIELDS))
+                    for recipe_id, document in documents.items()
+                ],
+            )
+
+    def remove(self, recipe_ids: Iterable[int]) -> None:
+        with connection.cursor() as cursor:
+            self._delete(cursor, list(recipe_ids))
+
+    def clear(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def search(self, terms: List[str], limit: int) -> List[int]:
+        # terms are [a-z0-9]+, quoting keeps FTS5 operators out of the query
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(self.weights[field]) for field in FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s"
+                f" ORDER BY bm25({self.table}, {weights}), rowid DESC LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> SearchBackend:
+    return import_string(settings.RECIPE_SEARCH_BACKEND)()
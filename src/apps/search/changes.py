@@ -0,0 +1,224 @@
+"""
+Shared log of written recipes for the in-memory recipe indexes.
+
+Every process keeps its own recipe indexes, the facets and the ingredient
+matching. Ids of written and deleted recipes are logged under a sequence
+number shared by the processes. Before answering, an index rereads the
+logged recipes it has not seen yet, and reloads everything when the log has
+a gap or grew longer than RECIPE_INDEXES_MAX_PENDING_CHANGES.
+
+On an atomic RECIPE_INDEXES_CACHE_ALIAS (see is_atomic_cache) the log lives
+in the cache and is numbered with incr. Elsewhere concurrent writers could
+draw the same number, so the log is kept in the RecipeChange table and
+numbered by its primary key. Rows may commit out of order, so numbers
+missing below the last one read are read again until they show up or
+RECIPE_INDEXES_CHANGE_GRACE seconds pass. Both logs keep a change for
+RECIPE_INDEXES_CHANGE_TIMEOUT seconds.
+"""
+
+import threading
+import time
+import weakref
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from src.base.cache import is_atomic_cache
+from .models import RecipeChange
+
+SEQUENCE_KEY = "search:changes:sequence"
+
+
+def _change_key(sequence: int) -> str:
+    return f"search:changes:{sequence}"
+
+
+def _shared_cache():
+    alias = settings.RECIPE_INDEXES_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def _logs_in_cache() -> bool:
+    return is_atomic_cache(settings.RECIPE_INDEXES_CACHE_ALIAS)
+
+
+def _shared_sequence() -> Optional[int]:
+    cache = _shared_cache()
+    if cache is None:
+        return None
+    if not _logs_in_cache():
+        return RecipeChange.objects.aggregate(last=Max("id"))["last"] or 0
+    cache.add(SEQUENCE_KEY, 0, None)
+    return cache.get(SEQUENCE_KEY)
+
+
+class RecipeIndex:
+    """
+    Base of the in-memory recipe indexes. Subclasses read every recipe in
+    _build, reread the given ones in _patch and drop everything in _reset.
+    """
+
+    _instances = weakref.WeakSet()
+
+    def __init__(self):
+        self._loaded = False
+        self._sequence: Optional[int] = None
+        # log rows numbered below _sequence not read yet, by first miss time
+        self._missing: Dict[int, float] = {}
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        RecipeIndex._instances.add(self)
+
+    def _build(self) -> None:
+        raise NotImplementedError
+
+    def _patch(self, recipe_ids: Set[int]) -> None:
+        """
+        Reread the recipes, deleted ones are dropped. Changed structures are
+        replaced, not mutated, so readers of the previous ones are not
+        disturbed.
+        """
+
+        raise NotImplementedError
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+            self._loaded = False
+            self._sequence = None
+            self._missing = {}
+
+    def load(self) -> None:
+        """Read every recipe"""
+
+        # taken first, changes logged while loading are applied once more
+        sequence = _shared_sequence()
+        checked_at = time.monotonic()
+        self._build()
+        with self._lock:
+            self._loaded = True
+            self._sequence = sequence
+            self._missing = {}
+            self._checked_at = checked_at
+
+    def ensure_fresh(self) -> None:
+        if not self._loaded:
+            self.load()
+            return
+        if _shared_cache() is None:
+            return
+        if _logs_in_cache():
+            self._apply_cached_changes()
+        else:
+            self._apply_logged_rows()
+
+    def _apply_cached_changes(self) -> None:
+        sequence = _shared_sequence()
+        if sequence == self._sequence:
+            return
+        if (
+            self._sequence is None
+            or sequence < self._sequence
+            or sequence - self._sequence
+            > settings.RECIPE_INDEXES_MAX_PENDING_CHANGES
+        ):
+            self.load()
+            return
+
+        keys = [
+            _change_key(seq) for seq in range(self._sequence + 1, sequence + 1)
+        ]
+        changes = _shared_cache().get_many(keys)
+        if len(changes) < len(keys):
+            # part of the log expired
+            self.load()
+            return
+        self._patch(
+            {recipe_id for ids in changes.values() for recipe_id in ids}
+        )
+        with self._lock:
+            self._sequence = max(self._sequence, sequence)
+
+    def _apply_logged_rows(self) -> None:
+        now = time.monotonic()
+        limit = settings.RECIPE_INDEXES_MAX_PENDING_CHANGES
+        if (
+            self._sequence is None
+            or now - self._checked_at > settings.RECIPE_INDEXES_CHANGE_TIMEOUT
+        ):
+            # rows this index has not read may have been pruned
+            self.load()
+            return
+
+        missing = {
+            number: first_missed
+            for number, first_missed in self._missing.items()
+            if now - first_missed <= settings.RECIPE_INDEXES_CHANGE_GRACE
+        }
+        rows = list(
+            RecipeChange.objects.filter(
+                Q(id__gt=self._sequence) | Q(id__in=list(missing))
+            )
+            .order_by("id")
+            .values_list("id", "recipe_id")[: limit + 1]
+        )
+        sequence = self._sequence
+        read = {number for number, _ in rows}
+        last = max(read, default=sequence)
+        if len(rows) > limit or last - sequence > limit:
+            self.load()
+            return
+
+        for number in read:
+            missing.pop(number, None)
+        for number in range(sequence + 1, last):
+            if number not in read:
+                missing[number] = now
+        if rows:
+            self._patch({recipe_id for _, recipe_id in rows})
+        with self._lock:
+            self._sequence = max(self._sequence, last)
+            self._missing = missing
+            self._checked_at = now
+
+
+def recipes_changed(recipe_ids: Iterable[int]) -> None:
+    """Log written or deleted recipes for the indexes of every process"""
+
+    recipe_ids = list(recipe_ids)
+    cache = _shared_cache()
+    if cache is None:
+        for index in list(RecipeIndex._instances):
+            if index._loaded:
+                index._patch(set(recipe_ids))
+        return
+
+    if not _logs_in_cache():
+        RecipeChange.objects.bulk_create(
+            [RecipeChange(recipe_id=recipe_id) for recipe_id in recipe_ids]
+        )
+        RecipeChange.objects.filter(
+            created_at__lt=timezone.now()
+            - timedelta(seconds=settings.RECIPE_INDEXES_CHANGE_TIMEOUT)
+        ).delete()
+        return
+
+    cache.add(SEQUENCE_KEY, 0, None)
+    try:
+        sequence = cache.incr(SEQUENCE_KEY)
+    except ValueError:
+        # evicted between add and incr, every process reloads
+        cache.set(SEQUENCE_KEY, 0, None)
+        return
+    cache.set(
+        _change_key(sequence),
+        recipe_ids,
+        settings.RECIPE_INDEXES_CHANGE_TIMEOUT,
+    )
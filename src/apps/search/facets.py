@@ -0,0 +1,245 @@
+"""
+In-memory facet index of recipes.
+
+Every process keeps a posting set of recipe ids per facet value: category,
+tag, cooking time bucket and ingredient. A filter is the intersection of
+the union of the selected values of every facet; the count of a value is
+the size of its posting intersected with the filters of the other facets,
+so every value of every facet is counted in one pass over the postings
+and selecting a value does not zero the other values of its facet.
+
+The index is kept fresh through the shared log of written recipes, see
+changes.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from taggit.models import Tag, TaggedItem
+
+from src.apps.ingredients.models import Ingredient, IngredientInRecipe
+from src.apps.recipes.models import Category, Recipe
+from .changes import RecipeIndex
+
+FACETS = ("category", "tag", "cooking_time", "ingredient")
+
+
+def cooking_time_bucket(minutes: int) -> str:
+    """Bucket label of the cooking time, e.g. "30-60" or "120+" """
+
+    low = 0
+    for high in settings.RECIPE_COOKING_TIME_BUCKETS:
+        if minutes < high:
+            return f"{low}-{high}"
+        low = high
+    return f"{low}+"
+
+
+def cooking_time_buckets() -> List[str]:
+    edges = (0,) + tuple(settings.RECIPE_COOKING_TIME_BUCKETS)
+    return [f"{low}-{high}" for low, high in zip(edges, edges[1:])] + [
+        f"{edges[-1]}+"
+    ]
+
+
+def _facet_rows(recipe_ids: Optional[List[int]]) -> Iterator[Tuple[str, int, Any]]:
+    """(facet, recipe id, value) of the recipes, of all when recipe_ids is None"""
+
+    def of_recipes(queryset, field):
+        if recipe_ids is not None:
+            queryset = queryset.filter(**{f"{field}__in": recipe_ids})
+        return queryset.order_by()
+
+    recipes = of_recipes(Recipe.objects.all(), "id").values_list("id", "cooking_time")
+    for recipe_id, minutes in recipes.iterator():
+        yield "cooking_time", recipe_id, cooking_time_bucket(minutes)
+
+    sources = {
+        "category": of_recipes(Recipe.category.through.objects.all(), "recipe_id")
+        .values_list("recipe_id", "category_id"),
+        "tag": of_recipes(
+            TaggedItem.objects.filter(
+                content_type=ContentType.objects.get_for_model(Recipe)
+            ),
+            "object_id",
+        ).values_list("object_id", "tag_id"),
+        "ingredient": of_recipes(
+            IngredientInRecipe.objects.filter(ingredient__isnull=False), "recipe_id"
+        ).values_list("recipe_id", "ingredient_id"),
+    }
+    for facet, rows in sources.items():
+        for recipe_id, value in rows.iterator():
+            yield facet, recipe_id, value
+
+
+class FacetMatches:
+    """
+    Recipe ids matching a filter, newest first, sliced lazily so the
+    paginator never sorts more than it shows
+    """
+
+    def __init__(self, matches: Set[int], ordered: List[int]):
+        self.matches = matches
+        self.ordered = ordered
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    def __getitem__(self, page: slice) -> List[int]:
+        start, stop = page.start or 0, page.stop
+        if len(self.matches) * settings.RECIPE_FACETS_SORT_RATIO < len(self.ordered):
+            return sorted(self.matches, reverse=True)[start:stop]
+
+        # most recipes match, walk every id from the newest
+        ids = []
+        for recipe_id in reversed(self.ordered):
+            if recipe_id in self.matches:
+                ids.append(recipe_id)
+                if len(ids) == stop:
+                    break
+        return ids[start:stop]
+
+
+class FacetIndex(RecipeIndex):
+    """Posting sets of recipe ids per facet value"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {}
+        self._ordered: List[int] = []
+        self._recipes: Set[int] = set()
+        super().__init__()
+
+    def _reset(self) -> None:
+        self._postings = {}
+        self._ordered = []
+        self._recipes = set()
+
+    def _build(self) -> None:
+        postings = {facet: defaultdict(set) for facet in FACETS}
+        recipes = set()
+        for facet, recipe_id, value in _facet_rows(None):
+            postings[facet][value].add(recipe_id)
+            if facet == "cooking_time":
+                recipes.add(recipe_id)
+        with self._lock:
+            self._postings = {facet: dict(values) for facet, values in postings.items()}
+            self._recipes = recipes
+            self._ordered = sorted(recipes)
+
+    def _patch(self, recipe_ids: Set[int]) -> None:
+        rows = list(_facet_rows(sorted(recipe_ids)))
+        with self._lock:
+            postings = {}
+            for facet, values in self._postings.items():
+                postings[facet] = {
+                    value: posting - recipe_ids
+                    if not posting.isdisjoint(recipe_ids)
+                    else posting
+                    for value, posting in values.items()
+                }
+            added = defaultdict(set)
+            for facet, recipe_id, value in rows:
+                added[facet, value].add(recipe_id)
+            for (facet, value), ids in added.items():
+                postings[facet][value] = postings[facet].get(value, set()) | ids
+
+            present = {
+                recipe_id for facet, recipe_id, _ in rows if facet == "cooking_time"
+            }
+            ordered = list(self._ordered)
+            for recipe_id in recipe_ids & self._recipes:
+                del ordered[bisect_left(ordered, recipe_id)]
+            for recipe_id in present:
+                insort(ordered, recipe_id)
+
+            self._postings = postings
+            self._recipes = (self._recipes - recipe_ids) | present
+            self._ordered = ordered
+
+    def search(
+        self, selected: Dict[str, List[Any]]
+    ) -> Tuple[FacetMatches, Dict[str, Dict[Any, int]]]:
+        """
+        Recipes having one of the selected values of every facet, and the
+        number of recipes every facet value would match next to the
+        selections of the other facets
+        """
+
+        self.ensure_fresh()
+        with self._lock:
+            postings, recipes, ordered = self._postings, self._recipes, self._ordered
+        chosen = {
+            facet: set().union(
+                *(postings[facet].get(value, ()) for value in values)
+            )
+            for facet, values in selected.items()
+            if values
+        }
+
+        def matching(exclude: Optional[str] = None) -> Set[int]:
+            sets = sorted(
+                (ids for facet, ids in chosen.items() if facet != exclude),
+                key=len,
+            )
+            if not sets:
+                return recipes
+            return sets[0].intersection(*sets[1:])
+
+        counts = {}
+        for facet in FACETS:
+            base = matching(exclude=facet)
+            counts[facet] = {
+                value: len(posting) if base is recipes else len(posting & base)
+                for value, posting in postings[facet].items()
+            }
+        matches = matching()
+        return FacetMatches(matches, ordered), counts
+
+
+def _value_names(facet: str, values: Iterable[Any]) -> Dict[Any, str]:
+    if facet == "cooking_time":
+        return {value: value for value in values}
+    model = {
+        "category": Category,
+        "tag": Tag,
+        "ingredient": Ingredient,
+    }[facet]
+    return dict(model.objects.filter(id__in=values).values_list("id", "name"))
+
+
+def describe_facets(
+    counts: Dict[str, Dict[Any, int]], selected: Dict[str, List[Any]]
+) -> Dict[str, List[dict]]:
+    """
+    Every cooking time bucket and the RECIPE_FACETS_MAX_VALUES values of
+    the other facets matching the most recipes, selected values always
+    included. Values of deleted rows are left out.
+    """
+
+    facets = {}
+    for facet in FACETS:
+        if facet == "cooking_time":
+            values = cooking_time_buckets()
+        else:
+            top = heapq.nlargest(
+                settings.RECIPE_FACETS_MAX_VALUES,
+                (value for value, count in counts[facet].items() if count),
+                key=lambda value: (counts[facet][value], -value),
+            )
+            values = top + [
+                value for value in selected.get(facet, []) if value not in top
+            ]
+        names = _value_names(facet, values)
+        facets[facet] = [
+            {"value": value, "name": names[value], "count": counts[facet].get(value, 0)}
+            for value in values
+            if value in names
+        ]
+    return facets
+
+
+recipe_facets = FacetIndex()
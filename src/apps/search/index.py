@@ -0,0 +1,105 @@
+"""
+Recipe search index.
+
+Documents hold the title, short text and the names of tags, categories and
+ingredients of a recipe, normalized with text.normalize so Cyrillic and
+transliterated spellings meet. The signals reindex a recipe when its
+transaction commits and when a tag, category or ingredient it uses is
+renamed; rebuild_search_index refills the whole index.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.contrib.contenttypes.models import ContentType
+from taggit.models import TaggedItem
+
+from src.apps.ingredients.models import IngredientInRecipe
+from src.apps.recipes.models import Recipe
+from .backends import FIELDS, get_backend
+from .text import normalize, terms
+
+REBUILD_CHUNK_SIZE: int = 1000
+
+
+def recipe_documents(recipe_ids: Iterable[int]) -> Dict[int, Dict[str, str]]:
+    """Documents of the recipes, four queries for any number of recipes"""
+
+    recipe_ids = list(recipe_ids)
+    names = {field: defaultdict(list) for field in FIELDS}
+    recipes = Recipe.objects.filter(id__in=recipe_ids).values_list(
+        "id", "title", "short_text"
+    )
+    for recipe_id, title, short_text in recipes:
+        names["title"][recipe_id].append(title)
+        names["short_text"][recipe_id].append(short_text)
+
+    sources = {
+        "tags": TaggedItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(Recipe),
+            object_id__in=recipe_ids,
+        ).values_list("object_id", "tag__name"),
+        "categories": Recipe.category.through.objects.filter(
+            recipe_id__in=recipe_ids
+        ).values_list("recipe_id", "category__name"),
+        "ingredients": IngredientInRecipe.objects.filter(
+            recipe_id__in=recipe_ids, ingredient__isnull=False
+        ).values_list("recipe_id", "ingredient__name"),
+    }
+    for field, rows in sources.items():
+        for recipe_id, name in rows:
+            names[field][recipe_id].append(name)
+
+    return {
+        recipe_id: {
+            field: normalize(" ".join(names[field][recipe_id])) for field in FIELDS
+        }
+        for recipe_id in names["title"]
+    }
+
+
+def index_recipes(recipe_ids: Iterable[int]) -> int:
+    """Reindex the recipes, deleted ones are dropped. Returns number indexed"""
+
+    recipe_ids = set(recipe_ids)
+    documents = recipe_documents(recipe_ids)
+    backend = get_backend()
+    backend.remove(recipe_ids - set(documents))
+    if documents:
+        backend.index(documents)
+    return len(documents)
+
+
+def remove_recipes(recipe_ids: Iterable[int]) -> None:
+    get_backend().remove(recipe_ids)
+
+
+def _recipe_id_chunks() -> Iterable[List[int]]:
+    last_id = 0
+    while True:
+        chunk = list(
+            Recipe.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:REBUILD_CHUNK_SIZE]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def rebuild_search_index() -> int:
+    """Drop every document and index all recipes. Returns number indexed"""
+
+    get_backend().clear()
+    return sum(index_recipes(chunk) for chunk in _recipe_id_chunks())
+
+
+def search_recipes(query: str, limit: int) -> List[int]:
+    """Ids of recipes matching the query, best first"""
+
+    query_terms = terms(query)
+    if not query_terms:
+        return []
+    return get_backend().search(query_terms, limit)
+
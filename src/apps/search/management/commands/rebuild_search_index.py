@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.search.index import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Drop the recipe search index and index every recipe again."
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} recipes."))
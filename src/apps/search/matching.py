@@ -0,0 +1,165 @@
+"""
+In-memory ingredient index matching recipes to a pantry.
+
+Every process keeps a sorted numpy array of recipe ids per ingredient, one
+id per IngredientInRecipe row, and the number of rows of every recipe in
+an array indexed by recipe id. The rows a pantry covers are counted with
+one bincount over the arrays of its ingredients, and the best covered
+recipes are picked with a partition instead of a full sort, so matching
+never queries the database.
+
+The index is kept fresh through the shared log of written recipes, see
+changes.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from src.apps.ingredients.models import IngredientInRecipe
+from .changes import RecipeIndex
+
+ROWS_CHUNK_SIZE = 10_000
+
+
+class PantryMatch(NamedTuple):
+    recipe_id: int
+    matched: int
+    total: int
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of the ingredients of the recipe in the pantry"""
+
+        return self.matched / self.total
+
+
+def _read_rows(
+    recipe_ids: Optional[Set[int]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Recipe ids and ingredient ids of the ingredient rows of the recipes, of
+    all when recipe_ids is None. Rows of deleted ingredients have id 0.
+    """
+
+    rows = IngredientInRecipe.objects.order_by()
+    if recipe_ids is not None:
+        rows = rows.filter(recipe_id__in=recipe_ids)
+    pairs = np.fromiter(
+        (
+            value
+            for recipe_id, ingredient_id in rows.values_list(
+                "recipe_id", "ingredient_id"
+            ).iterator(chunk_size=ROWS_CHUNK_SIZE)
+            for value in (recipe_id, ingredient_id or 0)
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _postings(
+    recipe_ids: np.ndarray, ingredient_ids: np.ndarray
+) -> Dict[int, np.ndarray]:
+    """Sorted recipe ids per ingredient of the rows"""
+
+    known = ingredient_ids > 0
+    recipe_ids, ingredient_ids = recipe_ids[known], ingredient_ids[known]
+    order = np.lexsort((recipe_ids, ingredient_ids))
+    recipe_ids, ingredient_ids = recipe_ids[order], ingredient_ids[order]
+    ingredients, starts = np.unique(ingredient_ids, return_index=True)
+    return dict(zip(ingredients.tolist(), np.split(recipe_ids, starts[1:])))
+
+
+class IngredientMatchIndex(RecipeIndex):
+    """Recipe ids per ingredient and ingredient rows per recipe"""
+
+    def __init__(self):
+        self._postings: Dict[int, np.ndarray] = {}
+        self._totals = np.zeros(0, dtype=np.int32)
+        super().__init__()
+
+    def _reset(self) -> None:
+        self._postings = {}
+        self._totals = np.zeros(0, dtype=np.int32)
+
+    def _build(self) -> None:
+        recipe_ids, ingredient_ids = _read_rows(None)
+        totals = np.bincount(recipe_ids).astype(np.int32)
+        postings = _postings(recipe_ids, ingredient_ids)
+        with self._lock:
+            self._postings = postings
+            self._totals = totals
+
+    def _patch(self, recipe_ids: Set[int]) -> None:
+        if not recipe_ids:
+            return
+        changed = np.array(sorted(recipe_ids), dtype=np.int64)
+        rows = _read_rows(recipe_ids)
+        added = _postings(*rows)
+        with self._lock:
+            postings = dict(self._postings)
+            for ingredient, posting in self._postings.items():
+                # binary search first, most postings hold none of the recipes
+                at = np.searchsorted(posting, changed).clip(
+                    max=len(posting) - 1
+                )
+                if len(posting) and (posting[at] == changed).any():
+                    postings[ingredient] = posting[~np.isin(posting, changed)]
+            for ingredient, ids in added.items():
+                postings[ingredient] = np.sort(
+                    np.concatenate((postings.get(ingredient, ids[:0]), ids))
+                )
+
+            size = max(len(self._totals), int(changed[-1]) + 1)
+            totals = np.zeros(size, dtype=np.int32)
+            totals[: len(self._totals)] = self._totals
+            totals[changed] = 0
+            np.add.at(totals, rows[0], 1)
+
+            self._postings = {
+                ingredient: posting
+                for ingredient, posting in postings.items()
+                if len(posting)
+            }
+            self._totals = totals
+
+    def match(
+        self, ingredient_ids: Iterable[int], limit: int
+    ) -> List[PantryMatch]:
+        """
+        Recipes having the ingredients, best covered first, then those using
+        more of them, then the newest
+        """
+
+        self.ensure_fresh()
+        with self._lock:
+            postings, totals = self._postings, self._totals
+        found = [postings[id] for id in set(ingredient_ids) if id in postings]
+        if not found:
+            return []
+
+        hits = np.bincount(np.concatenate(found), minlength=len(totals))
+        recipes = np.flatnonzero(hits)
+        matched, total = hits[recipes], totals[recipes]
+        coverage = matched / total
+        if len(recipes) > limit:
+            # recipes tied with the last one kept are ranked further below
+            kth = len(recipes) - limit
+            keep = coverage >= np.partition(coverage, kth)[kth]
+            recipes, matched, total, coverage = (
+                recipes[keep],
+                matched[keep],
+                total[keep],
+                coverage[keep],
+            )
+        order = np.lexsort((-recipes, -matched, -coverage))[:limit]
+        return [
+            PantryMatch(int(recipe_id), int(count), int(rows))
+            for recipe_id, count, rows in zip(
+                recipes[order], matched[order], total[order]
+            )
+        ]
+
+
+recipe_matches = IngredientMatchIndex()
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("recipe_id", models.BigIntegerField(verbose_name="Рецепт")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        verbose_name="Дата изменения",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Изменение рецепта",
+                "verbose_name_plural": "Изменения рецептов",
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class RecipeChange(models.Model):
+    """
+    Recipe written or deleted, logged for the in-memory recipe indexes of
+    every process when the shared cache cannot number the changes, see
+    search.changes
+
+    Attrs:
+    • recipe_id (BigIntegerField): id of the recipe, kept after it is deleted.
+    • created_at (DateTimeField): time of the change, old rows are pruned.
+    """
+
+    recipe_id = models.BigIntegerField(verbose_name="Рецепт")
+    created_at = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name="Дата изменения"
+    )
+
+    class Meta:
+        verbose_name = "Изменение рецепта"
+        verbose_name_plural = "Изменения рецептов"
+
+    def __str__(self):
+        return f"{self.recipe_id} изменён {self.created_at}"
@@ -0,0 +1,79 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from src.apps.recipes.serializers import BaseRecipeListSerializer
+from src.base.fields import CommaSeparatedListField
+from .facets import cooking_time_buckets
+
+
+class RecipeSearchQuerySerializer(serializers.Serializer):
+    """
+    Words to look for in recipes
+    """
+
+    q = serializers.CharField(max_length=200)
+
+
+class RecipeFacetsQuerySerializer(serializers.Serializer):
+    """
+    Selected values of every facet, recipes must have one of the values of
+    every facet selected
+    """
+
+    category = CommaSeparatedListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=settings.RECIPE_FACETS_MAX_SELECTED,
+    )
+    tag = CommaSeparatedListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=settings.RECIPE_FACETS_MAX_SELECTED,
+    )
+    cooking_time = CommaSeparatedListField(
+        child=serializers.ChoiceField(choices=cooking_time_buckets()),
+        required=False,
+        default=list,
+    )
+    ingredient = CommaSeparatedListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        default=list,
+        max_length=settings.RECIPE_FACETS_MAX_SELECTED,
+    )
+
+
+class RecipeMatchSerializer(serializers.Serializer):
+    """
+    Ingredient names of a pantry, as in ingredient suggestions
+    """
+
+    ingredients = serializers.ListField(
+        child=serializers.CharField(max_length=100),
+        min_length=1,
+        max_length=settings.RECIPE_MATCH_MAX_INGREDIENTS,
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.RECIPE_MATCH_MAX_LIMIT,
+        default=settings.RECIPE_MATCH_LIMIT,
+    )
+
+
+class MatchedRecipeSerializer(BaseRecipeListSerializer):
+    """
+    Recipe with the number of its ingredients in the pantry
+    """
+
+    matched_count = serializers.IntegerField(read_only=True)
+    ingredients_count = serializers.IntegerField(read_only=True)
+    coverage = serializers.FloatField(read_only=True)
+
+    class Meta(BaseRecipeListSerializer.Meta):
+        fields = BaseRecipeListSerializer.Meta.fields + (
+            "matched_count",
+            "ingredients_count",
+            "coverage",
+        )
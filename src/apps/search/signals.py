@@ -0,0 +1,75 @@
+from functools import partial
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from src.apps.ingredients.models import Ingredient, IngredientInRecipe
+from src.apps.recipes.models import Category, Recipe
+from .backends import get_backend
+from .changes import recipes_changed
+from .index import index_recipes, remove_recipes
+
+
+@receiver(post_migrate)
+def setup_search_backend(sender, using, **kwargs):
+    # post_migrate is sent for apps with models only, the index is set up
+    # with the recipes it indexes
+    if sender.name == "src.apps.recipes":
+        get_backend().setup(using)
+
+
+@receiver(post_save, sender=Recipe)
+def index_saved_recipe(sender, instance, raw=False, **kwargs):
+    """
+    Indexed on commit, when tags, categories and ingredients written in the
+    same transaction are there too
+    """
+
+    if not raw:
+        transaction.on_commit(partial(index_recipes, [instance.id]))
+        transaction.on_commit(partial(recipes_changed, [instance.id]))
+
+
+@receiver(post_delete, sender=Recipe)
+def remove_deleted_recipe(sender, instance, **kwargs):
+    transaction.on_commit(partial(remove_recipes, [instance.id]))
+    transaction.on_commit(partial(recipes_changed, [instance.id]))
+
+
+def _reindex_on_commit(recipe_ids) -> None:
+    recipe_ids = list(recipe_ids)
+    if recipe_ids:
+        transaction.on_commit(partial(index_recipes, recipe_ids))
+
+
+@receiver(post_save, sender=Tag)
+def reindex_renamed_tag(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        _reindex_on_commit(
+            TaggedItem.objects.filter(
+                tag=instance, content_type=ContentType.objects.get_for_model(Recipe)
+            ).values_list("object_id", flat=True)
+        )
+
+
+@receiver(post_save, sender=Category)
+def reindex_renamed_category(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        _reindex_on_commit(
+            Recipe.category.through.objects.filter(category=instance).values_list(
+                "recipe_id", flat=True
+            )
+        )
+
+
+@receiver(post_save, sender=Ingredient)
+def reindex_renamed_ingredient(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        _reindex_on_commit(
+            IngredientInRecipe.objects.filter(ingredient=instance).values_list(
+                "recipe_id", flat=True
+            )
+        )
@@ -0,0 +1,72 @@
+"""
+Text normalization shared by indexed documents and queries.
+
+Words are stemmed by stripping one common Russian ending, transliterated
+with unidecode and stripped of the transliterated ending when typed in
+Latin, so "Борщи", "борща" and "borshchi" all become the term "borshch".
+"ё" is read as "е", and the common "ya"/"yu" spellings as unidecode's
+"ia"/"iu".
+"""
+
+import re
+from typing import List
+
+from unidecode import unidecode
+
+WORD = re.compile(r"\w+")
+LATIN_WORD = re.compile(r"[a-z0-9]+")
+CYRILLIC = re.compile(r"[а-яё]")
+MIN_STEM_LENGTH = 3
+MIN_TERM_LENGTH = 2
+LATIN_SPELLINGS = (("ya", "ia"), ("yu", "iu"))
+
+CYRILLIC_ENDINGS = sorted(
+    (
+        "иями ями ами ого его ому ему ыми ими ией ая яя ое ее ые ие ый ий ой ей "
+        "ом ем ам ям ах ях ов ев ью ия ию ии а я о е ы и у ю ь й"
+    ).split(),
+    key=len,
+    reverse=True,
+)
+LATIN_ENDINGS = sorted(
+    "iami ami ogo ego omu emu ykh ikh ymi imi aia ye ie yi ii oi ei om em am "
+    "ia iu a y i u e o".split(),
+    key=len,
+    reverse=True,
+)
+
+
+def _strip_ending(word: str, endings: List[str]) -> str:
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[: -len(ending)]
+    return word
+
+
+def _latin_spelling(word: str) -> str:
+    for spelling, transliteration in LATIN_SPELLINGS:
+        word = word.replace(spelling, transliteration)
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """
+    Stemmed, transliterated terms of the text in their order, single
+    letters such as the preposition "с" are left out
+    """
+
+    result = []
+    for word in WORD.findall(text.lower().replace("ё", "е")):
+        if CYRILLIC.search(word):
+            word = _strip_ending(word, CYRILLIC_ENDINGS)
+            result.extend(LATIN_WORD.findall(unidecode(word).lower()))
+        else:
+            result.extend(
+                _strip_ending(_latin_spelling(part), LATIN_ENDINGS)
+                for part in LATIN_WORD.findall(unidecode(word).lower())
+            )
+    return [term for term in result if len(term) >= MIN_TERM_LENGTH]
+
+
+def normalize(text: str) -> str:
+    return " ".join(terms(text))
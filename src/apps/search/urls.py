@@ -0,0 +1,14 @@
+from rest_framework.routers import DefaultRouter
+
+from src.apps.search.views import (
+    RecipeFacetViewSet,
+    RecipeMatchViewSet,
+    RecipeSearchViewSet,
+)
+
+router = DefaultRouter()
+router.register(r"recipe/search", RecipeSearchViewSet, basename="recipe-search")
+router.register(r"recipe/facets", RecipeFacetViewSet, basename="recipe-facets")
+router.register(r"recipe/match", RecipeMatchViewSet, basename="recipe-match")
+
+urlpatterns = router.urls
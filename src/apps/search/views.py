@@ -0,0 +1,127 @@
+from typing import List
+
+from django.conf import settings
+from django.db.models.functions import Coalesce
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from src.apps.ingredients.dictionary import ingredient_dictionary
+from src.apps.recipes.models import Recipe
+from src.apps.recipes.serializers import BaseRecipeListSerializer
+from src.base.paginators import SearchPagination
+from .facets import describe_facets, recipe_facets
+from .index import search_recipes
+from .matching import recipe_matches
+from .serializers import (
+    MatchedRecipeSerializer,
+    RecipeFacetsQuerySerializer,
+    RecipeMatchSerializer,
+    RecipeSearchQuerySerializer,
+)
+
+
+def list_recipes(recipe_ids: List[int]) -> List[Recipe]:
+    """Recipes of the ids in their order, annotated for the list serializer"""
+
+    recipes = (
+        Recipe.objects.filter(id__in=recipe_ids)
+        .select_related("author")
+        .prefetch_related("tag")
+        .annotate(
+            reactions_count=Coalesce("stats__reactions_count", 0),
+            views_count=Coalesce("stats__views_count", 0),
+            comments_count=Coalesce("stats__comments_count", 0),
+        )
+        .in_bulk()
+    )
+    return [recipes[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes]
+
+
+class RecipeSearchViewSet(GenericViewSet):
+    """
+    Recipes matching `q` in their title, short text, tags, categories or
+    ingredients, best matches first. Cyrillic and transliterated words and
+    their word forms match each other.
+    """
+
+    serializer_class = BaseRecipeListSerializer
+    pagination_class = SearchPagination
+    permission_classes = (AllowAny,)
+    swagger_tags = ["recipes"]
+
+    def list(self, request, *args, **kwargs):
+        query = RecipeSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        recipe_ids = search_recipes(
+            query.validated_data["q"], settings.RECIPE_SEARCH_MAX_RESULTS
+        )
+
+        page = self.paginate_queryset(recipe_ids)
+        serializer = self.get_serializer(list_recipes(page), many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class RecipeFacetViewSet(GenericViewSet):
+    """
+    Recipes filtered by category, tag, cooking time bucket and ingredient,
+    newest first, with the number of recipes per value of every facet.
+    Values are OR-ed within a facet and facets are AND-ed.
+    """
+
+    serializer_class = BaseRecipeListSerializer
+    pagination_class = SearchPagination
+    permission_classes = (AllowAny,)
+    swagger_tags = ["recipes"]
+
+    def list(self, request, *args, **kwargs):
+        query = RecipeFacetsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        selected = query.validated_data
+        matches, counts = recipe_facets.search(selected)
+
+        page = self.paginate_queryset(matches)
+        response = self.get_paginated_response(
+            self.get_serializer(list_recipes(page), many=True).data
+        )
+        response.data["facets"] = describe_facets(counts, selected)
+        return response
+
+
+class RecipeMatchViewSet(GenericViewSet):
+    """
+    Recipes to cook from the `ingredients` of a pantry, the best covered
+    first: the most of their ingredients in the pantry, then the most
+    ingredients used, then the newest. Names of unknown ingredients are
+    returned in `unknown`.
+    """
+
+    serializer_class = RecipeMatchSerializer
+    permission_classes = (AllowAny,)
+    swagger_tags = ["recipes"]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        names = serializer.validated_data["ingredients"]
+        ids = ingredient_dictionary.find_ids(names)
+        unknown = [name for name in dict.fromkeys(names) if name not in ids]
+        matches = recipe_matches.match(
+            ids.values(), serializer.validated_data["limit"]
+        )
+
+        recipes = list_recipes([match.recipe_id for match in matches])
+        found = {match.recipe_id: match for match in matches}
+        for recipe in recipes:
+            match = found[recipe.id]
+            recipe.matched_count = match.matched
+            recipe.ingredients_count = match.total
+            recipe.coverage = round(match.coverage, 4)
+        return Response(
+            {
+                "unknown": unknown,
+                "results": MatchedRecipeSerializer(
+                    recipes, many=True, context=self.get_serializer_context()
+                ).data,
+            }
+        )
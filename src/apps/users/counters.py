@@ -0,0 +1,115 @@
+"""
+Denormalized follower, following and recipe counters of users.
+
+Counters are shifted by users.signals in the transaction that creates or
+deletes the follow or recipe. Writes that skip model signals (bulk_create,
+queryset.update, raw SQL) leave them behind, check_user_counters finds and
+repairs the drift.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import Count, F
+
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from .models import CustomUser
+
+COUNTER_FIELDS = ("followers_count", "following_count", "recipes_count")
+REBUILD_CHUNK_SIZE = 1000
+
+
+def _sources():
+    """(counter, queryset, user field) of every counter"""
+
+    return [
+        ("followers_count", Follow.objects.all(), "author_id"),
+        ("following_count", Follow.objects.all(), "user_id"),
+        ("recipes_count", Recipe.objects.all(), "author_id"),
+    ]
+
+
+def compute_user_counters(user_ids: Iterable[int]) -> Dict[int, dict]:
+    """Count follows and recipes of the given users from the source tables"""
+
+    user_ids = list(user_ids)
+    counters = {
+        user_id: {field: 0 for field in COUNTER_FIELDS} for user_id in user_ids
+    }
+    for field, queryset, user_field in _sources():
+        rows = (
+            queryset.filter(**{f"{user_field}__in": user_ids})
+            .values(user_field)
+            .order_by()
+            .annotate(total=Count("id"))
+        )
+        for row in rows:
+            counters[row[user_field]][field] = row["total"]
+    return counters
+
+
+def _user_id_chunks(user_ids: Optional[Iterable[int]]) -> Iterable[List[int]]:
+    if user_ids is not None:
+        user_ids = sorted(set(user_ids))
+        for start in range(0, len(user_ids), REBUILD_CHUNK_SIZE):
+            yield user_ids[start : start + REBUILD_CHUNK_SIZE]
+        return
+
+    last_id = 0
+    while True:
+        chunk = list(
+            CustomUser.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:REBUILD_CHUNK_SIZE]
+        )
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def rebuild_user_counters(user_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute counters from the source tables.
+    Rebuilds every user when user_ids is None. Returns number of users.
+    """
+
+    rebuilt = 0
+    for chunk in _user_id_chunks(user_ids):
+        users = [
+            CustomUser(id=user_id, **values)
+            for user_id, values in compute_user_counters(chunk).items()
+        ]
+        CustomUser.objects.bulk_update(users, COUNTER_FIELDS)
+        rebuilt += len(users)
+    return rebuilt
+
+
+def find_counter_drift(
+    user_ids: Optional[Iterable[int]] = None,
+) -> List[Tuple[int, str, int, int]]:
+    """
+    Compare stored counters with the source tables.
+    Returns a list of (user_id, field, stored, actual).
+    """
+
+    drift = []
+    for chunk in _user_id_chunks(user_ids):
+        actual = compute_user_counters(chunk)
+        stored = {
+            row["id"]: row
+            for row in CustomUser.objects.filter(id__in=chunk).values(
+                "id", *COUNTER_FIELDS
+            )
+        }
+        for user_id, row in stored.items():
+            for field in COUNTER_FIELDS:
+                if row[field] != actual[user_id][field]:
+                    drift.append((user_id, field, row[field], actual[user_id][field]))
+    return drift
+
+
+def bump_user_counter(user_id: int, field: str, delta: int) -> None:
+    """Atomically shift a counter of a user by delta"""
+
+    CustomUser.objects.filter(id=user_id).update(**{field: F(field) + delta})
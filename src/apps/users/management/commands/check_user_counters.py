@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from src.apps.users.counters import find_counter_drift, rebuild_user_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare follower, following and recipe counters of users with the "
+        "source tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "user_ids",
+            nargs="*",
+            type=int,
+            help="Check only these users (default: all).",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rebuild the counters of users that have drifted.",
+        )
+
+    def handle(self, *args, **options):
+        drift = find_counter_drift(options["user_ids"] or None)
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("User counters are consistent."))
+            return
+
+        for user_id, field, stored, actual in drift:
+            self.stdout.write(f"user {user_id}: {field} is {stored}, expected {actual}")
+
+        drifted_ids = {user_id for user_id, *_ in drift}
+        if options["fix"]:
+            rebuild_user_counters(drifted_ids)
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt counters of {len(drifted_ids)} users.")
+            )
+            return
+
+        raise CommandError(f"Counters of {len(drifted_ids)} users have drifted.")
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:29
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_user_counters(apps, schema_editor):
+    CustomUser = apps.get_model("users", "CustomUser")
+    Follow = apps.get_model("follow", "Follow")
+    Recipe = apps.get_model("recipes", "Recipe")
+
+    def count_by_user(queryset, user_field):
+        rows = queryset.values(user_field).order_by().annotate(total=Count("id"))
+        return {row[user_field]: row["total"] for row in rows}
+
+    followers = count_by_user(Follow.objects.all(), "author_id")
+    following = count_by_user(Follow.objects.all(), "user_id")
+    recipes = count_by_user(Recipe.objects.all(), "author_id")
+
+    users = list(CustomUser.objects.only("id"))
+    for user in users:
+        user.followers_count = followers.get(user.id, 0)
+        user.following_count = following.get(user.id, 0)
+        user.recipes_count = recipes.get(user.id, 0)
+    CustomUser.objects.bulk_update(
+        users,
+        ["followers_count", "following_count", "recipes_count"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "users",
+            "0005_alter_customuser_options_alter_customuser_managers_and_more",
+        ),
+        ("follow", "0003_follow_follow_user_created_idx_and_more"),
+        ("recipes", "0014_recipe_recipe_pub_date_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="followers_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="customuser",
+            name="following_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="customuser",
+            name="recipes_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_user_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.6 on 2026-10-18 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_customuser_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                fields=["-recipes_count", "-id"],
+                name="user_recipes_count_id_idx",
+            ),
+        ),
+    ]
@@ -2,14 +2,16 @@ from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser, PermissionsMixin
 from django.core.validators import FileExtensionValidator, RegexValidator
+from django.db import IntegrityError
 from django.db.models import (
-    Max,
     CharField,
     EmailField,
     BooleanField,
     ImageField,
+    IntegerField,
     Q,
     CheckConstraint,
+    Index,
     UniqueConstraint,
 )
 from django.db.transaction import atomic
@@ -30,17 +32,30 @@ class CustomUserManager(BaseUserManager):
     def create_user(self, email, username=None, password=None, **extra_fields):
         """
         Create and save a User with the given email and password.
+
+        The user is inserted without a username and then named `user<id>`
+        after its primary key, so concurrent signups never wait for each
+        other. Only when that name was already taken by hand another one
+        is picked with generate_username.
         """
-        with atomic():
+        with atomic(using=self._db):
             email = self.normalize_email(email)
 
-            max_id = CustomUser.objects.aggregate(Max("id"))["id__max"] or 0
-            username_postfix = max_id + 1
-            username = generate_username(username_postfix, CustomUser)
-
-            user = self.model(email=email, username=username, **extra_fields)
+            user = self.model(email=email, username=None, **extra_fields)
             user.set_password(password)
             user.save(using=self._db)
+
+            username = f"user{user.pk}"
+            for attempt in range(settings.USERNAME_ATTEMPTS):
+                try:
+                    with atomic(using=self._db):
+                        self.filter(pk=user.pk).update(username=username)
+                    break
+                except IntegrityError:
+                    if attempt + 1 == settings.USERNAME_ATTEMPTS:
+                        raise
+                    username = generate_username(user.pk, self.model)
+            user.username = username
             return user
 
     def create_superuser(self, email, username=None, password=None, **extra_fields):
@@ -76,6 +91,9 @@ class CustomUser(AbstractUser, PermissionsMixin):
     • is_active (BooleanField(default=True)): indicates whether user is active.
     • is_staff (BooleanField(default=False)): indicates whether user is staff.
     • is_admin (BooleanField(default=False)): indicates whether user is admin.
+    • followers_count (IntegerField): number of users following the user.
+    • following_count (IntegerField): number of users the user follows.
+    • recipes_count (IntegerField): number of recipes of the user.
     """
 
     objects = CustomUserManager()
@@ -128,6 +146,10 @@ class CustomUser(AbstractUser, PermissionsMixin):
     is_active = BooleanField(default=True)
     is_staff = BooleanField(default=False)
     is_admin = BooleanField(default=False)
+    # kept up to date by users.signals, see users.counters
+    followers_count = IntegerField(default=0, editable=False)
+    following_count = IntegerField(default=0, editable=False)
+    recipes_count = IntegerField(default=0, editable=False)
 
     class Meta:
         """
@@ -137,6 +159,9 @@ class CustomUser(AbstractUser, PermissionsMixin):
         verbose_name = "user"
         verbose_name_plural = "users"
         ordering = ["-date_joined"]
+        indexes = [
+            Index(fields=["-recipes_count", "-id"], name="user_recipes_count_id_idx"),
+        ]
         constraints = [
             UniqueConstraint(fields=["email"], name="unique_email"),
             CheckConstraint(check=~Q(username="me"), name="not_me"),
@@ -4,6 +4,7 @@ from djoser.serializers import UserCreateSerializer
 from django.contrib.auth.password_validation import validate_password
 
 from .models import CustomUser
+from src.apps.follow.mixins import FollowStatusSerializerMixin
 from src.base.code_text import PASSWORDS_ARE_NOT_SIMILAR
 
 
@@ -65,14 +66,14 @@ class CustomUserSerializer(serializers.ModelSerializer):
         ]
 
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(FollowStatusSerializerMixin, serializers.ModelSerializer):
     """
-    Serializer for CustomUser model for list endpoint
+    Serializer for CustomUser model for list endpoint, `is_follow` and
+    `is_follower` are read from the `follow_status` context of the page,
+    which the list always resolves
     """
 
-    is_follow = serializers.BooleanField()
-    is_follower = serializers.BooleanField()
-    recipes_count = serializers.IntegerField()
+    recipes_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = get_user_model()
@@ -82,8 +83,6 @@ class UserListSerializer(serializers.ModelSerializer):
             "display_name",
             "avatar",
             "recipes_count",
-            "is_follow",
-            "is_follower",
         )
 
 
@@ -105,9 +104,12 @@ class CustomUserMeSerializer(serializers.ModelSerializer):
         )
 
 
-class AuthorInRecipeSerializer(serializers.ModelSerializer):
+class AuthorInRecipeSerializer(
+    FollowStatusSerializerMixin, serializers.ModelSerializer
+):
     """
-    Author in recipe serializer
+    Author in recipe serializer, with follow flags on
+    `?include=follow_status`
     """
 
     class Meta:
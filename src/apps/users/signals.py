@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.apps.follow.models import Follow
+from src.apps.recipes.models import Recipe
+from .counters import bump_user_counter
+
+
+@receiver(post_save, sender=Follow)
+def count_created_follow(sender, instance, created, **kwargs):
+    if created and not kwargs.get("raw"):
+        bump_user_counter(instance.author_id, "followers_count", 1)
+        bump_user_counter(instance.user_id, "following_count", 1)
+
+
+@receiver(post_delete, sender=Follow)
+def count_deleted_follow(sender, instance, **kwargs):
+    bump_user_counter(instance.author_id, "followers_count", -1)
+    bump_user_counter(instance.user_id, "following_count", -1)
+
+
+@receiver(post_save, sender=Recipe)
+def count_created_recipe(sender, instance, created, **kwargs):
+    if created and not kwargs.get("raw"):
+        bump_user_counter(instance.author_id, "recipes_count", 1)
+
+
+@receiver(post_delete, sender=Recipe)
+def count_deleted_recipe(sender, instance, **kwargs):
+    bump_user_counter(instance.author_id, "recipes_count", -1)
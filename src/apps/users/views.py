@@ -1,4 +1,3 @@
-from django.db.models import Count, Exists, OuterRef
 from djoser.views import UserViewSet
 from rest_framework.mixins import (
     ListModelMixin,
@@ -9,7 +8,7 @@ from rest_framework.mixins import (
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
 
-from src.apps.follow.models import Follow
+from src.apps.follow.mixins import IncludeFollowStatusMixin
 from src.base.paginators import UserListPagination
 from src.base.permissions import IsOwnerOrAdminOrReadOnly
 from .models import CustomUser
@@ -39,7 +38,7 @@ class CustomUserMeViewSet(UserViewSet):
         return super().get_serializer_class()
 
 
-class ListUsersViewSet(GenericViewSet, ListModelMixin):
+class ListUsersViewSet(IncludeFollowStatusMixin, GenericViewSet, ListModelMixin):
     """
     ViewSet for get all users
     """
@@ -51,23 +50,23 @@ class ListUsersViewSet(GenericViewSet, ListModelMixin):
     ]
     pagination_class = UserListPagination
     lookup_field = "username"
+    follow_status_user_field = "id"
 
     def get_queryset(self):
         """
-        Get all users with recipes_count, is_follow, and is_follower fields.
+        Get all users by the denormalized recipes_count, the ordering walks
+        the (recipes_count, id) index so pages and cursors need no sort
         """
 
-        user = self.request.user
-        queryset = CustomUser.objects.all().annotate(
-            recipes_count=Count("recipe"),
-        )
+        return CustomUser.objects.order_by("-recipes_count", "-id")
 
-        queryset = queryset.annotate(
-            is_follow=Exists(Follow.objects.filter(user=user, author=OuterRef("pk"))),
-            is_follower=Exists(Follow.objects.filter(author=user, user=OuterRef("pk"))),
-        )
+    def include_follow_status(self) -> bool:
+        """
+        is_follow and is_follower are always listed, read for the page with
+        one query
+        """
 
-        return queryset.order_by("-recipes_count")
+        return True
 
 
 class CustomUserViewSet(
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from src.apps.view.models import ViewRecipes
+from src.apps.view.models import RecipeViewRollup, ViewRecipes
 
 
 @admin.register(ViewRecipes)
@@ -9,3 +9,9 @@ class ViewAdmin(admin.ModelAdmin):
     list_display_links = ["user", "recipe"]
     list_filter = ["created_at"]
     search_fields = ["user", "recipe"]
+
+
+@admin.register(RecipeViewRollup)
+class RecipeViewRollupAdmin(admin.ModelAdmin):
+    list_display = ["recipe", "period_start", "views_count"]
+    list_filter = ["period_start"]
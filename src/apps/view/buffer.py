@@ -0,0 +1,196 @@
+"""
+Write-behind buffer for recipe views.
+
+Reading a recipe only touches the cache: the view is deduplicated by a
+(viewer, recipe) key living TIME_FROM_VIEW_RECIPE minutes and queued under
+a sequence number. flush_view_buffer, run by the flush_recipe_views
+command, writes queued views in number order with bulk_create and shifts
+RecipeStats.
+
+The queue needs a default cache that is atomic and never culls its keys
+(see is_atomic_cache), on any other cache views are written directly.
+"""
+
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from hashlib import md5
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.db import transaction
+from django.http import HttpRequest
+from django.utils import timezone
+
+from src.apps.recipes.models import Recipe
+from src.apps.recipes.stats import activity_window_start, bump_recipe_stats
+from src.base.cache import is_atomic_cache
+from .models import ViewRecipes
+
+QUEUE_HEAD_KEY = "views:queue:head"
+QUEUE_TAIL_KEY = "views:queue:tail"
+QUEUE_GAP_KEY = "views:queue:gap"
+FLUSH_LOCK_KEY = "views:flush:lock"
+FLUSH_LOCK_TIMEOUT = 5 * 60
+# marks a skipped number so its late writer cannot queue an orphan
+SKIPPED_ITEM = "skipped"
+SKIPPED_ITEM_TIMEOUT = 60 * 60 * 24
+
+QueuedView = Tuple[str, int, datetime]
+
+
+def get_viewer(request: HttpRequest) -> str:
+    """Viewer as stored in ViewRecipes.user"""
+
+    if request.user.is_authenticated:
+        return str(request.user)
+    return f"Anonymous-{request.META.get('REMOTE_ADDR')}"
+
+
+def view_seen_key(viewer: str, recipe_id: int) -> str:
+    return f"views:seen:{md5(viewer.encode()).hexdigest()}:{recipe_id}"
+
+
+def queue_item_key(number: int) -> str:
+    return f"views:queue:{number}"
+
+
+def buffer_recipe_view(recipe: Recipe, request: HttpRequest) -> bool:
+    """
+    Queue a view of the recipe unless the viewer already saw it in the last
+    TIME_FROM_VIEW_RECIPE minutes. Returns whether the view was queued.
+    """
+
+    viewer = get_viewer(request)
+    seen = view_seen_key(viewer, recipe.id)
+    if not cache.add(seen, True, settings.TIME_FROM_VIEW_RECIPE * 60):
+        return False
+
+    cache.add(QUEUE_HEAD_KEY, 0, None)
+    number = cache.incr(QUEUE_HEAD_KEY)
+    # fails only when the flush gave up waiting for this number
+    return cache.add(
+        queue_item_key(number), (viewer, recipe.id, timezone.now()), None
+    )
+
+
+def save_recipe_view(recipe: Recipe, request: HttpRequest) -> bool:
+    """
+    Write a view of the recipe unless the viewer already saw it in the last
+    TIME_FROM_VIEW_RECIPE minutes. Returns whether the view was written.
+    """
+
+    viewer = get_viewer(request)
+    time_threshold = timezone.now() - timedelta(minutes=settings.TIME_FROM_VIEW_RECIPE)
+    if ViewRecipes.objects.filter(
+        user=viewer, recipe=recipe, created_at__gte=time_threshold
+    ).exists():
+        return False
+
+    ViewRecipes.objects.create(user=viewer, recipe=recipe)
+    return True
+
+
+def record_recipe_view(recipe: Recipe, request: HttpRequest) -> bool:
+    """Queue the view when the default cache can hold the queue, else write it"""
+
+    if is_atomic_cache(DEFAULT_CACHE_ALIAS):
+        return buffer_recipe_view(recipe, request)
+    return save_recipe_view(recipe, request)
+
+
+def _save_views(views: List[QueuedView]) -> int:
+    """Insert views of existing recipes and shift their counters"""
+
+    existing = set(
+        Recipe.objects.filter(id__in={recipe_id for _, recipe_id, _ in views})
+        .values_list("id", flat=True)
+    )
+    objs = [
+        ViewRecipes(user=viewer, recipe_id=recipe_id, created_at=viewed_at)
+        for viewer, recipe_id, viewed_at in views
+        if recipe_id in existing
+    ]
+    window_start = activity_window_start()
+    counts = Counter((obj.recipe_id, obj.created_at >= window_start) for obj in objs)
+
+    # bulk_create sends no post_save, counters are shifted here
+    with transaction.atomic():
+        ViewRecipes.objects.bulk_create(objs)
+        for (recipe_id, is_latest), count in counts.items():
+            bump_recipe_stats(recipe_id, "views", count, is_latest=is_latest)
+    return len(objs)
+
+
+def _gap_expired(number: int) -> bool:
+    """
+    Whether the missing item of the number was first seen missing more than
+    VIEW_BUFFER_GAP_GRACE seconds ago. The number was taken before it was
+    first seen missing, so its writer has had at least that long.
+    """
+
+    now = time.time()
+    gap = cache.get(QUEUE_GAP_KEY)
+    if gap is None or gap[0] != number:
+        cache.set(QUEUE_GAP_KEY, (number, now), None)
+        return False
+    return now - gap[1] > settings.VIEW_BUFFER_GAP_GRACE
+
+
+def flush_view_buffer(batch_size: Optional[int] = None) -> int:
+    """
+    Write queued views to the database in batches. Returns number of saved
+    views, 0 when another flush is running.
+
+    Queued items never expire, so a missing item belongs to a writer that
+    took its number but has not stored the view yet. The flush stops before
+    it and retries on the next run. After VIEW_BUFFER_GAP_GRACE seconds the
+    number is skipped and marked, so the writer cannot store it any more.
+    """
+
+    batch_size = batch_size or settings.VIEW_BUFFER_BATCH_SIZE
+    if not cache.add(FLUSH_LOCK_KEY, True, FLUSH_LOCK_TIMEOUT):
+        return 0
+
+    saved = 0
+    try:
+        while True:
+            tail = cache.get(QUEUE_TAIL_KEY, 0)
+            head = cache.get(QUEUE_HEAD_KEY, 0)
+            if tail >= head:
+                break
+
+            numbers = range(tail + 1, min(head, tail + batch_size) + 1)
+            items = cache.get_many([queue_item_key(number) for number in numbers])
+            views, last = [], tail
+            for number in numbers:
+                key = queue_item_key(number)
+                if key not in items:
+                    if not _gap_expired(number):
+                        break
+                    if cache.add(key, SKIPPED_ITEM, SKIPPED_ITEM_TIMEOUT):
+                        last = number
+                        continue
+                    # written at last
+                    items[key] = cache.get(key)
+                views.append(items[key])
+                last = number
+            if last == tail:
+                break
+
+            saved += _save_views(views)
+            cache.set(QUEUE_TAIL_KEY, last, None)
+            # skipped numbers keep their marks until they expire
+            cache.delete_many(
+                [
+                    queue_item_key(number)
+                    for number in range(tail + 1, last + 1)
+                    if queue_item_key(number) in items
+                ]
+            )
+            if last < numbers[-1]:
+                break
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+    return saved
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.view.rollups import compact_recipe_views
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold recipe views older than VIEW_RAW_RETENTION_DAYS into hourly "
+        "rollups and delete the raw rows. Meant to be run from cron, e.g. daily."
+    )
+
+    def handle(self, *args, **options):
+        folded = compact_recipe_views()
+        self.stdout.write(self.style.SUCCESS(f"Folded {folded} recipe views."))
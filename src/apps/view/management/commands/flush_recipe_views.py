@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from src.apps.view.buffer import flush_view_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Write recipe views buffered in the cache to the database. "
+        "Meant to be run from cron, e.g. every minute."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Views per bulk insert (default: VIEW_BUFFER_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        saved = flush_view_buffer(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Saved {saved} recipe views."))
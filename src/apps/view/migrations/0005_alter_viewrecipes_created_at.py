@@ -0,0 +1,22 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("view", "0004_remove_viewrecipes_unique_view"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="viewrecipes",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                db_index=True,
+                verbose_name="Время просмотра",
+            ),
+        ),
+    ]
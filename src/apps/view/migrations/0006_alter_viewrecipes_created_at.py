@@ -0,0 +1,23 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("view", "0005_alter_viewrecipes_created_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="viewrecipes",
+            name="created_at",
+            field=models.DateTimeField(
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Время просмотра",
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0014_recipe_recipe_pub_date_id_idx"),
+        ("view", "0006_alter_viewrecipes_created_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipeViewRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period_start",
+                    models.DateTimeField(
+                        db_index=True, verbose_name="Начало часа"
+                    ),
+                ),
+                (
+                    "views_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество просмотров"
+                    ),
+                ),
+                (
+                    "recipe",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_rollups",
+                        to="recipes.recipe",
+                        verbose_name="Рецепт",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Просмотры рецепта за час",
+                "verbose_name_plural": "Просмотры рецептов по часам",
+                "ordering": ["-period_start"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="recipeviewrollup",
+            constraint=models.UniqueConstraint(
+                fields=("recipe", "period_start"), name="unique_view_rollup"
+            ),
+        ),
+    ]
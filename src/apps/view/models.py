@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from src.apps.recipes.models import Recipe
 
@@ -8,7 +9,10 @@ class ViewRecipes(models.Model):
     recipe = models.ForeignKey(
         Recipe, on_delete=models.CASCADE, related_name="views", verbose_name="Рецепт"
     )
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Время просмотра")
+    # not auto_now_add: buffered views are saved with the time of the view
+    created_at = models.DateTimeField(
+        default=timezone.now, db_index=True, verbose_name="Время просмотра"
+    )
 
     class Meta:
         verbose_name = "Просмотр рецепта"
@@ -17,3 +21,34 @@ class ViewRecipes(models.Model):
 
     def __str__(self):
         return f"Пользователь {self.user} просмотрел рецепт {self.recipe}"
+
+
+class RecipeViewRollup(models.Model):
+    """
+    Views of a recipe in one hour, raw ViewRecipes rows are folded into it
+    by the compact_recipe_views command
+    """
+
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name="view_rollups",
+        verbose_name="Рецепт",
+    )
+    period_start = models.DateTimeField(db_index=True, verbose_name="Начало часа")
+    views_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество просмотров"
+    )
+
+    class Meta:
+        verbose_name = "Просмотры рецепта за час"
+        verbose_name_plural = "Просмотры рецептов по часам"
+        ordering = ["-period_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipe", "period_start"], name="unique_view_rollup"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.recipe}: {self.views_count} просмотров с {self.period_start}"
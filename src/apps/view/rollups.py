@@ -0,0 +1,97 @@
+"""
+Compaction of raw recipe views into hourly RecipeViewRollup rows.
+
+Raw rows older than VIEW_RAW_RETENTION_DAYS are counted per recipe and
+hour, added to the rollups and deleted, so ViewRecipes only keeps a short
+tail. Recipe counters read rollups plus that tail (see recipes.stats).
+"""
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import RecipeViewRollup, ViewRecipes
+
+
+def compaction_cutoff() -> datetime:
+    """Start of the hour before which raw views are folded into rollups"""
+
+    cutoff = timezone.now() - timedelta(days=settings.VIEW_RAW_RETENTION_DAYS)
+    return cutoff.replace(minute=0, second=0, microsecond=0)
+
+
+def compact_recipe_views(cutoff: datetime = None) -> int:
+    """
+    Fold raw views made before cutoff into hourly rollups and delete them,
+    one day of views per transaction. Returns number of folded views.
+    """
+
+    cutoff = cutoff or compaction_cutoff()
+    oldest = (
+        ViewRecipes.objects.filter(created_at__lt=cutoff)
+        .order_by("created_at")
+        .values_list("created_at", flat=True)
+        .first()
+    )
+    if oldest is None:
+        return 0
+
+    folded = 0
+    day_start = oldest.replace(minute=0, second=0, microsecond=0)
+    while day_start < cutoff:
+        day_end = min(day_start + timedelta(days=1), cutoff)
+        with transaction.atomic():
+            folded += _fold_period(day_start, day_end)
+        day_start = day_end
+    return folded
+
+
+def _fold_period(start: datetime, end: datetime) -> int:
+    raw_views = ViewRecipes.objects.filter(created_at__gte=start, created_at__lt=end)
+    counts = {
+        (row["recipe_id"], row["hour"]): row["views"]
+        for row in raw_views.annotate(hour=TruncHour("created_at"))
+        .values("recipe_id", "hour")
+        .order_by()
+        .annotate(views=Count("id"))
+    }
+    if not counts:
+        return 0
+
+    for rollup in RecipeViewRollup.objects.filter(
+        recipe_id__in={recipe_id for recipe_id, _ in counts},
+        period_start__gte=start,
+        period_start__lt=end,
+    ):
+        key = (rollup.recipe_id, rollup.period_start)
+        if key in counts:
+            counts[key] += rollup.views_count
+
+    RecipeViewRollup.objects.bulk_create(
+        [
+            RecipeViewRollup(recipe_id=recipe_id, period_start=hour, views_count=views)
+            for (recipe_id, hour), views in counts.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["recipe", "period_start"],
+        update_fields=["views_count"],
+    )
+    # the views stay counted through the rollups, so the post_delete
+    # handlers shifting RecipeStats must not run: plain DELETE, no signals
+    return _delete_raw_views(start, end)
+
+
+def _delete_raw_views(start: datetime, end: datetime) -> int:
+    field = ViewRecipes._meta.get_field("created_at")
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(ViewRecipes._meta.db_table)}"
+            f" WHERE {quote(field.column)} >= %s AND {quote(field.column)} < %s",
+            [field.get_db_prep_value(value, connection) for value in (start, end)],
+        )
+        return cursor.rowcount
@@ -0,0 +1,20 @@
+"""
+Cache namespaces of the apps, configured as CACHES aliases in settings.
+Each proxy behaves like django.core.cache.cache for its own alias.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+feed_cache = ConnectionProxy(caches, "feed")
+reactions_cache = ConnectionProxy(caches, "reactions")
+
+
+def is_atomic_cache(alias: str) -> bool:
+    """
+    Whether add and incr of the alias are atomic for every process and its
+    keys stored without timeout are never culled, see ATOMIC_CACHE_BACKENDS
+    """
+
+    return settings.CACHES[alias]["BACKEND"] in settings.ATOMIC_CACHE_BACKENDS
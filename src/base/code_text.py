@@ -27,6 +27,7 @@ DONT_HAVE_PERMISSIONS: dict = {
     "detail": "У вас недостаточно прав для выполнения данного действия."
 }
 INVALID_ID_FORMAT: dict = {"detail": "Неверный формат id."}
+INVALID_CURSOR: dict = {"detail": "Неверный курсор."}
 
 # Comment status
 COMMENT_NOT_FOUND: dict = {"detail": "Комментарий не найден."}
@@ -53,6 +54,9 @@ SUCCESSFUL_UNSUBSCRIBE_FROM_THE_AUTHOR: dict = {
 ALREADY_SUBSCRIBED_TO_THIS_AUTHOR: dict = {
     "message": ["Вы уже подписаны на этого автора."]
 }
+NO_USERS_FOR_FOLLOW_STATUS: dict = {
+    "detail": "Укажите пользователей (usernames) или их id (ids)."
+}
 
 # Reaction status
 REACTION_ALREADY_SET: dict = {"detail": "Вы уже поставили такую реакцию."}
@@ -61,6 +65,9 @@ SUCCESSFUL_LIKED_THE_RECIPE: dict = {"message": "Вы оценили рецеп
 REACTION_CANCELLED: dict = {"message": "Реакция отменена!"}
 ALREADY_RATED_THIS_COMMENT: dict = {"detail": "Вы уже оценили данный комментарий."}
 SUCCESSFUL_RATED_COMMENT: dict = {"message": "Вы оценили комментарий!"}
+NO_OBJECTS_FOR_REACTIONS_SUMMARY: dict = {
+    "detail": "Укажите рецепты (recipes) или комментарии (comments)."
+}
 
 # Recipes status
 SUCCESSFUL_APPRECIATED_RECIPE: dict = {"message": "Вы оценили рецепт!"}
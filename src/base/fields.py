@@ -0,0 +1,13 @@
+from rest_framework.serializers import ListField
+
+
+class CommaSeparatedListField(ListField):
+    """
+    List taken from a repeated or comma separated query parameter
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        data = [part for item in data for part in str(item).split(",") if part]
+        return super().to_internal_value(data)
@@ -0,0 +1,11 @@
+class IncludeMixin:
+    """
+    View mixin reading the optional parts of a response asked for with a
+    comma separated `?include=` parameter, e.g. `?include=reactions`
+    """
+
+    include_query_param = "include"
+
+    def includes(self, name: str) -> bool:
+        values = self.request.query_params.get(self.include_query_param, "")
+        return name in values.split(",")
@@ -1,19 +1,298 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from datetime import date, datetime
+from functools import partial
+from hashlib import md5
+from typing import List, Optional, Tuple
+
 from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import F, Q, QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from src.base.code_text import INVALID_CURSOR
+
+
+class KeysetPaginationMixin:
+    """
+    Opt-in keyset (cursor) pagination for page number paginators.
+
+    `?pagination=cursor` switches a request to keyset mode: rows are taken
+    after the last row of the previous page by comparing the compound
+    ordering key, so deep pages cost the same as the first one and no
+    COUNT(*) is run. The `next` link carries an opaque cursor.
+
+    Ordering is taken from the queryset (so OrderingFilter keeps working)
+    and made unique by appending the primary key, unless the last field is
+    already listed in keyset_unique_fields.
+    """
+
+    pagination_query_param = "pagination"
+    cursor_query_param = "cursor"
+    keyset_unique_fields: Tuple[str, ...] = ("pk", "id")
+
+    def use_keyset(self, request) -> bool:
+        return (
+            request.query_params.get(self.pagination_query_param) == "cursor"
+            or self.cursor_query_param in request.query_params
+        )
+
+    def get_keyset_ordering(self, queryset: QuerySet) -> List[str]:
+        ordering = [
+            field
+            for field in queryset.query.order_by or queryset.model._meta.ordering
+            if isinstance(field, str)
+        ] or ["-pk"]
+        if ordering[-1].lstrip("-") not in self.keyset_unique_fields:
+            ordering.append("-pk" if ordering[-1].startswith("-") else "pk")
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = self.get_keyset_ordering(queryset)
+        keys = [f"keyset_{index}" for index in range(len(ordering))]
+
+        queryset = queryset.annotate(
+            **{key: F(field.lstrip("-")) for key, field in zip(keys, ordering)}
+        ).order_by(
+            *[
+                f"-{key}" if field.startswith("-") else key
+                for key, field in zip(keys, ordering)
+            ]
+        )
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            if len(cursor) != len(keys):
+                raise NotFound(INVALID_CURSOR)
+            queryset = queryset.filter(self.keyset_filter(keys, ordering, cursor))
+
+        page = list(queryset[: page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        self.next_cursor = (
+            [getattr(page[-1], key) for key in keys] if self.has_next else None
+        )
+        return page
+
+    @staticmethod
+    def keyset_filter(keys: List[str], ordering: List[str], values: list) -> Q:
+        """
+        Rows strictly after `values` in the compound ordering, written as
+        k0 <= v0 AND (k0 < v0 OR (k1 <= v1 AND (...))) so the leading key
+        stays an index range.
+        """
+
+        condition = None
+        for key, field, value in reversed(list(zip(keys, ordering, values))):
+            after = "lt" if field.startswith("-") else "gt"
+            strictly_after = Q(**{f"{key}__{after}": value})
+            if condition is None:
+                condition = strictly_after
+            else:
+                condition = Q(**{f"{key}__{after}e": value}) & (
+                    strictly_after | condition
+                )
+        return condition
+
+    def decode_cursor(self, request) -> Optional[list]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+        except (BinasciiError, UnicodeError, ValueError):
+            raise NotFound(INVALID_CURSOR)
+        if not isinstance(values, list):
+            raise NotFound(INVALID_CURSOR)
+        return values
+
+    @staticmethod
+    def encode_cursor(values: list) -> str:
+        values = [
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in values
+        ]
+        return b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        url = replace_query_param(url, self.pagination_query_param, "cursor")
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_cursor)
+        )
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+
+class CachedCountPage(Page):
+    """
+    Page that knows whether a next page exists from its own rows instead of
+    comparing its number with a possibly stale count
+    """
 
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
 
-class UserListPagination(PageNumberPagination):
+    def has_next(self):
+        return self._has_next
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator taking the total from the cache, so COUNT(*) runs once per
+    timeout instead of on every request. The count is computed on
+    count_queryset, which the view may strip of annotations and joins.
+    Pages are sliced one row past the page size to keep next links exact.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        count_queryset=None,
+        cache_key=None,
+        cache_alias="default",
+        **kwargs,
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_queryset = (
+            count_queryset if count_queryset is not None else object_list
+        )
+        self.cache_key = cache_key
+        self.cache = caches[cache_alias]
+
+    @cached_property
+    def count(self):
+        count = self.cache.get(self.cache_key) if self.cache_key else None
+        if count is None:
+            count = self.count_queryset.count()
+            if self.cache_key:
+                self.cache.set(
+                    self.cache_key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT
+                )
+        return count
+
+    def validate_number(self, number):
+        """Only reject numbers below 1, the count may lag behind the rows"""
+
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        return CachedCountPage(
+            rows[: self.per_page], number, self, has_next=len(rows) > self.per_page
+        )
+
+
+class CachedCountPaginationMixin:
+    """
+    Page number pagination with a cached, approximate `count`.
+
+    The total is cached in the count_cache_alias cache per path, filter
+    parameters and user for PAGINATION_COUNT_CACHE_TIMEOUT seconds and the
+    response says so with `count_is_approximate`. Views can define
+    get_count_queryset() to count a queryset without the aggregate
+    annotations of the listed one.
+    """
+
+    count_ignored_query_params: Tuple[str, ...] = ("page", "page_size", "ordering")
+    count_per_user = True
+    count_cache_alias = "default"
+
+    def get_count_cache_key(self, request) -> str:
+        params = sorted(
+            (key, value)
+            for key, value in request.query_params.lists()
+            if key not in self.count_ignored_query_params
+        )
+        user_id = (
+            request.user.pk
+            if self.count_per_user and request.user.is_authenticated
+            else None
+        )
+        digest = md5(f"{request.path}|{params}|{user_id}".encode()).hexdigest()
+        return f"paginator:count:{digest}"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        get_count_queryset = getattr(view, "get_count_queryset", None)
+        self.django_paginator_class = partial(
+            CachedCountPaginator,
+            count_queryset=get_count_queryset() if get_count_queryset else None,
+            cache_key=self.get_count_cache_key(request),
+            cache_alias=self.count_cache_alias,
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if "count" in response.data:
+            response.data["count_is_approximate"] = True
+        return response
+
+
+class UserListPagination(
+    KeysetPaginationMixin, CachedCountPaginationMixin, PageNumberPagination
+):
     page_size = settings.USER_LIST_PAGE_SIZE
     page_size_query_param = "page_size"
+    count_per_user = False
+    count_cache_alias = "users"
+
+
+class FeedPagination(
+    KeysetPaginationMixin, CachedCountPaginationMixin, PageNumberPagination
+):
+    page_size = settings.FEED_PAGE_SIZE
+    keyset_unique_fields = ("pk", "id", "stats__recipe", "timeline_entries__recipe")
+    count_cache_alias = "feed"
+
+
+class FavoritePagination(PageNumberPagination):
+    page_size = settings.FEED_PAGE_SIZE
 
 
-class FeedPagination(PageNumberPagination):
+class SearchPagination(PageNumberPagination):
     page_size = settings.FEED_PAGE_SIZE
 
 
-class FollowerPagination(PageNumberPagination):
+class FollowerPagination(KeysetPaginationMixin, PageNumberPagination):
     page_size = settings.FOLLOWER_PAGE_SIZE
 
 
-class CommentPagination(PageNumberPagination):
+class CommentPagination(KeysetPaginationMixin, PageNumberPagination):
     page_size = settings.COMMENT_PAGE_SIZE
@@ -1,21 +1,22 @@
-from datetime import timedelta
-from typing import List, Any, Set
+from typing import Dict, List, Any, Set
 
 from random import sample
 from typing import Type
 
-from django.contrib.contenttypes.models import ContentType
 from rest_framework.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Count, Model
-from django.http import HttpRequest
-from django.utils import timezone
-from django.utils.text import slugify
+from django.db.models import Model
 from django.utils.translation import gettext_lazy as _
-from unidecode import unidecode
 
 from django.conf import settings
-from src.apps.ingredients.models import Ingredient, Unit, IngredientInRecipe
+from src.apps.ingredients.dictionary import ingredient_dictionary, unit_dictionary
+from src.apps.ingredients.models import IngredientInRecipe
+from src.apps.reactions.histogram import (
+    get_reaction_histogram,
+    get_reaction_histograms,
+)
+from src.apps.reactions.models import Reaction
+from src.apps.reactions.registry import reaction_content_type_id
 from src.base.code_text import (
     CANT_ADD_TWO_SIMILAR_INGREDIENT,
 )
@@ -53,131 +54,67 @@ def shorten_text(full_text: str, n: int) -> str:
     return short_text
 
 
-def bulk_get_or_create(
-    model: Type[Model], objs: List[Model], match_field: str
-) -> List[Model]:
-    """
-    Bulk get or create objects
-    """
-
-    match_values: List[Any] = [getattr(obj, match_field) for obj in objs]
-    existing_objs: List[Model] = model.objects.filter(
-        **{f"{match_field}__in": match_values}
-    )
-
-    existing_map: dict = {getattr(obj, match_field): obj for obj in existing_objs}
-
-    objs_to_create: List[Model] = [
-        obj for obj in objs if getattr(obj, match_field) not in existing_map
-    ]
-
-    created_objs: List[Model] = model.objects.bulk_create(objs_to_create)
-    existing_map.update({getattr(obj, match_field): obj for obj in created_objs})
-    return [existing_map[value] for value in match_values]
-
-
 def create_ingredients_in_recipe(
-    recipe: Model, ingredients_data: List[dict]
+    recipe: Model, ingredients_data: List[dict], replace: bool = False
 ) -> List[Model]:
     """
-    Create or update ingredients in recipe
+    Create ingredients in recipe, replacing the ones it had when replace is
+    set. The number of queries does not depend on the number of ingredients:
+
+    • ingredient and unit ids come from the in-memory dictionaries, names
+      they do not know yet cost an INSERT ... ON CONFLICT DO NOTHING and a
+      SELECT per model, 4 queries at most;
+    • 1 INSERT of ingredients in recipe;
+    • 1 INSERT of the recipe.ingredients links;
+    • on replace, 3 more: SELECT of the old rows, DELETE of their links and
+      DELETE of the rows.
     """
 
     ingredient_names: List[str] = [data["name"] for data in ingredients_data]
     if len(ingredient_names) != len(set(ingredient_names)):
         raise ValidationError(CANT_ADD_TWO_SIMILAR_INGREDIENT, code="unique_ingredient")
-
-    existing_ingredients: List[IngredientInRecipe] = IngredientInRecipe.objects.filter(
-        recipe=recipe
-    )
-    existing_ingredient_names: Set = set(
-        existing_ingredients.values_list("ingredient__name", flat=True)
-    )
-
-    ingredients_to_remove: Set = existing_ingredient_names - set(ingredient_names)
-    existing_ingredients.filter(ingredient__name__in=ingredients_to_remove).delete()
-
-    existing_ingredients: List[str] = IngredientInRecipe.objects.filter(
-        recipe=recipe, ingredient__name__in=ingredient_names
-    ).values_list("ingredient__name", flat=True)
-
-    new_ingredients: List[dict] = [
-        data for data in ingredients_data if data["name"] not in existing_ingredients
-    ]
-
-    ingredient_objs: List[Ingredient] = [
-        Ingredient(name=data["name"]) for data in new_ingredients
-    ]
-    unit_names: Set[str] = {data["unit"] for data in new_ingredients}
-    unit_objs: List[Unit] = [Unit(name=name) for name in unit_names]
+    unit_names: Set[str] = {data["unit"] for data in ingredients_data}
 
     with transaction.atomic():
-        ingredients: dict = {
-            ingredient.name: ingredient
-            for ingredient in bulk_get_or_create(Ingredient, ingredient_objs, "name")
-        }
-        units: dict = {
-            unit.name: unit for unit in bulk_get_or_create(Unit, unit_objs, "name")
-        }
+        if replace:
+            IngredientInRecipe.objects.filter(recipe=recipe).delete()
 
-    ingredients_in_recipe_objs: List[IngredientInRecipe] = [
-        IngredientInRecipe(
-            recipe=recipe,
-            ingredient=ingredients[ingredient_data["name"]],
-            unit=units[ingredient_data["unit"]],
-            amount=ingredient_data["amount"],
+        ingredient_ids: Dict[str, int] = ingredient_dictionary.get_ids(
+            ingredient_names
         )
-        for ingredient_data in new_ingredients
-    ]
-    IngredientInRecipe.objects.bulk_create(ingredients_in_recipe_objs)
-    return IngredientInRecipe.objects.filter(recipe=recipe)
-
-
-def increment_view_count(
-    model: Type[Model], recipe: Model, request: HttpRequest
-) -> None:
-    """Increment view count"""
-
-    user_id: str = (
-        request.user
-        if request.user.is_authenticated
-        else f"Anonymous-{request.META.get('REMOTE_ADDR')}"
-    )
-    time_threshold: timezone.datetime = timezone.now() - timedelta(
-        minutes=settings.TIME_FROM_VIEW_RECIPE
-    )
-
-    view_exists: bool = model.objects.filter(
-        user=user_id, recipe=recipe, created_at__gte=time_threshold
-    ).exists()
-
-    if not view_exists:
-        model.objects.create(user=user_id, recipe=recipe)
-
-
-def create_recipe_slug(model: Type[Model], data: dict, num: int = 1) -> dict:
-    """Create recipe slug"""
-
-    with transaction.atomic():
-        same_recipes: int = model.objects.filter(
-            title__startswith=data["title"]
-        ).count()
-        slug_str: str = unidecode(
-            f"{data['title']}_{same_recipes + num}" if same_recipes else data["title"]
+        unit_ids: Dict[str, int] = unit_dictionary.get_ids(unit_names)
+
+        ingredients_in_recipe: List[IngredientInRecipe] = (
+            IngredientInRecipe.objects.bulk_create(
+                [
+                    IngredientInRecipe(
+                        recipe=recipe,
+                        ingredient_id=ingredient_ids[data["name"]],
+                        unit_id=unit_ids[data["unit"]],
+                        amount=data["amount"],
+                    )
+                    for data in ingredients_data
+                ]
+            )
         )
-        data["slug"]: str = slugify(slug_str)
-
-        if model.objects.filter(slug=data["slug"]).exists():
-            num += 1
-            create_recipe_slug(model, data, num)
-
-    return data
+        # recipe.ingredients.set() would query the links it already has
+        links = recipe.ingredients.through
+        links.objects.bulk_create(
+            [
+                links(recipe_id=recipe.id, ingredientinrecipe_id=ingredient.id)
+                for ingredient in ingredients_in_recipe
+            ]
+        )
+    return ingredients_in_recipe
 
 
 def generate_username(user_id: int, model: Type[Model]) -> str:
     """
     Generate a unique username for a user.
 
+    `user<id>` and 100 random candidates are checked with one query, the
+    first free one is returned.
+
     Args:
         user_id (int): The ID of the user.
         model (Type[CustomUser]): The CustomUser model class.
@@ -186,30 +123,25 @@ def generate_username(user_id: int, model: Type[Model]) -> str:
         str: A unique username for the user.
     """
 
-    base_username: str = f"user{user_id}"
-
-    if not model.objects.filter(username=base_username).exists():
-        return base_username
-    else:
-
-        random_numbers = sample(range(100000, 1000000), 100)
-        for random_number in random_numbers:
-            new_username = f"user{random_number}"
-            if not model.objects.filter(username=new_username).exists():
-                return new_username
+    candidates: List[str] = [f"user{user_id}"] + [
+        f"user{random_number}" for random_number in sample(range(100000, 1000000), 100)
+    ]
+    taken: Set[str] = set(
+        model.objects.filter(username__in=candidates).values_list(
+            "username", flat=True
+        )
+    )
+    for candidate in candidates:
+        if candidate not in taken:
+            return candidate
 
-        return generate_username(user_id, model)
+    return generate_username(user_id, model)
 
 
 def count_reactions_on_objects(instance: Model) -> dict:
-    """Count reactions made on an object by their emoji"""
+    """Count reactions made on an object by their emoji, from the cache"""
 
-    reactions_queryset = (
-        instance.reactions.values("emoji")
-        .filter(is_deleted=False)
-        .annotate(count=Count("emoji"))
-    )
-    return {reaction["emoji"]: reaction["count"] for reaction in reactions_queryset}
+    return get_reaction_histogram(reaction_content_type_id(instance), instance.id)
 
 
 def show_user_reactions(user: Model, instance: Model) -> list:
@@ -217,8 +149,8 @@ def show_user_reactions(user: Model, instance: Model) -> list:
 
     user_reactions = list()
     if user.is_authenticated:
-        user_reactions_query = instance.reactions.filter(
-            content_type=ContentType.objects.get_for_model(instance),
+        user_reactions_query = Reaction.objects.filter(
+            content_type_id=reaction_content_type_id(instance),
             object_id=instance.id,
             author=user,
         ).only("emoji", "id")
@@ -230,6 +162,43 @@ def show_user_reactions(user: Model, instance: Model) -> list:
     return user_reactions
 
 
+def summarize_reactions_on_objects(
+    model: Type[Model], object_ids: List[int], user: Model
+) -> Dict[int, dict]:
+    """
+    Reactions by emoji and reactions of the current user for many objects of
+    one model, in one grouped query for histograms missing from the cache and
+    one query for the user's reactions
+    """
+
+    content_type_id: int = reaction_content_type_id(model)
+    histograms = get_reaction_histograms(content_type_id, object_ids)
+    user_reactions: Dict[int, list] = {object_id: [] for object_id in object_ids}
+
+    if user.is_authenticated and object_ids:
+        user_reactions_query = (
+            Reaction.objects.filter(
+                content_type_id=content_type_id,
+                object_id__in=object_ids,
+                author=user,
+            )
+            .only("emoji", "id", "object_id")
+            .order_by("object_id", "emoji")
+        )
+        for reaction in user_reactions_query:
+            user_reactions[reaction.object_id].append(
+                {"type": reaction.emoji, "id": reaction.id}
+            )
+
+    return {
+        object_id: {
+            "reactions": histograms[object_id],
+            "user_reactions": user_reactions[object_id],
+        }
+        for object_id in object_ids
+    }
+
+
 def get_or_none(instance: Model, **kwargs):
     """Return an object if exists or None if does not exist"""
 
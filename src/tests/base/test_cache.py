@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.cache import cache, caches
+
+from src.base.cache import feed_cache, reactions_cache
+
+
+class TestCacheNamespaces:
+    """
+    Tests for per app cache aliases
+    """
+
+    def test_every_app_has_an_alias(self):
+        assert {"default", "feed", "reactions", "users"} <= set(settings.CACHES)
+
+    def test_aliases_do_not_share_keys(self):
+        """
+        The same key in different namespaces keeps different values
+        """
+
+        for value, app_cache in enumerate(
+            (cache, feed_cache, reactions_cache, caches["users"])
+        ):
+            app_cache.set("key", value)
+
+        assert [
+            app_cache.get("key")
+            for app_cache in (cache, feed_cache, reactions_cache, caches["users"])
+        ] == [0, 1, 2, 3]
+
+        feed_cache.clear()
+        assert feed_cache.get("key") is None
+        assert reactions_cache.get("key") == 2
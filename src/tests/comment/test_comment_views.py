@@ -1,5 +1,7 @@
 import datetime
 import pytest
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.utils import dateparse
 from collections import OrderedDict
 
@@ -13,6 +15,8 @@ from src.base.code_text import (
     COMMENT_SUCCESSFULLY_DELETE,
 )
 from src.apps.comments.models import Comment
+from src.apps.reactions.choices import EmojyChoice
+from src.apps.reactions.models import Reaction
 from unittest import mock
 
 
@@ -23,6 +27,66 @@ class TestCommentUrls:
     Test comment urls
     """
 
+    def test_list_comments_cursor_pagination(self, client, new_user, new_recipe):
+        """
+        Test for cursor pagination of comments
+        [GET] http://127.0.0.1:8000/api/v1/recipe/{slug}/comments/?pagination=cursor
+        """
+
+        comments_num = settings.COMMENT_PAGE_SIZE + 3
+        Comment.objects.bulk_create(
+            Comment(author=new_user, recipe=new_recipe, text=f"comment {i}")
+            for i in range(comments_num)
+        )
+
+        next_page_url = f"/api/v1/recipe/{new_recipe.slug}/comments/?pagination=cursor"
+        seen_ids = []
+        while next_page_url:
+            response = client.get(next_page_url)
+            assert response.status_code == 200
+            seen_ids += [comment["id"] for comment in response.data["results"]]
+            next_page_url = response.data["next"]
+
+        assert len(set(seen_ids)) == comments_num
+
+    def test_list_comments_include_reactions(
+        self, api_client, new_user, new_author, new_recipe
+    ):
+        """
+        Test for reactions of every comment of the page
+        [GET] http://127.0.0.1:8000/api/v1/recipe/{slug}/comments/?include=reactions
+        """
+
+        comments = Comment.objects.bulk_create(
+            Comment(author=new_author, recipe=new_recipe, text=f"comment {i}")
+            for i in range(3)
+        )
+        reaction = Reaction.objects.create(
+            author=new_user,
+            object_id=comments[0].id,
+            content_type=ContentType.objects.get_for_model(Comment),
+            emoji=EmojyChoice.HEART,
+        )
+
+        api_client.force_authenticate(user=new_user)
+        response = api_client.get(
+            f"/api/v1/recipe/{new_recipe.slug}/comments/?include=reactions"
+        )
+
+        assert response.status_code == 200
+        summaries = {
+            comment["id"]: (comment["reactions"], comment["user_reactions"])
+            for comment in response.data["results"]
+        }
+        assert summaries == {
+            comments[0].id: (
+                {EmojyChoice.HEART: 1},
+                [{"type": EmojyChoice.HEART, "id": reaction.id}],
+            ),
+            comments[1].id: ({}, []),
+            comments[2].id: ({}, []),
+        }
+
     def test_list_comments(self, client, new_comment, new_recipe):
         """
         Test for list of comments page
@@ -1,12 +1,18 @@
 import pytest
+from django.conf import settings
+from django.core.cache import caches
 from django.core.management import call_command
 from django.utils import timezone
 from django.utils.text import slugify
 from rest_framework.test import APIClient
 
 from src.apps.comments.models import Comment
+from src.apps.ingredients.dictionary import ingredient_dictionary, unit_dictionary
 from src.apps.ingredients.models import Ingredient, Unit, IngredientInRecipe
+from src.apps.ingredients.suggest import ingredient_suggestions
 from src.apps.recipes.models import Recipe, Category
+from src.apps.search.facets import recipe_facets
+from src.apps.search.matching import recipe_matches
 
 
 @pytest.fixture(scope="session")
@@ -19,6 +25,43 @@ def django_db_setup(django_db_setup, django_db_blocker):
         call_command("migrate")
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    The test caches and the in-memory ingredient dictionaries, suggestions,
+    recipe facets and matches outlive a test, start every test with empty
+    ones
+    """
+
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    ingredient_dictionary.clear()
+    unit_dictionary.clear()
+    ingredient_suggestions.clear()
+    recipe_facets.clear()
+    recipe_matches.clear()
+
+
+@pytest.fixture(params=["atomic", "file_based"])
+def cache_backend(request, settings, tmp_path):
+    """
+    Run the test on the atomic test caches and again on the file based
+    caches production falls back to without REDIS_URL, which are not atomic
+    """
+
+    if request.param == "file_based":
+        settings.CACHES = {
+            alias: {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path / alias),
+                "KEY_PREFIX": alias,
+                "OPTIONS": {"MAX_ENTRIES": 100_000},
+            }
+            for alias in settings.CACHE_ALIASES
+        }
+    return request.param
+
+
 @pytest.fixture
 def api_client():
     """
@@ -189,6 +232,26 @@ def recipe_data(category_1, category_2, category_3):
     }
 
 
+@pytest.fixture
+def create_recipe(api_client, new_author, recipe_data, django_capture_on_commit_callbacks):
+    """
+    Create a recipe of recipe_data with the given fields replaced through the
+    API and run its on commit callbacks, e.g. search indexing
+    """
+
+    api_client.force_authenticate(user=new_author)
+
+    def create(**fields):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                "/api/v1/recipe/", {**recipe_data, **fields}, format="json"
+            )
+        assert response.status_code == 201
+        return Recipe.objects.get(slug=response.data["slug"])
+
+    return create
+
+
 @pytest.fixture(scope="function")
 def new_comment(new_user, new_recipe):
     """
@@ -1,5 +1,8 @@
 import pytest
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from src.apps.recipes.models import Recipe
 
@@ -52,3 +55,108 @@ class TestFeedPagination:
             next_page_url = response.data["next"]
             assert next_page_url is None
             assert len(response.data["results"]) == recipes_to_see
+
+    @pytest.mark.parametrize("ordering", ["", "-activity_count", "activity_count"])
+    def test_feed_cursor_pagination(self, api_client, new_user, ordering):
+        """
+        Cursor pagination walks every recipe once, also on equal sort keys
+        """
+
+        recipes_num = self.page_size * 2 + 2
+        pub_date = timezone.now()
+        for i in range(recipes_num):
+            Recipe.objects.create(
+                author=new_user,
+                title=f"recipe_{i}",
+                slug=f"recipe_{i}",
+                full_text="recipe full text",
+                cooking_time=10,
+            )
+        Recipe.objects.update(pub_date=pub_date)
+
+        next_page_url = f"/api/v1/feed/?pagination=cursor&ordering={ordering}"
+        seen_ids = []
+        while next_page_url:
+            response = api_client.get(next_page_url)
+            assert response.status_code == 200
+            assert "count" not in response.data
+            assert len(response.data["results"]) <= self.page_size
+            seen_ids += [recipe["id"] for recipe in response.data["results"]]
+            next_page_url = response.data["next"]
+
+        expected_ids = sorted(seen_ids, reverse=ordering != "activity_count")
+        assert seen_ids == expected_ids
+        assert len(set(seen_ids)) == recipes_num
+
+    def test_feed_invalid_cursor(self, api_client):
+        """
+        Malformed cursor returns 404
+        """
+
+        response = api_client.get("/api/v1/feed/?cursor=not-a-cursor")
+        assert response.status_code == 404
+
+
+@pytest.mark.feed
+@pytest.mark.api
+@pytest.mark.django_db
+class TestFeedCachedCount:
+    """
+    Test cached total of the feed
+    """
+
+    def create_recipes(self, author, recipes_num, start=0):
+        for i in range(start, start + recipes_num):
+            Recipe.objects.create(
+                author=author,
+                title=f"recipe_{i}",
+                slug=f"recipe_{i}",
+                full_text="recipe full text",
+                cooking_time=10,
+            )
+
+    def test_count_is_cached(self, api_client, new_user):
+        """
+        The total is counted once and marked as approximate
+        """
+
+        self.create_recipes(new_user, settings.FEED_PAGE_SIZE + 1)
+
+        response = api_client.get("/api/v1/feed/")
+        assert response.data["count"] == settings.FEED_PAGE_SIZE + 1
+        assert response.data["count_is_approximate"] is True
+
+        self.create_recipes(new_user, settings.FEED_PAGE_SIZE, start=100)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/api/v1/feed/?page=2")
+        assert not [q for q in queries if "COUNT(" in q["sql"]]
+        assert response.data["count"] == settings.FEED_PAGE_SIZE + 1
+        assert len(response.data["results"]) == settings.FEED_PAGE_SIZE
+        assert response.data["next"] is not None
+
+        response = api_client.get(response.data["next"])
+        assert len(response.data["results"]) == 1
+        assert response.data["next"] is None
+
+    def test_count_cached_per_filter(self, api_client, new_user, new_author):
+        """
+        Filtered lists keep their own total
+        """
+
+        self.create_recipes(new_user, 2)
+        self.create_recipes(new_author, 3, start=10)
+
+        assert api_client.get("/api/v1/feed/").data["count"] == 5
+        response = api_client.get(f"/api/v1/feed/?username={new_author.username}")
+        assert response.data["count"] == 3
+
+    def test_page_after_count(self, api_client, new_user):
+        """
+        Pages past the rows are not found
+        """
+
+        self.create_recipes(new_user, 1)
+
+        response = api_client.get("/api/v1/feed/?page=2")
+        assert response.status_code == 404
@@ -0,0 +1,127 @@
+import threading
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from src.apps.feed import response_cache
+from src.apps.recipes.models import Recipe
+
+
+@pytest.mark.feed
+@pytest.mark.api
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cache_backend")
+class TestFeedResponseCache:
+    """
+    Test cached responses of the anonymous feed
+    """
+
+    def create_recipe(self, author, title):
+        return Recipe.objects.create(
+            author=author, title=title, slug=title, full_text="text", cooking_time=10
+        )
+
+    def titles(self, response):
+        return [recipe["title"] for recipe in response.data["results"]]
+
+    def test_anonymous_feed_is_cached(self, api_client, new_user):
+        """
+        A cached page is served without queries, authenticated users skip it
+        """
+
+        self.create_recipe(new_user, "first")
+        api_client.get("/api/v1/feed/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/api/v1/feed/")
+        assert self.titles(response) == ["first"]
+        assert len(queries) == 0
+
+        Recipe.objects.update(title="renamed")
+        assert self.titles(api_client.get("/api/v1/feed/")) == ["first"]
+
+        api_client.force_authenticate(user=new_user)
+        assert self.titles(api_client.get("/api/v1/feed/")) == ["renamed"]
+
+    def test_unknown_params_share_the_entry(self, api_client, new_user):
+        """
+        Parameters outside the key do not make new entries
+        """
+
+        self.create_recipe(new_user, "first")
+        api_client.get("/api/v1/feed/?page=1&x=1")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/api/v1/feed/?x=2&page=1")
+        assert self.titles(response) == ["first"]
+        assert len(queries) == 0
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get("/api/v1/feed/?ordering=-activity_count")
+        assert len(queries) > 0
+
+    def test_recipe_changes_invalidate(
+        self, api_client, new_user, new_author, django_capture_on_commit_callbacks
+    ):
+        """
+        Saving a recipe drops the feed and its author's pages only
+        """
+
+        recipe = self.create_recipe(new_user, "user-recipe")
+        self.create_recipe(new_author, "author-recipe")
+        user_url = f"/api/v1/feed/?username={new_user.username}"
+        author_url = f"/api/v1/feed/?username={new_author.username}"
+        for url in ("/api/v1/feed/", user_url, author_url):
+            api_client.get(url)
+
+        Recipe.objects.filter(author=new_author).update(title="author-renamed")
+        with django_capture_on_commit_callbacks(execute=True):
+            recipe.title = "user-renamed"
+            recipe.save()
+
+        assert self.titles(api_client.get("/api/v1/feed/")) == [
+            "author-renamed",
+            "user-renamed",
+        ]
+        assert self.titles(api_client.get(user_url)) == ["user-renamed"]
+        assert self.titles(api_client.get(author_url)) == ["author-recipe"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            recipe.delete()
+        assert self.titles(api_client.get(user_url)) == []
+
+    def test_cold_key_computed_once(self, rf):
+        """
+        Requests waiting for the lock get the response of its holder
+        """
+
+        request = Request(rf.get("/api/v1/feed/"))
+
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow_compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return Response({"results": []})
+
+        def first_request():
+            response_cache.cached_feed_response(request, slow_compute)
+
+        thread = threading.Thread(target=first_request)
+        thread.start()
+        started.wait(5)
+
+        with mock.patch.object(response_cache, "LOCK_POLL_INTERVAL", 0.01):
+            timer = threading.Timer(0.1, release.set)
+            timer.start()
+            response = response_cache.cached_feed_response(request, slow_compute)
+        thread.join()
+
+        assert response.data == {"results": []}
+        assert len(calls) == 1
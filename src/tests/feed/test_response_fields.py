@@ -1,5 +1,8 @@
 import pytest
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from src.apps.reactions.choices import EmojyChoice
 from src.apps.reactions.models import Reaction
@@ -66,3 +69,50 @@ class TestFeedResponseFields:
         api_client.force_authenticate(user=new_user)
         response = api_client.get(url)
         assert response.data["results"][0]["is_favorite"] == True
+
+    def test_include_reactions(self, new_user, new_author, api_client):
+        """
+        include=reactions adds reactions by emoji and the viewer's reactions
+        to every post, with the same queries for any page size
+        """
+
+        content_type = ContentType.objects.get_for_model(Recipe)
+        recipes = [
+            Recipe.objects.create(
+                author=new_author,
+                title=f"Recipe {i}",
+                slug=f"recipe-{i}",
+                full_text="recipe full text",
+                cooking_time=10,
+            )
+            for i in range(settings.FEED_PAGE_SIZE)
+        ]
+        own = {
+            recipe.id: Reaction.objects.create(
+                author=new_user,
+                object_id=recipe.id,
+                content_type=content_type,
+                emoji=EmojyChoice.FIRE,
+            )
+            for recipe in recipes
+        }
+        Reaction.objects.create(
+            author=new_author, object_id=recipes[0].id, content_type=content_type
+        )
+
+        response = api_client.get("/api/v1/feed/")
+        assert "reactions" not in response.data["results"][0]
+
+        api_client.force_authenticate(user=new_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get("/api/v1/feed/?include=reactions")
+        assert len([q for q in queries if "reactions_reaction" in q["sql"]]) == 2
+
+        for item in response.data["results"]:
+            expected = {EmojyChoice.FIRE: 1}
+            if item["id"] == recipes[0].id:
+                expected[EmojyChoice.LIKE] = 1
+            assert item["reactions"] == expected
+            assert item["user_reactions"] == [
+                {"type": EmojyChoice.FIRE, "id": own[item["id"]].id}
+            ]
@@ -0,0 +1,237 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.feed.models import MergedAuthor, TimelineEntry
+from src.apps.feed.timeline import POPULAR_AUTHORS_KEY, timeline_metrics
+from src.base.cache import feed_cache
+from src.apps.recipes.models import Recipe
+from src.tests.factories.factories import FollowFactory, RecipeFactory, UserFactory
+
+
+@pytest.mark.feed
+@pytest.mark.api
+@pytest.mark.django_db
+class TestSubscriptionTimeline:
+    """
+    Test subscriptions feed read from the fan-out timeline
+    """
+
+    url = "/api/v1/feed/?filter=subscriptions"
+
+    def test_subscribe_backfills_timeline(self, api_client, new_user, new_author):
+        """
+        Recipes published before the subscription show up in the feed
+        """
+
+        recipes = RecipeFactory.create_batch(3, author=new_author)
+        api_client.force_authenticate(user=new_user)
+        api_client.post(
+            "/api/v1/subscribe/", data={"author": new_author.username}, format="json"
+        )
+
+        response = api_client.get(self.url)
+
+        assert [r["slug"] for r in response.data["results"]] == [
+            recipe.slug for recipe in reversed(recipes)
+        ]
+
+    def test_created_recipe_fans_out(
+        self, api_client, new_user, new_author, recipe_data
+    ):
+        """
+        Recipe created through the API reaches every follower of its author
+        """
+
+        other_follower = UserFactory()
+        FollowFactory(user=new_user, author=new_author)
+        FollowFactory(user=other_follower, author=new_author)
+
+        api_client.force_authenticate(user=new_author)
+        api_client.post("/api/v1/recipe/", recipe_data, format="json")
+        recipe = Recipe.objects.get(author=new_author)
+
+        assert set(
+            TimelineEntry.objects.filter(recipe=recipe).values_list(
+                "user_id", flat=True
+            )
+        ) == {new_user.id, other_follower.id}
+
+    def test_unsubscribe_drops_timeline(self, api_client, new_user, new_author):
+        """
+        Recipes of an author leave the feed once the user unsubscribes
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        RecipeFactory(author=new_author)
+        api_client.force_authenticate(user=new_user)
+        api_client.delete(
+            "/api/v1/unsubscribe/", data={"author": new_author.username}, format="json"
+        )
+
+        assert api_client.get(self.url).data["results"] == []
+        assert not TimelineEntry.objects.exists()
+
+    def test_subscriptions_read_timeline(self, api_client, new_user, new_author):
+        """
+        The feed query walks the timeline of the user, not the follow table
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        RecipeFactory(author=new_author)
+        api_client.force_authenticate(user=new_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(self.url)
+
+        feed_query = next(
+            query["sql"] for query in queries if "recipes_recipe" in query["sql"]
+        )
+        assert "feed_timelineentry" in feed_query
+        assert "follow_follow" not in feed_query
+        assert 'ORDER BY "feed_timelineentry"."pub_date" DESC' in feed_query
+
+    def test_subscriptions_cursor_pagination(self, api_client, new_user):
+        """
+        Cursor pages of the timeline return every recipe once, newest first
+        """
+
+        authors = UserFactory.create_batch(3)
+        for author in authors:
+            FollowFactory(user=new_user, author=author)
+        recipes = [RecipeFactory(author=author) for _ in range(4) for author in authors]
+        RecipeFactory()
+        api_client.force_authenticate(user=new_user)
+
+        seen, url = [], f"{self.url}&pagination=cursor"
+        while url:
+            response = api_client.get(url)
+            seen.extend(r["slug"] for r in response.data["results"])
+            url = response.data["next"]
+
+        assert seen == [recipe.slug for recipe in reversed(recipes)]
+
+    def test_rebuild_timelines(self, new_user, new_author):
+        """
+        Rebuild refills the timeline from follows
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        RecipeFactory.create_batch(2, author=new_author)
+        TimelineEntry.objects.all().delete()
+
+        call_command("rebuild_timelines")
+
+        assert TimelineEntry.objects.filter(user=new_user).count() == 2
+
+
+@pytest.mark.feed
+@pytest.mark.api
+@pytest.mark.django_db
+class TestHybridTimeline:
+    """
+    Test popular authors merged into the subscriptions feed at read time
+    """
+
+    url = "/api/v1/feed/?filter=subscriptions"
+
+    @pytest.fixture(autouse=True)
+    def low_threshold(self, settings):
+        settings.TIMELINE_FANOUT_MAX_FOLLOWERS = 1
+
+    def test_popular_author_is_not_fanned_out(self, new_user, new_author):
+        """
+        Recipes of authors above the threshold are not written to timelines
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        FollowFactory(author=new_author)
+        feed_cache.delete(POPULAR_AUTHORS_KEY)
+        RecipeFactory(author=new_author)
+
+        assert not TimelineEntry.objects.exists()
+        assert timeline_metrics()["fanout_skipped"] == 1
+
+    def test_popular_author_is_merged(self, api_client, new_user, new_author):
+        """
+        The feed merges popular authors with the timeline, newest first
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        FollowFactory(author=new_author)
+        regular_author = UserFactory()
+        FollowFactory(user=new_user, author=regular_author)
+        feed_cache.delete(POPULAR_AUTHORS_KEY)
+        recipes = [
+            RecipeFactory(author=author)
+            for _ in range(3)
+            for author in (new_author, regular_author)
+        ]
+        RecipeFactory()
+        api_client.force_authenticate(user=new_user)
+
+        seen, url = [], f"{self.url}&pagination=cursor"
+        while url:
+            response = api_client.get(url)
+            seen.extend(r["slug"] for r in response.data["results"])
+            url = response.data["next"]
+
+        assert seen == [recipe.slug for recipe in reversed(recipes)]
+        assert TimelineEntry.objects.count() == 3
+        metrics = timeline_metrics()
+        assert metrics["merged_reads"] == 2
+        assert metrics["merged_authors"] == 2
+        assert metrics["merged_rows"] == 3
+        assert metrics["fanout_entries"] == 3
+
+    def test_author_below_threshold_stays_merged(
+        self, api_client, new_user, new_author
+    ):
+        """
+        Recipes left out of timelines stay in the feed after the author
+        drops below the threshold, until the backfill command writes them
+        """
+
+        follow = FollowFactory(user=new_user, author=new_author)
+        other_follow = FollowFactory(author=new_author)
+        feed_cache.delete(POPULAR_AUTHORS_KEY)
+        recipes = RecipeFactory.create_batch(2, author=new_author)
+        assert MergedAuthor.objects.filter(author=new_author).exists()
+
+        other_follow.delete()
+        feed_cache.delete(POPULAR_AUTHORS_KEY)
+        api_client.force_authenticate(user=new_user)
+
+        response = api_client.get(self.url)
+        assert [r["slug"] for r in response.data["results"]] == [
+            recipe.slug for recipe in reversed(recipes)
+        ]
+
+        call_command("backfill_merged_authors")
+
+        assert not MergedAuthor.objects.exists()
+        assert set(
+            TimelineEntry.objects.values_list("user_id", "recipe_id")
+        ) == {(follow.user_id, recipe.id) for recipe in recipes}
+        assert timeline_metrics()["merged_reads"] == 1
+        response = api_client.get(self.url)
+        assert [r["slug"] for r in response.data["results"]] == [
+            recipe.slug for recipe in reversed(recipes)
+        ]
+        assert timeline_metrics()["timeline_reads"] == 1
+
+    def test_timeline_metrics_command(self, new_user, new_author, capsys):
+        """
+        The command reports the threshold and the popular authors
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        FollowFactory(author=new_author)
+        feed_cache.delete(POPULAR_AUTHORS_KEY)
+
+        call_command("timeline_metrics")
+        out = capsys.readouterr().out
+
+        assert "fanout_max_followers: 1" in out
+        assert "popular_authors: 1" in out
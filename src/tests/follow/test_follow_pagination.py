@@ -29,3 +29,21 @@ class TestFollowPagination:
             )
             next_page_url = response.data["next"]
             subscriptions_num -= TestFollowPagination.page_size
+
+    def test_follow_cursor_pagination(self, api_client, new_user):
+        """
+        Cursor pagination of subscriptions returns every subscription once
+        """
+
+        subscriptions_num = TestFollowPagination.page_size * 2 + 1
+        FollowFactory.create_batch(subscriptions_num, user=new_user)
+
+        next_page_url = f"/api/v1/user/{new_user}/subscriptions/?pagination=cursor"
+        api_client.force_authenticate(user=new_user)
+        seen_ids = []
+        while next_page_url:
+            response = api_client.get(next_page_url)
+            seen_ids += [follow["id"] for follow in response.data["results"]]
+            next_page_url = response.data["next"]
+
+        assert len(seen_ids) == len(set(seen_ids)) == subscriptions_num
@@ -0,0 +1,119 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.base.code_text import NO_USERS_FOR_FOLLOW_STATUS
+from src.tests.factories.factories import FollowFactory, RecipeFactory, UserFactory
+
+URL = "/api/v1/follow-status/"
+
+
+@pytest.mark.follow
+@pytest.mark.api
+@pytest.mark.django_db
+class TestFollowStatus:
+    """
+    Test batch follow status lookup and `?include=follow_status`
+    """
+
+    def test_follow_status_by_usernames_and_ids(self, api_client, new_user):
+        """
+        Flags are returned for known users, looked up by username or id
+        """
+
+        followed, follower = UserFactory.create_batch(2)
+        FollowFactory(user=new_user, author=followed)
+        FollowFactory(user=follower, author=new_user)
+        api_client.force_authenticate(user=new_user)
+
+        response = api_client.get(
+            URL, {"usernames": f"{followed.username},unknown", "ids": [follower.id]}
+        )
+
+        assert response.status_code == 200
+        assert response.data["results"] == [
+            {
+                "id": followed.id,
+                "username": followed.username,
+                "is_follow": True,
+                "is_follower": False,
+            },
+            {
+                "id": follower.id,
+                "username": follower.username,
+                "is_follow": False,
+                "is_follower": True,
+            },
+        ]
+
+    def test_follow_status_in_one_query(self, api_client, new_user):
+        """
+        Follow table is queried once for the whole batch
+        """
+
+        users = UserFactory.create_batch(20)
+        for user in users[::2]:
+            FollowFactory(user=new_user, author=user)
+        api_client.force_authenticate(user=new_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                URL, {"ids": ",".join(str(user.id) for user in users)}
+            )
+
+        assert len(response.data["results"]) == 20
+        assert len([q for q in queries if "follow_follow" in q["sql"]]) == 1
+
+    def test_follow_status_validation(self, api_client, new_user):
+        """
+        Empty and oversized batches are rejected
+        """
+
+        api_client.force_authenticate(user=new_user)
+
+        response = api_client.get(URL)
+        assert response.status_code == 400
+        assert response.data["detail"][0] == NO_USERS_FOR_FOLLOW_STATUS["detail"]
+
+        ids = ",".join(str(i) for i in range(1, settings.FOLLOW_STATUS_MAX_USERS + 2))
+        assert api_client.get(URL, {"ids": ids}).status_code == 400
+
+    def test_follow_status_requires_auth(self, api_client, new_user):
+        assert api_client.get(URL, {"ids": new_user.id}).status_code == 401
+
+    def test_feed_includes_follow_status(self, api_client, new_user, new_author):
+        """
+        Authors in the feed carry follow flags of the viewer on request only
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        RecipeFactory(author=new_author)
+        api_client.force_authenticate(user=new_user)
+
+        author = api_client.get("/api/v1/feed/").data["results"][0]["author"]
+        assert "is_follow" not in author
+
+        response = api_client.get("/api/v1/feed/?include=follow_status,reactions")
+        recipe = response.data["results"][0]
+        assert recipe["author"]["is_follow"] is True
+        assert recipe["author"]["is_follower"] is False
+        assert "reactions" in recipe
+
+    def test_followers_include_follow_status(self, api_client, new_user, new_author):
+        """
+        Followers of an author show whether the viewer follows them back
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        FollowFactory(user=new_author, author=new_user)
+        api_client.force_authenticate(user=new_author)
+
+        response = api_client.get(
+            f"/api/v1/user/{new_author.username}/subscribers/?include=follow_status"
+        )
+
+        follower = response.data["results"][0]["user"]
+        assert follower["username"] == new_user.username
+        assert follower["is_follow"] is True
+        assert follower["is_follower"] is True
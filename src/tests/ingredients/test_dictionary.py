@@ -0,0 +1,128 @@
+from unittest import mock
+
+import pytest
+from django.db import IntegrityError, transaction
+
+from src.apps.ingredients.dictionary import (
+    NameDictionary,
+    ingredient_dictionary,
+    unit_dictionary,
+    warm_dictionaries,
+)
+from src.apps.ingredients.models import Ingredient, Unit
+
+
+@pytest.mark.django_db
+class TestIngredientDictionary:
+    """
+    Test in-memory name to id dictionary of ingredients
+    """
+
+    def test_known_names_cost_no_query(self, django_assert_num_queries):
+        """
+        Names loaded on warm-up are resolved from memory
+        """
+
+        salt = Ingredient.objects.create(name="Соль")
+        ingredient_dictionary.warm()
+
+        with django_assert_num_queries(0):
+            assert ingredient_dictionary.get_ids(["Соль"]) == {"Соль": salt.id}
+
+    def test_missing_names_remembered_on_commit(
+        self, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        """
+        Unknown names are created and enter the dictionary once committed
+        """
+
+        ingredient_dictionary.warm()
+        with django_capture_on_commit_callbacks(execute=True):
+            with django_assert_num_queries(2):
+                ids = ingredient_dictionary.get_ids(["Перец", "Перец"])
+
+        assert ids == {"Перец": Ingredient.objects.get(name="Перец").id}
+        with django_assert_num_queries(0):
+            assert ingredient_dictionary.get_ids(["Перец"]) == ids
+
+    def test_rolled_back_names_are_forgotten(
+        self, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        """
+        Names of a rolled back transaction never reach the dictionary
+        """
+
+        ingredient_dictionary.warm()
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(IntegrityError):
+                with transaction.atomic():
+                    ingredient_dictionary.get_ids(["Укроп"])
+                    raise IntegrityError
+
+        assert not Ingredient.objects.filter(name="Укроп").exists()
+        with django_assert_num_queries(2):
+            ids = ingredient_dictionary.get_ids(["Укроп"])
+        assert ids == {"Укроп": Ingredient.objects.get(name="Укроп").id}
+
+    def test_rename_reloads_other_processes(
+        self, settings, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        """
+        Renaming a row bumps the shared version, every dictionary reloads
+        """
+
+        settings.INGREDIENT_DICTIONARY_VERSION_CHECK_INTERVAL = 0
+        other_process = NameDictionary(Ingredient)
+        salt = Ingredient.objects.create(name="Соль")
+        ingredient_dictionary.warm()
+        other_process.warm()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            salt.name = "Морская соль"
+            salt.save()
+
+        with django_assert_num_queries(1):
+            assert other_process.get_ids(["Морская соль"]) == {
+                "Морская соль": salt.id
+            }
+
+    def test_version_check_throttled(
+        self, settings, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        """
+        Within the check interval a dictionary does not read the shared
+        version, a rename elsewhere is seen once it passed
+        """
+
+        settings.INGREDIENT_DICTIONARY_VERSION_CHECK_INTERVAL = 60
+        other_process = NameDictionary(Ingredient)
+        salt = Ingredient.objects.create(name="Соль")
+        other_process.warm()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            salt.name = "Морская соль"
+            salt.save()
+
+        with mock.patch.object(other_process, "_shared_version") as shared_version:
+            assert other_process.get_ids(["Соль"]) == {"Соль": salt.id}
+        shared_version.assert_not_called()
+
+        settings.INGREDIENT_DICTIONARY_VERSION_CHECK_INTERVAL = 0
+        with django_assert_num_queries(1):
+            assert other_process.get_ids(["Морская соль"]) == {
+                "Морская соль": salt.id
+            }
+
+    def test_warm_dictionaries(self, django_assert_num_queries):
+        """
+        Server processes load both tables on startup
+        """
+
+        salt = Ingredient.objects.create(name="Соль")
+        gram = Unit.objects.create(name="г")
+
+        warm_dictionaries()
+
+        with django_assert_num_queries(0):
+            assert ingredient_dictionary.get_ids(["Соль"]) == {"Соль": salt.id}
+            assert unit_dictionary.get_ids(["г"]) == {"г": gram.id}
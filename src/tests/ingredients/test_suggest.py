@@ -0,0 +1,126 @@
+import pytest
+from django.db import transaction
+
+from src.apps.ingredients.dictionary import ingredient_dictionary
+from src.apps.ingredients.models import Ingredient, IngredientInRecipe
+from src.apps.ingredients.suggest import ingredient_suggestions
+
+URL = "/api/v1/ingredients/suggest/"
+
+
+@pytest.fixture
+def used_ingredients(new_recipe, new_unit):
+    """
+    Ingredients used in the recipe as many times as the value
+    """
+
+    uses = {"Сахар": 3, "Сахарная пудра": 1, "Соль": 2, "Сыр": 0, "сало": 1}
+    for name, count in uses.items():
+        ingredient = Ingredient.objects.create(name=name)
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(
+                recipe=new_recipe, ingredient=ingredient, unit=new_unit, amount=1
+            )
+            for _ in range(count)
+        )
+    return uses
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestIngredientSuggest:
+    """
+    Test ingredient autocomplete endpoint
+    """
+
+    def test_prefix_matches_ranked_by_uses(self, api_client, used_ingredients):
+        """
+        Matches start with the prefix in any case, most used first and
+        alphabetically among equals
+        """
+
+        response = api_client.get(URL, {"q": "с"})
+
+        assert response.status_code == 200
+        assert [item["name"] for item in response.data["results"]] == [
+            "Сахар",
+            "Соль",
+            "сало",
+            "Сахарная пудра",
+            "Сыр",
+        ]
+        assert response.data["results"][0]["uses"] == 3
+
+    def test_limit_and_narrow_prefix(self, api_client, used_ingredients):
+        response = api_client.get(URL, {"q": "САХ", "limit": 1})
+
+        assert [item["name"] for item in response.data["results"]] == ["Сахар"]
+
+    def test_no_matches(self, api_client, used_ingredients):
+        response = api_client.get(URL, {"q": "Яблоко"})
+
+        assert response.status_code == 200
+        assert response.data["results"] == []
+
+    @pytest.mark.parametrize("params", [{}, {"q": ""}, {"q": "с", "limit": 0}])
+    def test_invalid_query(self, api_client, params):
+        response = api_client.get(URL, params)
+
+        assert response.status_code == 400
+
+    def test_warm_suggest_costs_no_query(
+        self, api_client, used_ingredients, django_assert_num_queries
+    ):
+        """
+        Names and usage counts are kept in memory after the first request
+        """
+
+        api_client.get(URL, {"q": "с"})
+
+        with django_assert_num_queries(0):
+            response = api_client.get(URL, {"q": "со"})
+        assert response.data["results"][0]["name"] == "Соль"
+
+
+@pytest.mark.django_db
+class TestIngredientSuggestRefresh:
+    """
+    Test incremental refresh of the prefix index
+    """
+
+    def test_new_ingredient_inserted_on_commit(
+        self, used_ingredients, django_capture_on_commit_callbacks
+    ):
+        ingredient_suggestions.suggest("с", 10)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ingredient_dictionary.get_ids(["Сельдерей"])
+
+        names = [item["name"] for item in ingredient_suggestions.suggest("се", 10)]
+        assert names == ["Сельдерей"]
+
+    def test_rolled_back_ingredient_not_suggested(self, used_ingredients):
+        ingredient_suggestions.suggest("с", 10)
+
+        with pytest.raises(RuntimeError), transaction.atomic():
+            ingredient_dictionary.get_ids(["Сельдерей"])
+            raise RuntimeError
+
+        assert ingredient_suggestions.suggest("се", 10) == []
+
+    def test_renamed_ingredient_rebuilds_index(
+        self, used_ingredients, django_capture_on_commit_callbacks
+    ):
+        ingredient_suggestions.suggest("с", 10)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            cheese = Ingredient.objects.get(name="Сыр")
+            cheese.name = "Пармезан"
+            cheese.save()
+
+        assert [item["name"] for item in ingredient_suggestions.suggest("п", 10)] == [
+            "Пармезан"
+        ]
+        assert "Сыр" not in [
+            item["name"] for item in ingredient_suggestions.suggest("с", 10)
+        ]
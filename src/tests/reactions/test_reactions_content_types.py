@@ -0,0 +1,75 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.comments.models import Comment
+from src.apps.reactions.choices import EmojyChoice
+from src.apps.reactions.models import Reaction
+from src.apps.reactions.registry import (
+    clear_reaction_content_types,
+    load_reaction_content_types,
+    reaction_content_type_id,
+)
+from src.apps.recipes.models import Recipe
+
+
+@pytest.mark.reactions
+@pytest.mark.django_db
+class TestReactionContentTypes:
+    """
+    Tests for the content type registry of reactions
+    """
+
+    @pytest.fixture
+    def warm_registry(self):
+        """
+        The registry is filled as on startup, ContentType's own cache is empty
+        """
+
+        ContentType.objects.clear_cache()
+        clear_reaction_content_types()
+        load_reaction_content_types()
+        ContentType.objects.clear_cache()
+
+    def content_type_queries(self, queries):
+        return [q for q in queries if 'FROM "django_content_type"' in q["sql"]]
+
+    def test_registry_ids(self):
+        """
+        Registered models resolve to their content type ids
+        """
+
+        assert reaction_content_type_id(Recipe) == (
+            ContentType.objects.get_for_model(Recipe).id
+        )
+        assert reaction_content_type_id(Comment) == (
+            ContentType.objects.get_for_model(Comment).id
+        )
+        with pytest.raises(LookupError):
+            reaction_content_type_id(Reaction)
+
+    def test_endpoints_do_not_query_content_types(
+        self, warm_registry, api_client, new_user, new_recipe, new_comment
+    ):
+        """
+        Listing, creating and cancelling reactions use the registry ids
+        """
+
+        api_client.force_authenticate(user=new_user)
+        with CaptureQueriesContext(connection) as queries:
+            for url in (
+                f"/api/v1/recipe/{new_recipe.slug}/reactions/",
+                f"/api/v1/comment/{new_comment.id}/reactions/",
+            ):
+                api_client.post(url, data={"emoji": EmojyChoice.LIKE}, format="json")
+                api_client.get(url)
+                reaction = Reaction.objects.latest("id")
+                assert api_client.delete(f"{url}{reaction.id}/").status_code == 204
+            api_client.get(
+                "/api/v1/reactions/summary/",
+                {"recipes": new_recipe.slug, "comments": new_comment.id},
+            )
+            api_client.get("/api/v1/feed/?include=reactions")
+
+        assert not self.content_type_queries(queries)
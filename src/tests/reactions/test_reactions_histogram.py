@@ -0,0 +1,185 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.reactions.choices import EmojyChoice
+from src.apps.reactions.histogram import (
+    get_reaction_histogram,
+    rebuild_reaction_histograms,
+)
+from src.apps.reactions.models import Reaction
+
+
+@pytest.mark.reactions
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cache_backend")
+class TestReactionHistogram:
+    """
+    Tests for cached reaction histograms
+    """
+
+    def get_reactions(self, api_client, recipe):
+        return api_client.get(f"/api/v1/recipe/{recipe.slug}/reactions/")
+
+    def test_histogram_served_from_cache(self, api_client, new_user, new_recipe):
+        """
+        The second read does not query the Reaction table
+        """
+
+        Reaction.objects.create(
+            author=new_user,
+            object_id=new_recipe.id,
+            content_type=ContentType.objects.get_for_model(new_recipe),
+        )
+        assert self.get_reactions(api_client, new_recipe).data["reactions"] == {
+            EmojyChoice.LIKE: 1
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_reactions(api_client, new_recipe)
+        assert response.data["reactions"] == {EmojyChoice.LIKE: 1}
+        assert not [q for q in queries if "reactions_reaction" in q["sql"]]
+
+    def test_histogram_follows_create_and_cancel(
+        self,
+        api_client,
+        new_user,
+        new_author,
+        new_recipe,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        Creating, cancelling and restoring reactions shift cached counters
+        """
+
+        url = f"/api/v1/recipe/{new_recipe.slug}/reactions/"
+        assert self.get_reactions(api_client, new_recipe).data["reactions"] == {}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for user in (new_user, new_author):
+                api_client.force_authenticate(user=user)
+                api_client.post(url, data={"emoji": EmojyChoice.FIRE}, format="json")
+        assert self.get_reactions(api_client, new_recipe).data["reactions"] == {
+            EmojyChoice.FIRE: 2
+        }
+
+        reaction = Reaction.objects.get(author=new_author)
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f"{url}{reaction.id}/")
+            api_client.delete(f"{url}{reaction.id}/")
+        assert self.get_reactions(api_client, new_recipe).data["reactions"] == {
+            EmojyChoice.FIRE: 1
+        }
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(url, data={"emoji": EmojyChoice.FIRE}, format="json")
+        assert self.get_reactions(api_client, new_recipe).data["reactions"] == {
+            EmojyChoice.FIRE: 2
+        }
+        assert get_reaction_histogram(
+            ContentType.objects.get_for_model(new_recipe).id, new_recipe.id
+        ) == {EmojyChoice.FIRE: 2}
+
+    def test_rebuild_from_table(self, new_user, new_comment):
+        """
+        rebuild_reaction_histograms refills histograms with the table counts
+        """
+
+        content_type = ContentType.objects.get_for_model(new_comment)
+        assert get_reaction_histogram(content_type.id, new_comment.id) == {}
+
+        Reaction.objects.bulk_create(
+            [
+                Reaction(
+                    author=new_user,
+                    emoji=emoji,
+                    object_id=new_comment.id,
+                    content_type=content_type,
+                )
+                for emoji in (EmojyChoice.LIKE, EmojyChoice.HEART)
+            ]
+        )
+        assert get_reaction_histogram(content_type.id, new_comment.id) == {}
+
+        call_command("rebuild_reaction_histograms")
+
+        assert get_reaction_histogram(content_type.id, new_comment.id) == {
+            EmojyChoice.LIKE: 1,
+            EmojyChoice.HEART: 1,
+        }
+
+    def test_hard_delete_drops_histogram(
+        self, new_user, new_recipe, django_capture_on_commit_callbacks
+    ):
+        """
+        Deleting reaction rows makes the next read count the table again
+        """
+
+        content_type = ContentType.objects.get_for_model(new_recipe)
+        reaction = Reaction.objects.create(
+            author=new_user, object_id=new_recipe.id, content_type=content_type
+        )
+        assert get_reaction_histogram(content_type.id, new_recipe.id) == {
+            EmojyChoice.LIKE: 1
+        }
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reaction.delete()
+
+        assert get_reaction_histogram(content_type.id, new_recipe.id) == {}
+
+    def test_recounted_without_atomic_cache(
+        self,
+        api_client,
+        new_user,
+        new_recipe,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        Without atomic incr a new reaction drops the histogram, which the
+        next read counts from the table
+        """
+
+        settings.ATOMIC_CACHE_BACKENDS = ()
+        url = f"/api/v1/recipe/{new_recipe.slug}/reactions/"
+        assert self.get_reactions(api_client, new_recipe).data["reactions"] == {}
+
+        api_client.force_authenticate(user=new_user)
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(url, data={"emoji": EmojyChoice.FIRE}, format="json")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_reactions(api_client, new_recipe)
+        assert response.data["reactions"] == {EmojyChoice.FIRE: 1}
+        assert [q for q in queries if "reactions_reaction" in q["sql"]]
+
+    def test_rebuild_between_commit_and_shift(
+        self, api_client, new_user, new_recipe, django_capture_on_commit_callbacks
+    ):
+        """
+        A histogram counted after a reaction commits but before its shift runs
+        is not cached, so the shift cannot count the reaction twice
+        """
+
+        content_type = ContentType.objects.get_for_model(new_recipe)
+        url = f"/api/v1/recipe/{new_recipe.slug}/reactions/"
+        assert self.get_reactions(api_client, new_recipe).data["reactions"] == {}
+
+        api_client.force_authenticate(user=new_user)
+        with django_capture_on_commit_callbacks() as callbacks:
+            api_client.post(url, data={"emoji": EmojyChoice.FIRE}, format="json")
+        rebuild_reaction_histograms(content_type.id, [new_recipe.id])
+        for callback in callbacks:
+            callback()
+
+        assert get_reaction_histogram(content_type.id, new_recipe.id) == {
+            EmojyChoice.FIRE: 1
+        }
+        with CaptureQueriesContext(connection) as queries:
+            assert get_reaction_histogram(content_type.id, new_recipe.id) == {
+                EmojyChoice.FIRE: 1
+            }
+        assert not [q for q in queries if "reactions_reaction" in q["sql"]]
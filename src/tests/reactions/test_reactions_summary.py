@@ -0,0 +1,110 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.reactions.choices import EmojyChoice
+from src.apps.reactions.models import Reaction
+from src.tests.factories.factories import CommentFactory, RecipeFactory
+
+URL = "/api/v1/reactions/summary/"
+
+
+@pytest.mark.reactions
+@pytest.mark.api
+@pytest.mark.django_db
+class TestReactionsSummary:
+    """
+    Tests for the batch reactions summary endpoint
+    """
+
+    def react(self, user, obj, emoji=EmojyChoice.LIKE):
+        return Reaction.objects.create(
+            author=user,
+            emoji=emoji,
+            object_id=obj.id,
+            content_type=ContentType.objects.get_for_model(obj),
+        )
+
+    def test_summary_of_recipes_and_comments(
+        self, api_client, new_user, new_author, new_recipe, new_comment
+    ):
+        """
+        Histograms and user reactions of every requested object
+        """
+
+        other_recipe = RecipeFactory(author=new_author)
+        own = self.react(new_user, new_recipe, EmojyChoice.FIRE)
+        self.react(new_author, new_recipe, EmojyChoice.FIRE)
+        self.react(new_author, new_comment, EmojyChoice.HEART)
+
+        api_client.force_authenticate(user=new_user)
+        response = api_client.get(
+            URL,
+            {
+                "recipes": f"{new_recipe.slug},{other_recipe.slug},unknown",
+                "comments": [new_comment.id, 999],
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.data == {
+            "recipes": {
+                new_recipe.slug: {
+                    "reactions": {EmojyChoice.FIRE: 2},
+                    "user_reactions": [{"type": EmojyChoice.FIRE, "id": own.id}],
+                },
+                other_recipe.slug: {"reactions": {}, "user_reactions": []},
+            },
+            "comments": {
+                new_comment.id: {
+                    "reactions": {EmojyChoice.HEART: 1},
+                    "user_reactions": [],
+                }
+            },
+        }
+
+    def test_summary_queries_do_not_grow(self, api_client, new_user, new_author):
+        """
+        The number of queries does not depend on the number of objects
+        """
+
+        recipes = RecipeFactory.create_batch(10, author=new_author)
+        comments = CommentFactory.create_batch(
+            10, author=new_author, recipe=recipes[0]
+        )
+        for obj in recipes + comments:
+            self.react(new_user, obj)
+        api_client.force_authenticate(user=new_user)
+        params = {
+            "recipes": ",".join(recipe.slug for recipe in recipes),
+            "comments": ",".join(str(comment.id) for comment in comments),
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(URL, params)
+        assert response.status_code == 200
+        assert len(response.data["recipes"]) == 10
+        assert len(response.data["comments"]) == 10
+        assert all(
+            summary["reactions"] == {EmojyChoice.LIKE: 1}
+            for summary in response.data["comments"].values()
+        )
+        reaction_queries = [q for q in queries if "reactions_reaction" in q["sql"]]
+        assert len(reaction_queries) == 4
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(URL, params)
+        reaction_queries = [q for q in queries if "reactions_reaction" in q["sql"]]
+        assert len(reaction_queries) == 2
+
+    def test_summary_needs_objects(self, api_client):
+        """
+        A request without recipes and comments is rejected
+        """
+
+        response = api_client.get(URL)
+        assert response.status_code == 400
+
+        response = api_client.get(URL, {"comments": "abc"})
+        assert response.status_code == 400
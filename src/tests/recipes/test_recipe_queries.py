@@ -0,0 +1,128 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.ingredients.dictionary import ingredient_dictionary, unit_dictionary
+from src.apps.ingredients.models import Ingredient, IngredientInRecipe, Unit
+from src.base.services import create_ingredients_in_recipe
+
+KNOWN_NAMES_QUERIES = 2
+CREATE_QUERIES = KNOWN_NAMES_QUERIES + 4
+REPLACE_QUERIES = CREATE_QUERIES + 3
+
+
+def ingredients(num: int, prefix: str = "ingredient") -> list:
+    return [
+        {"name": f"{prefix} {i}", "unit": f"unit {i % 3}", "amount": i + 1}
+        for i in range(num)
+    ]
+
+
+def count_queries(func) -> int:
+    """Queries run by func, transaction savepoints left out"""
+
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    return len([q for q in queries if "SAVEPOINT" not in q["sql"]])
+
+
+@pytest.mark.recipes
+@pytest.mark.django_db
+class TestRecipeIngredientQueries:
+    """
+    Recipe writes run a fixed number of queries whatever the ingredients
+    """
+
+    @pytest.fixture(autouse=True)
+    def warm_dictionaries(self):
+        ingredient_dictionary.warm()
+        unit_dictionary.warm()
+
+    @pytest.mark.parametrize("ingredients_num", [1, 10, 100])
+    def test_create_ingredients_queries(self, new_recipe, ingredients_num):
+        """
+        Creating ingredients in recipe takes CREATE_QUERIES queries
+        """
+
+        data = ingredients(ingredients_num)
+
+        assert (
+            count_queries(lambda: create_ingredients_in_recipe(new_recipe, data))
+            == CREATE_QUERIES
+        )
+        assert new_recipe.ingredients.count() == ingredients_num
+        assert Ingredient.objects.filter(name__startswith="ingredient").count() == (
+            ingredients_num
+        )
+
+    @pytest.mark.parametrize("ingredients_num", [1, 10, 100])
+    def test_replace_ingredients_queries(self, new_recipe, ingredients_num):
+        """
+        Replacing ingredients takes REPLACE_QUERIES queries and keeps only
+        the new ones
+        """
+
+        create_ingredients_in_recipe(new_recipe, ingredients(ingredients_num))
+        data = ingredients(ingredients_num, prefix="other")
+
+        assert (
+            count_queries(
+                lambda: create_ingredients_in_recipe(new_recipe, data, replace=True)
+            )
+            == REPLACE_QUERIES
+        )
+        assert sorted(
+            new_recipe.ingredients.values_list("ingredient__name", flat=True)
+        ) == sorted(item["name"] for item in data)
+        assert IngredientInRecipe.objects.filter(recipe=new_recipe).count() == (
+            ingredients_num
+        )
+
+    @pytest.mark.parametrize("ingredients_num", [1, 10, 100])
+    def test_known_names_queries(self, new_recipe, ingredients_num):
+        """
+        Names the dictionaries know skip the ingredient and unit tables
+        """
+
+        data = ingredients(ingredients_num)
+        Ingredient.objects.bulk_create(Ingredient(name=item["name"]) for item in data)
+        Unit.objects.bulk_create(Unit(name=f"unit {i}") for i in range(3))
+        ingredient_dictionary.warm()
+        unit_dictionary.warm()
+
+        assert (
+            count_queries(lambda: create_ingredients_in_recipe(new_recipe, data))
+            == KNOWN_NAMES_QUERIES
+        )
+
+    def test_known_names_are_reused(self, new_recipe, new_author):
+        """
+        Ingredients and units already known are not inserted twice
+        """
+
+        data = ingredients(10)
+        create_ingredients_in_recipe(new_recipe, data)
+        create_ingredients_in_recipe(new_recipe, data, replace=True)
+
+        assert Ingredient.objects.filter(name__startswith="ingredient").count() == 10
+        assert Unit.objects.filter(name__startswith="unit").count() == 3
+
+    def test_create_recipe_endpoint_queries(self, api_client, new_author, recipe_data):
+        """
+        POST /recipe/ costs the same with 1 and 100 ingredients
+        """
+
+        api_client.force_authenticate(user=new_author)
+
+        def post(ingredients_num):
+            data = dict(
+                recipe_data,
+                title=f"recipe {ingredients_num}",
+                ingredients=ingredients(ingredients_num, prefix=str(ingredients_num)),
+            )
+            response = api_client.post("/api/v1/recipe/", data, format="json")
+            assert response.status_code == 201
+
+        # tags of recipe_data are created by the first recipe
+        post(0)
+        assert count_queries(lambda: post(1)) == count_queries(lambda: post(100))
@@ -0,0 +1,128 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.recipes.models import Recipe, RecipeSlugCounter
+from src.apps.recipes.slugs import BASE_MAX_LENGTH, allocate_recipe_slug
+
+SAME_TITLE_RECIPES = 50
+
+
+def allocation_queries(title: str) -> int:
+    with CaptureQueriesContext(connection) as context:
+        allocate_recipe_slug(title)
+    return len(
+        [query for query in context.captured_queries if "SAVEPOINT" not in query["sql"]]
+    )
+
+
+@pytest.mark.django_db
+class TestRecipeSlugAllocation:
+    """
+    Test slug allocation from the per-base counter
+    """
+
+    def test_same_titles_get_next_suffix(self):
+        assert allocate_recipe_slug("Борщ") == "borshch"
+        assert allocate_recipe_slug("борщ!") == "borshch_2"
+        assert allocate_recipe_slug("Борщ") == "borshch_3"
+        assert allocate_recipe_slug("Щи") == "shchi"
+
+    def test_empty_slug_falls_back(self):
+        assert allocate_recipe_slug("!!!") == "recipe"
+
+    def test_endpoint_names_are_reserved(self):
+        assert allocate_recipe_slug("Search") == "search_2"
+        assert allocate_recipe_slug("Search") == "search_3"
+        assert allocate_recipe_slug("Facets") == "facets_2"
+        assert allocate_recipe_slug("Match!") == "match_2"
+
+    def test_long_titles_fit_slug_field(self):
+        """
+        Bases are cut so that suffixed slugs still fit Recipe.slug
+        """
+
+        max_length = Recipe._meta.get_field("slug").max_length
+        title = "Очень длинное название рецепта " * 5
+
+        first = allocate_recipe_slug(title)
+        second = allocate_recipe_slug(f"{title}, вариант")
+
+        assert len(first) == BASE_MAX_LENGTH
+        assert second == f"{first}_2"
+        assert len(second) <= max_length
+
+    def test_query_count_does_not_grow(self):
+        """
+        Allocating costs the same however many recipes share the title
+        """
+
+        first = allocation_queries("Борщ")
+        counts = {allocation_queries("Борщ") for _ in range(SAME_TITLE_RECIPES)}
+
+        assert first <= 2
+        assert counts == {2}
+        assert RecipeSlugCounter.objects.get(base="borshch").last == (
+            SAME_TITLE_RECIPES + 1
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestRecipeSlugRetry:
+    """
+    Test recipe saves retried when the slug was taken behind the counter
+    """
+
+    def test_create_skips_slug_taken_outside_counter(
+        self, api_client, new_author, recipe_data
+    ):
+        api_client.force_authenticate(user=new_author)
+        first = api_client.post("/api/v1/recipe/", recipe_data, format="json")
+        Recipe.objects.create(
+            author=new_author,
+            title="Imported",
+            slug=f"{first.data['slug']}_2",
+            full_text="text",
+            short_text="text",
+            cooking_time=30,
+        )
+
+        response = api_client.post("/api/v1/recipe/", recipe_data, format="json")
+
+        assert response.status_code == 201
+        assert response.data["slug"] == f"{first.data['slug']}_3"
+
+    def test_recipe_named_after_endpoint_is_reachable(
+        self, api_client, new_author, recipe_data
+    ):
+        api_client.force_authenticate(user=new_author)
+        created = api_client.post(
+            "/api/v1/recipe/", {**recipe_data, "title": "Search"}, format="json"
+        )
+
+        response = api_client.get(f"/api/v1/recipe/{created.data['slug']}/")
+
+        assert created.data["slug"] == "search_2"
+        assert response.status_code == 200
+        assert response.data["title"] == "Search"
+
+    def test_update_skips_slug_taken_outside_counter(
+        self, api_client, new_author, new_recipe
+    ):
+        Recipe.objects.create(
+            author=new_author,
+            title="Imported",
+            slug="pirog",
+            full_text="text",
+            short_text="text",
+            cooking_time=30,
+        )
+        api_client.force_authenticate(user=new_author)
+
+        response = api_client.patch(
+            f"/api/v1/recipe/{new_recipe.slug}/", {"title": "Пирог"}, format="json"
+        )
+
+        assert response.status_code == 200
+        assert Recipe.objects.get(id=new_recipe.id).slug == "pirog_2"
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from src.apps.comments.models import Comment
+from src.apps.recipes.models import Recipe, RecipeStats, RecipeStatsRefresh
+from src.apps.view.models import ViewRecipes
+from src.tests.factories.factories import (
+    CommentFactory,
+    ReactionFactory,
+    ViewFactory,
+)
+
+
+@pytest.mark.recipes
+@pytest.mark.django_db
+class TestRecipeStats:
+    """
+    Tests for denormalized recipe counters
+    """
+
+    def test_stats_created_with_recipe(self, new_recipe):
+        """
+        A new recipe gets an empty stats row
+        """
+
+        stats = RecipeStats.objects.get(recipe=new_recipe)
+        assert stats.comments_count == 0
+        assert stats.activity_count == 0
+
+    def test_stats_follow_writes(self, new_recipe):
+        """
+        Creating and deleting comments, views and reactions updates counters
+        """
+
+        comments = CommentFactory.create_batch(3, recipe=new_recipe)
+        ViewFactory.create_batch(2, recipe=new_recipe)
+        ReactionFactory.create_batch(4, object_id=new_recipe.id)
+
+        stats = RecipeStats.objects.get(recipe=new_recipe)
+        assert stats.comments_count == 3
+        assert stats.views_count == 2
+        assert stats.reactions_count == 4
+        assert stats.activity_count == 9
+
+        comments[0].delete()
+        ViewRecipes.objects.filter(recipe=new_recipe).delete()
+
+        stats.refresh_from_db()
+        assert stats.comments_count == 2
+        assert stats.views_count == 0
+        assert stats.activity_count == 6
+
+    def test_deleting_old_comment_keeps_activity(self, new_recipe):
+        """
+        Rows outside the activity window only change the total counters
+        """
+
+        comment = CommentFactory(recipe=new_recipe)
+        call_command("rebuild_recipe_stats")
+        Comment.objects.filter(id=comment.id).update(
+            pub_date=timezone.now() - timedelta(days=settings.ACTIVITY_INTERVAL + 1)
+        )
+        call_command("rebuild_recipe_stats")
+
+        Comment.objects.get(id=comment.id).delete()
+
+        stats = RecipeStats.objects.get(recipe=new_recipe)
+        assert stats.comments_count == 0
+        assert stats.latest_comments_count == 0
+        assert stats.activity_count == 0
+
+    def test_rebuild_restores_missing_row(self, new_recipe):
+        """
+        rebuild_recipe_stats recreates stats from the source tables
+        """
+
+        ViewFactory.create_batch(2, recipe=new_recipe)
+        RecipeStats.objects.all().delete()
+
+        call_command("rebuild_recipe_stats")
+
+        stats = RecipeStats.objects.get(recipe=new_recipe)
+        assert stats.views_count == 2
+        assert stats.activity_count == 2
+
+    def test_check_reports_and_fixes_drift(self, new_recipe):
+        """
+        check_recipe_stats fails on drift and repairs it with --fix
+        """
+
+        call_command("check_recipe_stats")
+
+        RecipeStats.objects.filter(recipe=new_recipe).update(comments_count=10)
+        with pytest.raises(CommandError):
+            call_command("check_recipe_stats")
+
+        call_command("check_recipe_stats", "--fix")
+        call_command("check_recipe_stats")
+        assert RecipeStats.objects.get(recipe=new_recipe).comments_count == 0
+
+    def test_refresh_ages_out_touched_recipes(self, new_recipe, new_user):
+        """
+        refresh_recipe_activity recomputes only recipes with rows that left
+        the activity window since the previous refresh
+        """
+
+        other_recipe = Recipe.objects.create(
+            author=new_user, title="Other", slug="other", full_text="", cooking_time=10
+        )
+        comment = CommentFactory(recipe=new_recipe)
+        CommentFactory(recipe=other_recipe)
+        call_command("refresh_recipe_activity")
+
+        RecipeStatsRefresh.objects.update(
+            window_start=timezone.now() - timedelta(days=settings.ACTIVITY_INTERVAL + 2)
+        )
+        Comment.objects.filter(id=comment.id).update(
+            pub_date=timezone.now() - timedelta(days=settings.ACTIVITY_INTERVAL + 1)
+        )
+        RecipeStats.objects.filter(recipe=other_recipe).update(activity_count=100)
+
+        call_command("refresh_recipe_activity")
+
+        assert RecipeStats.objects.get(recipe=new_recipe).activity_count == 0
+        assert RecipeStats.objects.get(recipe=other_recipe).activity_count == 100
+        assert RecipeStatsRefresh.objects.first().recipes_count == 1
@@ -0,0 +1,150 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from taggit.models import Tag
+
+from src.apps.ingredients.models import Ingredient
+from src.apps.search.changes import SEQUENCE_KEY
+from src.apps.search.facets import FacetIndex, recipe_facets
+
+URL = "/api/v1/recipe/facets/"
+
+
+@pytest.fixture
+def recipes(create_recipe, category_1, category_2):
+    """
+    Fish soup for 20 minutes, meat stew for 90 and fish pie for 45
+    """
+
+    soup = create_recipe(
+        title="Уха", category=[category_1.id], tag=["Суп"], cooking_time=20
+    )
+    stew = create_recipe(
+        title="Рагу", category=[category_2.id], tag=["Горячее"], cooking_time=90
+    )
+    pie = create_recipe(
+        title="Пирог", category=[category_1.id], tag=["Выпечка"], cooking_time=45
+    )
+    return soup, stew, pie
+
+
+def facet_counts(facets, facet):
+    return {item["name"]: item["count"] for item in facets[facet]}
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestRecipeFacets:
+    """
+    Test faceted recipe filtering endpoint
+    """
+
+    def test_counts_without_filters(self, api_client, recipes):
+        response = api_client.get(URL)
+
+        assert response.status_code == 200
+        assert response.data["count"] == 3
+        facets = response.data["facets"]
+        assert facet_counts(facets, "category") == {"Рыба": 2, "Мясо": 1}
+        assert facet_counts(facets, "cooking_time") == {
+            "0-30": 1,
+            "30-60": 1,
+            "60-120": 1,
+            "120+": 0,
+        }
+        assert facet_counts(facets, "ingredient") == {"Яйца": 3, "Волда": 3}
+
+    def test_filters_intersect_across_facets(
+        self, api_client, recipes, category_1, category_2
+    ):
+        soup, stew, pie = recipes
+
+        response = api_client.get(
+            URL,
+            {"category": f"{category_1.id},{category_2.id}", "cooking_time": "30-60"},
+        )
+
+        assert [item["id"] for item in response.data["results"]] == [pie.id]
+        facets = response.data["facets"]
+        # counts of a facet ignore its own selection
+        assert facet_counts(facets, "category") == {"Рыба": 1, "Мясо": 0}
+        assert facet_counts(facets, "cooking_time")["0-30"] == 1
+        assert facet_counts(facets, "tag") == {"Выпечка": 1}
+
+    def test_filter_by_tag_and_ingredient(self, api_client, recipes):
+        soup, stew, pie = recipes
+        tag = Tag.objects.get(name="Горячее")
+        ingredient = Ingredient.objects.get(name="Яйца")
+
+        response = api_client.get(URL, {"tag": tag.id, "ingredient": ingredient.id})
+
+        assert [item["id"] for item in response.data["results"]] == [stew.id]
+
+    def test_results_newest_first(self, api_client, recipes):
+        soup, stew, pie = recipes
+
+        response = api_client.get(URL)
+
+        assert [item["id"] for item in response.data["results"]] == [
+            pie.id,
+            stew.id,
+            soup.id,
+        ]
+
+    def test_unknown_bucket_rejected(self, api_client):
+        response = api_client.get(URL, {"cooking_time": "1-2"})
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestFacetIndexRefresh:
+    """
+    Test incremental refresh of the facet index
+    """
+
+    @pytest.mark.usefixtures("cache_backend")
+    def test_written_recipe_applied_without_reload(
+        self, recipes, create_recipe, category_2
+    ):
+        other_process = FacetIndex()
+        other_process.load()
+
+        with mock.patch.object(other_process, "load", side_effect=AssertionError):
+            stew = create_recipe(
+                title="Гуляш", category=[category_2.id], tag=[], cooking_time=100
+            )
+            matches, _ = other_process.search({"category": [category_2.id]})
+
+        assert stew.id in matches.matches
+        assert len(matches) == 2
+
+    @pytest.mark.usefixtures("cache_backend")
+    def test_deleted_recipe_dropped(
+        self, api_client, recipes, django_capture_on_commit_callbacks
+    ):
+        soup, stew, pie = recipes
+        recipe_facets.search({})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f"/api/v1/recipe/{soup.slug}/")
+
+        matches, counts = recipe_facets.search({})
+        assert set(matches.matches) == {stew.id, pie.id}
+        assert counts["cooking_time"]["0-30"] == 0
+
+    def test_gap_in_log_reloads(self, recipes, create_recipe):
+        other_process = FacetIndex()
+        other_process.load()
+        create_recipe(title="Гуляш", cooking_time=100)
+        cache = caches["default"]
+        cache.delete(f"search:changes:{cache.get(SEQUENCE_KEY)}")
+
+        with mock.patch.object(
+            other_process, "load", wraps=other_process.load
+        ) as load:
+            matches, _ = other_process.search({})
+
+        load.assert_called_once()
+        assert len(matches) == 4
@@ -0,0 +1,178 @@
+from unittest import mock
+
+import pytest
+
+from src.apps.ingredients.models import Ingredient
+from src.apps.search.matching import IngredientMatchIndex, recipe_matches
+from src.apps.search.models import RecipeChange
+
+URL = "/api/v1/recipe/match/"
+
+
+def ingredients(*names):
+    return [{"name": name, "unit": "г", "amount": 1} for name in names]
+
+
+def match(api_client, *names, **fields):
+    response = api_client.post(
+        URL, {"ingredients": list(names), **fields}, format="json"
+    )
+    assert response.status_code == 200
+    return response.data
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestRecipeMatch:
+    """
+    Test matching recipes to a pantry endpoint
+    """
+
+    def test_ranked_by_coverage(self, api_client, create_recipe):
+        omelette = create_recipe(ingredients=ingredients("Яйца", "Молоко"))
+        pancakes = create_recipe(
+            ingredients=ingredients("Яйца", "Молоко", "Мука", "Сахар")
+        )
+        create_recipe(ingredients=ingredients("Говядина", "Лук"))
+
+        data = match(api_client, "Яйца", "Молоко", "Мука")
+
+        assert data["unknown"] == []
+        assert [
+            (item["id"], item["matched_count"], item["ingredients_count"], item["coverage"])
+            for item in data["results"]
+        ] == [(omelette.id, 2, 2, 1.0), (pancakes.id, 3, 4, 0.75)]
+
+    def test_ties_broken_by_matched_then_newest(self, api_client, create_recipe):
+        eggs = create_recipe(ingredients=ingredients("Яйца"))
+        omelette = create_recipe(ingredients=ingredients("Яйца", "Молоко"))
+        newer_eggs = create_recipe(ingredients=ingredients("Яйца"))
+
+        data = match(api_client, "Яйца", "Молоко")
+
+        assert [item["id"] for item in data["results"]] == [
+            omelette.id,
+            newer_eggs.id,
+            eggs.id,
+        ]
+
+    def test_limit_keeps_the_best(self, api_client, create_recipe):
+        create_recipe(ingredients=ingredients("Яйца", "Молоко", "Мука"))
+        create_recipe(ingredients=ingredients("Яйца"))
+        newer = create_recipe(ingredients=ingredients("Яйца"))
+        create_recipe(ingredients=ingredients("Яйца", "Сахар"))
+
+        data = match(api_client, "Яйца", limit=1)
+
+        assert [item["id"] for item in data["results"]] == [newer.id]
+
+    def test_unknown_names_not_created(self, api_client, create_recipe):
+        recipe = create_recipe(ingredients=ingredients("Яйца"))
+
+        data = match(api_client, "Яйца", "Драконье яйцо", "Драконье яйцо")
+
+        assert data["unknown"] == ["Драконье яйцо"]
+        assert [item["id"] for item in data["results"]] == [recipe.id]
+        assert not Ingredient.objects.filter(name="Драконье яйцо").exists()
+
+    def test_no_matches(self, api_client, create_recipe):
+        create_recipe(ingredients=ingredients("Яйца"))
+
+        data = match(api_client, "Лук")
+
+        assert data["results"] == []
+
+    @pytest.mark.parametrize(
+        "data",
+        [{}, {"ingredients": []}, {"ingredients": ["Яйца"], "limit": 0}],
+    )
+    def test_invalid_pantry(self, api_client, data):
+        response = api_client.post(URL, data, format="json")
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestIngredientMatchIndexRefresh:
+    """
+    Test incremental refresh of the ingredient match index
+    """
+
+    @pytest.mark.usefixtures("cache_backend")
+    def test_edited_recipe_applied_without_reload(
+        self, api_client, create_recipe, django_capture_on_commit_callbacks
+    ):
+        recipe = create_recipe(ingredients=ingredients("Яйца", "Молоко"))
+        other_process = IngredientMatchIndex()
+        other_process.load()
+
+        with mock.patch.object(other_process, "load", side_effect=AssertionError):
+            with django_capture_on_commit_callbacks(execute=True):
+                response = api_client.patch(
+                    f"/api/v1/recipe/{recipe.slug}/",
+                    {"ingredients": ingredients("Яйца", "Мука", "Сахар")},
+                    format="json",
+                )
+            assert response.status_code == 200
+            added = create_recipe(ingredients=ingredients("Молоко"))
+            milk = Ingredient.objects.get(name="Молоко")
+            flour = Ingredient.objects.get(name="Мука")
+
+            assert other_process.match([milk.id], 10) == [(added.id, 1, 1)]
+            assert other_process.match([flour.id], 10) == [(recipe.id, 1, 3)]
+
+    @pytest.mark.usefixtures("cache_backend")
+    def test_deleted_recipe_dropped(
+        self, api_client, create_recipe, django_capture_on_commit_callbacks
+    ):
+        kept = create_recipe(ingredients=ingredients("Яйца"))
+        deleted = create_recipe(ingredients=ingredients("Яйца", "Молоко"))
+        eggs = Ingredient.objects.get(name="Яйца")
+        assert len(recipe_matches.match([eggs.id], 10)) == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f"/api/v1/recipe/{deleted.slug}/")
+
+        assert recipe_matches.match([eggs.id], 10) == [(kept.id, 1, 1)]
+
+    def test_table_log_without_atomic_cache(
+        self, settings, create_recipe, django_capture_on_commit_callbacks
+    ):
+        """
+        Without an atomic cache writes are logged in a table and applied
+        without reloading
+        """
+
+        settings.ATOMIC_CACHE_BACKENDS = ()
+        first = create_recipe(ingredients=ingredients("Яйца"))
+        other_process = IngredientMatchIndex()
+        other_process.load()
+
+        with mock.patch.object(other_process, "load", side_effect=AssertionError):
+            second = create_recipe(ingredients=ingredients("Яйца", "Молоко"))
+            third = create_recipe(ingredients=ingredients("Яйца"))
+            eggs = Ingredient.objects.get(name="Яйца")
+            matches = other_process.match([eggs.id], 10)
+
+        assert [match.recipe_id for match in matches] == [third.id, first.id, second.id]
+        assert RecipeChange.objects.count() == 3
+
+    def test_table_log_rereads_rows_committed_late(self, settings, create_recipe):
+        """
+        A row numbered below the rows read is read once it commits
+        """
+
+        settings.ATOMIC_CACHE_BACKENDS = ()
+        create_recipe(ingredients=ingredients("Яйца"))
+        other_process = IngredientMatchIndex()
+        other_process.load()
+        late = create_recipe(ingredients=ingredients("Молоко"))
+        late_change = RecipeChange.objects.get(recipe_id=late.id)
+        late_change.delete()
+        create_recipe(ingredients=ingredients("Яйца"))
+        milk = Ingredient.objects.get(name="Молоко")
+
+        with mock.patch.object(other_process, "load", side_effect=AssertionError):
+            assert other_process.match([milk.id], 10) == []
+            late_change.save()
+            assert other_process.match([milk.id], 10) == [(late.id, 1, 1)]
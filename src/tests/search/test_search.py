@@ -0,0 +1,109 @@
+import pytest
+from django.core.management import call_command
+
+from src.apps.ingredients.models import Ingredient
+from src.apps.recipes.models import Recipe
+from src.apps.search.index import search_recipes
+from src.apps.search.text import terms
+
+URL = "/api/v1/recipe/search/"
+
+
+class TestSearchText:
+    """
+    Test normalization of indexed text and queries
+    """
+
+    @pytest.mark.parametrize("word", ["Борщ", "борщи", "БОРЩА", "borshch", "borshchi"])
+    def test_word_forms_and_transliteration_meet(self, word):
+        assert terms(word) == ["borshch"]
+
+    def test_single_letters_left_out(self):
+        assert terms("Борщ с говядиной") == ["borshch", "goviadin"]
+        assert terms("!!! ?") == []
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestRecipeSearch:
+    """
+    Test recipe search endpoint
+    """
+
+    def test_found_by_title_tag_category_and_ingredient(self, api_client, create_recipe):
+        recipe = create_recipe()
+
+        for query in ("вареные", "варка", "рыба", "волда", "varenye yaitsa"):
+            response = api_client.get(URL, {"q": query})
+
+            assert response.status_code == 200, query
+            assert [item["slug"] for item in response.data["results"]] == [
+                recipe.slug
+            ], query
+
+    def test_every_word_must_match(self, api_client, create_recipe):
+        create_recipe()
+
+        response = api_client.get(URL, {"q": "яйца ананас"})
+
+        assert response.data["results"] == []
+
+    def test_title_matches_ranked_first(self, create_recipe):
+        in_ingredients = create_recipe(
+            title="Омлет", tag=[], category=[],
+            ingredients=[{"name": "Сыр", "unit": "г", "amount": 50}],
+        )
+        in_title = create_recipe(
+            title="Сырники", tag=[], category=[],
+            ingredients=[{"name": "Творог", "unit": "г", "amount": 200}],
+        )
+
+        assert search_recipes("сыр", 10) == [in_title.id, in_ingredients.id]
+
+    def test_deleted_recipe_removed(
+        self, api_client, create_recipe, django_capture_on_commit_callbacks
+    ):
+        recipe = create_recipe()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(f"/api/v1/recipe/{recipe.slug}/")
+
+        assert search_recipes("вареные", 10) == []
+
+    def test_renamed_ingredient_reindexed(
+        self, create_recipe, django_capture_on_commit_callbacks
+    ):
+        recipe = create_recipe()
+        ingredient = Ingredient.objects.get(name="Волда")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ingredient.name = "Вода"
+            ingredient.save()
+
+        assert search_recipes("волда", 10) == []
+        assert search_recipes("вода", 10) == [recipe.id]
+
+    @pytest.mark.parametrize("params", [{}, {"q": ""}])
+    def test_query_required(self, api_client, params):
+        response = api_client.get(URL, params)
+
+        assert response.status_code == 400
+
+    def test_query_without_words(self, api_client):
+        response = api_client.get(URL, {"q": "!!!"})
+
+        assert response.status_code == 200
+        assert response.data["results"] == []
+
+    def test_rebuild_command(self, create_recipe):
+        """
+        Recipes written without signals are found after a rebuild
+        """
+
+        recipe = create_recipe()
+        Recipe.objects.filter(id=recipe.id).update(title="Пирог")
+        assert search_recipes("пирог", 10) == []
+
+        call_command("rebuild_search_index")
+
+        assert search_recipes("пирог", 10) == [recipe.id]
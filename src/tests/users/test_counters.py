@@ -0,0 +1,97 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.users.models import CustomUser
+from src.tests.factories.factories import FollowFactory, RecipeFactory, UserFactory
+
+
+@pytest.mark.users
+@pytest.mark.django_db
+class TestUserCounters:
+    """
+    Tests for denormalized follower, following and recipe counters
+    """
+
+    def test_counters_follow_writes(self, new_user, new_author):
+        """
+        Following and creating recipes shifts the counters, deleting shifts back
+        """
+
+        follow = FollowFactory(user=new_user, author=new_author)
+        recipes = RecipeFactory.create_batch(2, author=new_author)
+
+        new_user.refresh_from_db()
+        new_author.refresh_from_db()
+        assert new_author.followers_count == 1
+        assert new_user.following_count == 1
+        assert new_author.recipes_count == 2
+
+        follow.delete()
+        recipes[0].delete()
+
+        new_user.refresh_from_db()
+        new_author.refresh_from_db()
+        assert new_author.followers_count == 0
+        assert new_user.following_count == 0
+        assert new_author.recipes_count == 1
+
+    def test_subscribe_endpoints_shift_counters(
+        self, api_client, new_user, new_author
+    ):
+        """
+        Subscribe and unsubscribe endpoints keep the counters in step
+        """
+
+        api_client.force_authenticate(user=new_user)
+        api_client.post(
+            "/api/v1/subscribe/", data={"author": new_author.username}, format="json"
+        )
+        new_author.refresh_from_db()
+        assert new_author.followers_count == 1
+
+        api_client.delete(
+            "/api/v1/unsubscribe/", data={"author": new_author.username}, format="json"
+        )
+        new_author.refresh_from_db()
+        assert new_author.followers_count == 0
+
+    def test_lists_read_counters(self, api_client, new_user, new_author):
+        """
+        Follow lists and the user list read counters without aggregates
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        FollowFactory(author=new_author)
+        RecipeFactory(author=new_author)
+        api_client.force_authenticate(user=new_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            subscriptions = api_client.get(f"/api/v1/user/{new_user}/subscriptions/")
+            users = api_client.get("/api/v1/users/")
+
+        assert not [query for query in queries if "GROUP BY" in query["sql"]]
+        assert subscriptions.data["results"][0]["subscribers_count"] == 2
+        assert users.data["results"][0]["username"] == new_author.username
+        assert users.data["results"][0]["recipes_count"] == 1
+
+    def test_check_reports_and_fixes_drift(self, new_user, new_author):
+        """
+        check_user_counters fails on drift and repairs it with --fix
+        """
+
+        FollowFactory(user=new_user, author=new_author)
+        call_command("check_user_counters")
+
+        CustomUser.objects.filter(id=new_author.id).update(
+            followers_count=10, recipes_count=3
+        )
+        with pytest.raises(CommandError):
+            call_command("check_user_counters")
+
+        call_command("check_user_counters", "--fix")
+        call_command("check_user_counters")
+        new_author.refresh_from_db()
+        assert new_author.followers_count == 1
+        assert new_author.recipes_count == 0
@@ -4,6 +4,7 @@ from src.base.code_text import (
     CREDENTIALS_WERE_NOT_PROVIDED,
     DONT_HAVE_PERMISSIONS,
 )
+from src.tests.factories.factories import RecipeFactory, UserFactory
 
 BASE_URL = "http://127.0.0.1:8000/api/v1"
 
@@ -124,6 +125,29 @@ class TestUserAPI:
         assert "results" in response.json()
         assert len(response.json()["results"]) <= 10
 
+    def test_get_users_cursor_pagination(self, api_client, new_user):
+        """
+        Test walking the list of users with cursor pagination.
+        Endpoint: http://127.0.0.1:8000/api/v1/users/?pagination=cursor
+        """
+
+        users = UserFactory.create_batch(6)
+        for user in users[:3]:
+            RecipeFactory(author=user)
+
+        api_client.force_authenticate(user=new_user)
+        next_page_url = f"{BASE_URL}/users/?pagination=cursor&page_size=2"
+        seen = []
+        while next_page_url:
+            response = api_client.get(next_page_url)
+            assert response.status_code == 200
+            seen += response.json()["results"]
+            next_page_url = response.json()["next"]
+
+        assert len({user["id"] for user in seen}) == len(seen) == 7
+        recipes_counts = [user["recipes_count"] for user in seen]
+        assert recipes_counts == sorted(recipes_counts, reverse=True)
+
     def test_get_users_unauthorized(self, api_client):
         """
         Test getting a list of users without authorization.
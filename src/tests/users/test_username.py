@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.users.models import CustomUser
+
+PARALLEL_SIGNUPS = 8
+
+
+def sign_up(number: int) -> int:
+    try:
+        return CustomUser.objects.create_user(
+            email=f"parallel{number}@ya.ru", password="changeme123"
+        ).pk
+    finally:
+        connection.close()
+
+
+@pytest.mark.django_db
+class TestUsernameGeneration:
+    """
+    Test usernames given to new users
+    """
+
+    def test_username_derived_from_pk(self, django_user_model):
+        user = django_user_model.objects.create_user(
+            email="first@ya.ru", password="changeme123"
+        )
+
+        assert user.username == f"user{user.pk}"
+        assert CustomUser.objects.get(pk=user.pk).username == user.username
+
+    def test_signup_reads_nothing(self):
+        """
+        The user row is inserted and named, no other query is run
+        """
+
+        with CaptureQueriesContext(connection) as context:
+            CustomUser.objects.create_user(email="first@ya.ru", password="changeme123")
+
+        queries = [
+            query["sql"].split()[0]
+            for query in context.captured_queries
+            if "SAVEPOINT" not in query["sql"]
+        ]
+        assert queries == ["INSERT", "UPDATE"]
+
+    def test_taken_username_replaced(self, new_user):
+        """
+        A user renamed to the next user's derived name makes it pick another
+        """
+
+        CustomUser.objects.filter(pk=new_user.pk).update(
+            username=f"user{new_user.pk + 1}"
+        )
+
+        user = CustomUser.objects.create_user(
+            email="second@ya.ru", password="changeme123"
+        )
+
+        assert user.pk == new_user.pk + 1
+        assert user.username.startswith("user")
+        assert user.username != f"user{user.pk}"
+        assert CustomUser.objects.get(pk=user.pk).username == user.username
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_signups_get_unique_usernames():
+    """
+    Signups running at once all succeed with their own username
+    """
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_SIGNUPS) as executor:
+        user_ids = list(executor.map(sign_up, range(PARALLEL_SIGNUPS)))
+
+    usernames = dict(
+        CustomUser.objects.filter(pk__in=user_ids).values_list("pk", "username")
+    )
+    assert len(usernames) == PARALLEL_SIGNUPS
+    assert usernames == {pk: f"user{pk}" for pk in user_ids}
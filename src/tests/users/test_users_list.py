@@ -0,0 +1,81 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.users.models import CustomUser
+from src.tests.factories.factories import FollowFactory, RecipeFactory, UserFactory
+
+BASE_URL = "/api/v1"
+
+
+@pytest.mark.users
+@pytest.mark.api
+@pytest.mark.django_db
+class TestUsersList:
+    """
+    Test the list of users ordered by recipes count
+    """
+
+    def test_follow_flags_of_page(self, api_client, new_user):
+        """
+        is_follow and is_follower are resolved for every user of the page
+        """
+
+        followed, follower, mutual, stranger = UserFactory.create_batch(4)
+        FollowFactory(user=new_user, author=followed)
+        FollowFactory(user=follower, author=new_user)
+        FollowFactory(user=new_user, author=mutual)
+        FollowFactory(user=mutual, author=new_user)
+        FollowFactory(user=follower, author=stranger)
+
+        api_client.force_authenticate(user=new_user)
+        response = api_client.get(f"{BASE_URL}/users/")
+        flags = {
+            user["username"]: (user["is_follow"], user["is_follower"])
+            for user in response.data["results"]
+        }
+
+        assert flags[followed.username] == (True, False)
+        assert flags[follower.username] == (False, True)
+        assert flags[mutual.username] == (True, True)
+        assert flags[stranger.username] == (False, False)
+
+    def test_follow_flags_in_one_query(self, api_client, new_user):
+        """
+        Follow flags cost one query whatever the page size
+        """
+
+        api_client.force_authenticate(user=new_user)
+
+        def follow_queries(users_num):
+            for author in UserFactory.create_batch(users_num):
+                FollowFactory(user=new_user, author=author)
+            with CaptureQueriesContext(connection) as queries:
+                api_client.get(f"{BASE_URL}/users/?pagination=cursor")
+            return [query for query in queries if "follow_follow" in query["sql"]]
+
+        assert len(follow_queries(1)) == 1
+        assert len(follow_queries(9)) == 1
+
+    def test_ordering_walks_index(self, api_client, new_user):
+        """
+        Users are ordered by recipes count without sorting the table
+        """
+
+        authors = UserFactory.create_batch(3)
+        for recipes_num, author in enumerate(authors, start=1):
+            RecipeFactory.create_batch(recipes_num, author=author)
+
+        api_client.force_authenticate(user=new_user)
+        response = api_client.get(f"{BASE_URL}/users/")
+        assert [user["username"] for user in response.data["results"][:3]] == [
+            author.username for author in reversed(authors)
+        ]
+
+        queryset = CustomUser.objects.order_by("-recipes_count", "-id")[:10]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        assert "user_recipes_count_id_idx" in plan
+        assert "TEMP B-TREE" not in plan
@@ -1,7 +1,22 @@
 from datetime import timedelta
+from unittest import mock
 
 import pytest
-
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.recipes.models import RecipeStats
+from src.apps.view.buffer import (
+    QUEUE_GAP_KEY,
+    QUEUE_HEAD_KEY,
+    QUEUE_TAIL_KEY,
+    flush_view_buffer,
+    queue_item_key,
+    view_seen_key,
+)
 from src.apps.view.models import ViewRecipes
 
 
@@ -11,6 +26,7 @@ class TestRecipeView:
     Test recipe view
     """
 
+    @pytest.mark.usefixtures("cache_backend")
     def test_view_recipes(self, api_client, new_recipe, new_author, new_user):
         """
         Test add view for recipe
@@ -21,16 +37,20 @@ class TestRecipeView:
 
         api_client.force_authenticate(user=new_user)
         api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        call_command("flush_recipe_views")
 
         assert ViewRecipes.objects.count() == 1
         assert new_recipe.views.count() == 1
 
         api_client.force_authenticate(user=new_author)
         api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        call_command("flush_recipe_views")
 
         assert ViewRecipes.objects.count() == 2
         assert new_recipe.views.count() == 2
+        assert RecipeStats.objects.get(recipe=new_recipe).views_count == 2
 
+    @pytest.mark.usefixtures("cache_backend")
     def test_view_recipes_one_of_twenty_minutes(self, api_client, new_recipe, new_user):
         """
         Test add view for recipe, one of twenty minutes
@@ -40,22 +60,157 @@ class TestRecipeView:
 
         api_client.force_authenticate(user=new_user)
         api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
-        assert new_recipe.views.count() == 1
         api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        call_command("flush_recipe_views")
         assert new_recipe.views.count() == 1
 
-        # change the first viewing time to 10 minutes
-        new_view = ViewRecipes.objects.first()
-        new_view.created_at = new_view.created_at - timedelta(minutes=10)
-        new_view.save()
+        # the twenty minutes window of the viewer is over
+        cache.delete(view_seen_key(str(new_user), new_recipe.id))
+        ViewRecipes.objects.update(created_at=F("created_at") - timedelta(minutes=21))
 
         api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
-        assert new_recipe.views.count() == 1
+        call_command("flush_recipe_views")
+        assert new_recipe.views.count() == 2
 
-        # change the first viewing time to 20 minutes
-        new_view = ViewRecipes.objects.first()
-        new_view.created_at = new_view.created_at - timedelta(minutes=10)
-        new_view.save()
+    def test_retrieve_does_not_write(self, api_client, new_recipe):
+        """
+        Reading a recipe queues the view without touching the database
+        """
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+
+        assert not [
+            query
+            for query in queries
+            if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        assert ViewRecipes.objects.count() == 0
+
+    def test_flush_keeps_view_time(self, api_client, new_recipe):
+        """
+        Views are saved with the time they were made, not the flush time
+        """
 
         api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
-        assert new_recipe.views.count() == 2
+        viewer, recipe_id, viewed_at = cache.get(queue_item_key(1))
+        viewed_at -= timedelta(days=1)
+        cache.set(queue_item_key(1), (viewer, recipe_id, viewed_at))
+
+        assert flush_view_buffer() == 1
+        assert ViewRecipes.objects.get().created_at == viewed_at
+        assert viewer.startswith("Anonymous-")
+
+    def test_flush_in_batches(self, api_client, new_recipe, new_user, new_author):
+        """
+        Every queued view is saved once, whatever the batch size
+        """
+
+        for user in (new_user, new_author, None):
+            api_client.force_authenticate(user=user)
+            api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+
+        assert flush_view_buffer(batch_size=2) == 3
+        assert flush_view_buffer(batch_size=2) == 0
+        assert RecipeStats.objects.get(recipe=new_recipe).activity_count == 3
+
+    def test_flush_waits_for_missing_items(self, api_client, new_recipe, new_user):
+        """
+        A number taken by a writer that has not stored its view yet stops the
+        flush, the view is saved with the ones after it on the next flush
+        """
+
+        api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        number = cache.incr(QUEUE_HEAD_KEY)
+        api_client.force_authenticate(user=new_user)
+        api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+
+        assert flush_view_buffer() == 1
+        late_view = ("late viewer", new_recipe.id, cache.get(queue_item_key(3))[2])
+        assert cache.add(queue_item_key(number), late_view, None)
+
+        assert flush_view_buffer() == 2
+        assert ViewRecipes.objects.filter(user="late viewer").exists()
+        assert cache.get(QUEUE_TAIL_KEY) == 3
+
+    def test_flush_skips_missing_items_after_grace(
+        self, api_client, new_recipe, new_user, settings
+    ):
+        """
+        A number missing for longer than the grace period is skipped and
+        its writer can no longer queue the view
+        """
+
+        api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        number = cache.incr(QUEUE_HEAD_KEY)
+        api_client.force_authenticate(user=new_user)
+        api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        assert flush_view_buffer() == 1
+
+        gap_number, first_seen = cache.get(QUEUE_GAP_KEY)
+        assert gap_number == number
+        cache.set(
+            QUEUE_GAP_KEY,
+            (number, first_seen - settings.VIEW_BUFFER_GAP_GRACE - 1),
+            None,
+        )
+
+        assert flush_view_buffer() == 1
+        assert cache.get(QUEUE_TAIL_KEY) == 3
+        assert not cache.add(queue_item_key(number), ("late viewer", 1, None), None)
+
+    def test_flush_skips_deleted_recipes(self, api_client, new_recipe):
+        """
+        Views of recipes deleted before the flush are dropped
+        """
+
+        api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        new_recipe.delete()
+
+        assert flush_view_buffer() == 0
+        assert ViewRecipes.objects.count() == 0
+
+
+    def test_flush_keeps_items_queued_while_flushing(
+        self, api_client, new_recipe, new_user
+    ):
+        """
+        An item written after the flush read the queue waits for the next
+        flush instead of being deleted
+        """
+
+        api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        # a second view took its number but its item is not written yet
+        number = cache.incr(QUEUE_HEAD_KEY)
+        late_view = ("late viewer", new_recipe.id, cache.get(queue_item_key(1))[2])
+        get_many = caches["default"].get_many
+
+        def get_many_then_queue(keys):
+            items = get_many(keys)
+            cache.set(queue_item_key(number), late_view, None)
+            return items
+
+        with mock.patch.object(
+            caches["default"], "get_many", side_effect=get_many_then_queue
+        ):
+            assert flush_view_buffer() == 1
+
+        assert flush_view_buffer() == 1
+        assert ViewRecipes.objects.filter(user="late viewer").exists()
+
+    def test_written_directly_without_atomic_cache(
+        self, api_client, new_recipe, new_user, settings
+    ):
+        """
+        Without a cache fit for the queue views are written on read
+        """
+
+        settings.ATOMIC_CACHE_BACKENDS = ()
+        api_client.force_authenticate(user=new_user)
+
+        api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+        api_client.get(f"/api/v1/recipe/{new_recipe.slug}/")
+
+        assert cache.get(QUEUE_HEAD_KEY) is None
+        assert new_recipe.views.count() == 1
+        assert RecipeStats.objects.get(recipe=new_recipe).views_count == 1
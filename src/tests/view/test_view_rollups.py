@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from src.apps.recipes.models import RecipeStats
+from src.apps.view.models import RecipeViewRollup, ViewRecipes
+from src.apps.view.rollups import compact_recipe_views, compaction_cutoff
+from src.tests.factories.factories import ViewFactory
+
+
+@pytest.mark.django_db
+class TestRecipeViewRollups:
+    """
+    Tests for compaction of raw views into hourly rollups
+    """
+
+    def create_views(self, recipe, num, created_at):
+        views = ViewFactory.create_batch(num, recipe=recipe)
+        ViewRecipes.objects.filter(id__in=[view.id for view in views]).update(
+            created_at=created_at
+        )
+
+    def test_compaction_folds_old_views(self, new_recipe):
+        """
+        Old views move to rollups, the tail stays raw and counters hold
+        """
+
+        old = compaction_cutoff() - timedelta(hours=3, minutes=10)
+        self.create_views(new_recipe, 3, old)
+        self.create_views(new_recipe, 2, old + timedelta(minutes=5))
+        self.create_views(new_recipe, 1, timezone.now())
+        call_command("rebuild_recipe_stats")
+
+        call_command("compact_recipe_views")
+
+        rollup = RecipeViewRollup.objects.get()
+        assert rollup.views_count == 5
+        assert rollup.period_start == old.replace(minute=0, second=0, microsecond=0)
+        assert ViewRecipes.objects.count() == 1
+        assert RecipeStats.objects.get(recipe=new_recipe).views_count == 6
+        call_command("check_recipe_stats")
+
+    def test_compaction_adds_to_existing_rollup(self, new_recipe):
+        """
+        Views of an already folded hour are added to its rollup
+        """
+
+        old = compaction_cutoff() - timedelta(days=3)
+        self.create_views(new_recipe, 2, old)
+        assert compact_recipe_views() == 2
+
+        self.create_views(new_recipe, 4, old + timedelta(minutes=1))
+        assert compact_recipe_views() == 4
+
+        assert RecipeViewRollup.objects.get().views_count == 6
+        assert ViewRecipes.objects.count() == 0
+
+    def test_rebuild_counts_rollups(self, new_recipe):
+        """
+        Rebuilt counters include rollups, old ones outside the activity window
+        """
+
+        RecipeViewRollup.objects.create(
+            recipe=new_recipe,
+            period_start=timezone.now() - timedelta(days=100),
+            views_count=10,
+        )
+        RecipeViewRollup.objects.create(
+            recipe=new_recipe,
+            period_start=timezone.now() - timedelta(days=5),
+            views_count=4,
+        )
+        self.create_views(new_recipe, 1, timezone.now())
+
+        call_command("rebuild_recipe_stats")
+
+        stats = RecipeStats.objects.get(recipe=new_recipe)
+        assert stats.views_count == 15
+        assert stats.latest_views_count == 5
+        assert stats.activity_count == 5